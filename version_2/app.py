@@ -1,24 +1,77 @@
+import logging
+import threading
 import streamlit as st
 from datetime import datetime
+from functools import partial
 from config.settings import settings
 from domain.search_result import SearchResult
-from services.search_service import search_news
-from services.ai_service import summarize_news, expand_query, correct_spelling, extract_keywords
-from repositories.search_repository import SearchRepository
+from services.search_service import search_news_ranked, get_search_cache_stats, warm_up_search_connection, build_query_variants
+from services.ai_service import summarize_news, expand_query, correct_spelling, extract_keywords, warm_up_ai_connection
+from services.quota_limiter import get_quota_status
+from services.watchlist_service import WatchListService
+from repositories.base_repository import BaseSearchRepository
+from repositories.repository_factory import create_repository
+from repositories.history_exporter import export_history, EXPORT_FORMATS
 from components.search_form import render_search_form
 from components.sidebar import (
     render_sidebar_header, 
     render_settings, 
     render_info, 
     render_history_list, 
+    render_archive_search,
+    render_cache_stats,
+    render_quota_status,
+    render_watchlist,
     render_download_button
 )
-from components.result_section import render_summary, render_news_list
+from components.result_section import render_summary, render_news_list, render_load_more
 from components.loading import show_loading
 from utils.exceptions import AppError
 from utils.error_handler import handle_error
 from utils.key_generator import generate_search_key
 
+logger = logging.getLogger(__name__)
+
+@st.cache_resource
+def get_repository() -> BaseSearchRepository:
+    """
+    프로세스 전체에서 공유할 검색 기록 리포지토리 인스턴스를 반환합니다.
+    매 rerun마다 새로 생성하지 않도록 Streamlit 리소스 캐시에 보관합니다.
+    """
+    return create_repository()
+
+@st.cache_resource
+def start_connection_warmup() -> threading.Thread:
+    """
+    Tavily/Gemini API 서버로 연결을 미리 여는 백그라운드 스레드를 프로세스당 한 번 시작합니다. (HTTP_WARMUP)
+    첫 화면 렌더링을 막지 않으며, 예열에 실패해도 첫 검색에서 평소처럼 연결합니다.
+    """
+    def run():
+        for name, warm_up in (("Tavily", warm_up_search_connection), ("Gemini", warm_up_ai_connection)):
+            elapsed = warm_up()
+            if elapsed is not None:
+                logger.info(f"{name} 연결 예열 완료: {elapsed * 1000:.0f}ms")
+
+    thread = threading.Thread(target=run, name="http-connection-warmup", daemon=True)
+    thread.start()
+    return thread
+
+@st.cache_resource
+def start_watchlist() -> WatchListService:
+    """
+    관심 키워드(WATCHLIST_KEYWORDS)를 WATCHLIST_INTERVAL_MINUTES마다 갱신하는 백그라운드 스레드를 프로세스당 한 번 시작합니다.
+    새 기사가 있을 때만 요약해 검색 기록에 저장하므로 모든 세션의 기록 목록에 함께 나타납니다.
+    """
+    service = WatchListService(get_repository(), settings.watchlist_keywords, settings.watchlist_interval_minutes)
+    service.start()
+    return service
+
+def load_more_articles(page_size: int):
+    """'더 보기' 버튼 콜백. 미리 받아 둔 후보 기사 중 다음 page_size건을 표시 목록으로 옮깁니다."""
+    extra_articles = st.session_state.get("extra_articles", [])
+    st.session_state.more_articles = st.session_state.get("more_articles", []) + extra_articles[:page_size]
+    st.session_state.extra_articles = extra_articles[page_size:]
+
 def main():
     """
     TrendTracker 메인 애플리케이션 함수.
@@ -28,7 +81,10 @@ def main():
     st.set_page_config(page_title="TrendTracker", layout="wide")
 
     # 2. 초기화 (리포지토리 및 세션 상태)
-    repository = SearchRepository(str(settings.csv_path))
+    repository = get_repository()
+    # 녹화한 응답을 재생할 때는 네트워크 연결을 쓰지 않으므로 예열하지 않음
+    if settings.http_warmup and settings.api_mode != "replay":
+        start_connection_warmup()
     
     if "current_mode" not in st.session_state:
         st.session_state.current_mode = "new_search"
@@ -36,23 +92,24 @@ def main():
         st.session_state.selected_key = None
     if "last_result" not in st.session_state:
         st.session_state.last_result = None
+    if "extra_articles" not in st.session_state:
+        st.session_state.extra_articles = []  # '더 보기'용 후보 기사 (아직 표시하지 않음)
+        st.session_state.more_articles = []  # '더 보기'로 추가 표시한 기사
 
     # 3. 사이드바 렌더링
     render_sidebar_header()
     num_results, category, time_range, use_ai_expansion, use_all_sources, language, spell_check = render_settings()
     render_info()
     
-    # 검색 기록 목록 준비
-    search_keys = repository.get_all_keys()
-    keywords_map = {}
-    for sk in search_keys:
-        # search_key 형식: "키워드-yyyymmddhhmm"
-        parts = sk.split('-')
-        keyword = "-".join(parts[:-1]) if len(parts) > 1 else sk
-        keywords_map[sk] = keyword
-    
-    # 기록 선택 시 세션 상태 업데이트 및 모드 전환
-    history_selected_key = render_history_list(search_keys, keywords_map)
+    # 기록 선택 시 세션 상태 업데이트 및 모드 전환 (목록 선택 또는 기록 검색 결과 선택)
+    # 히스토리 목록은 현재 페이지만 조회 (기사 본문을 읽지 않는 검색 목록만 사용)
+    history_selected_key = render_history_list(repository.list_searches)
+    archive_selected_key = render_archive_search(repository.search_archive)
+    watch_selected_key = None
+    if settings.watchlist_keywords:
+        watchlist = start_watchlist()
+        watch_selected_key = render_watchlist(watchlist.statuses(), watchlist.request_refresh)
+    history_selected_key = watch_selected_key or archive_selected_key or history_selected_key
     if history_selected_key and history_selected_key != st.session_state.selected_key:
         st.session_state.selected_key = history_selected_key
         st.session_state.current_mode = "history"
@@ -60,9 +117,8 @@ def main():
         st.session_state.last_result = None
         st.rerun()
 
-    # 다운로드 버튼
-    csv_data = repository.get_all_as_csv()
-    render_download_button(csv_data, len(search_keys) == 0)
+    # 다운로드 버튼 (내보내기 파일은 버튼 클릭 시에만 생성)
+    render_download_button(partial(export_history, repository), EXPORT_FORMATS, not repository.list_searches(limit=1))
 
     # 4. 메인 영역 렌더링
     st.markdown("""
@@ -146,21 +202,23 @@ def main():
                         st.info(f"💡 '{corrected}'로 검색어를 교정하여 분석을 진행합니다.")
                         actual_query = corrected
 
-            # AI 검색어 확장
+            # AI 검색어 확장 (확장 검색어, 원래 검색어, 언어 힌트/카테고리 접두어 변형을 함께 검색)
+            expanded_query = None
             if use_ai_expansion:
                 with show_loading("검색어 최적화 중..."):
-                    actual_query = expand_query(actual_query)
-                    st.toast(f"검색 최적화: {actual_query}")
+                    expanded_query = expand_query(actual_query)
+                    st.toast(f"검색 최적화: {expanded_query}")
+            query_variants = build_query_variants(actual_query, category, language, expanded_query)
 
-            # 뉴스 검색
+            # 뉴스 검색 (검색어 변형들을 동시에 호출해 합친 뒤 관련도/최신성으로 재정렬, 남는 후보는 '더 보기'용으로 보관)
+            st.session_state.extra_articles, st.session_state.more_articles = [], []
             with show_loading("데이터 수집 중..."):
-                articles = search_news(
-                    keyword=actual_query, 
-                    num_results=num_results, 
-                    category=category, 
+                articles, extra_articles = search_news_ranked(
+                    query_variants,
+                    num_results=num_results,
                     time_range=time_range,
                     include_all_sources=use_all_sources,
-                    language=language
+                    query=actual_query  # 관련도 재정렬은 확장 검색어가 아닌 사용자 검색어(교정 반영) 기준
                 )
             
             if not articles:
@@ -182,6 +240,7 @@ def main():
                     ai_keywords=keywords
                 )
                 
+                st.session_state.extra_articles = extra_articles
                 if repository.save(result):
                     st.session_state.last_result = result
                     st.success(f"분석 완료: {len(articles)}건의 트렌드를 포착했습니다.")
@@ -201,7 +260,8 @@ def main():
         if st.session_state.last_result:
             res = st.session_state.last_result
             render_summary(res.keyword, res.ai_summary, res.ai_keywords)
-            render_news_list(res.articles)
+            render_news_list(res.articles + st.session_state.more_articles)
+            render_load_more(len(st.session_state.extra_articles), partial(load_more_articles, num_results))
         elif not search_keyword:
             render_info() # 초기 환영/가이드 메시지
         
@@ -214,5 +274,9 @@ def main():
         else:
             st.error("해당 기록을 불러올 수 없습니다.")
 
+    # 검색 캐시 현황과 남은 API 호출 한도 (이번 실행의 검색까지 반영되도록 마지막에 표시)
+    render_cache_stats(get_search_cache_stats())
+    render_quota_status(get_quota_status())
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,6 +1,6 @@
 import streamlit as st
 import html
-from typing import List
+from typing import Callable, List
 from domain.news_article import NewsArticle
 
 def render_summary(title: str, summary: str, keywords: str = ""):
@@ -116,9 +116,18 @@ def render_news_list(articles: List[NewsArticle]):
         title = html.escape(article.title)
         snippet = html.escape(article.snippet)
         url = article.url
-        date = html.escape(article.pub_date.split('T')[0] if article.pub_date and 'T' in article.pub_date else (article.pub_date or "최신"))
+        date = article.published_at.astimezone().strftime('%Y-%m-%d') if article.published_at else "최신"
         source = html.escape(article.source or "뉴스 피드")
         category = html.escape(article.category or "NEWS")
+        # 같은 내용으로 합쳐진 다른 매체 (최대 3곳 링크)
+        alternatives = ""
+        if article.alternative_sources:
+            links = ", ".join(
+                f'<a href="{html.escape(alt_url)}" target="_blank">{html.escape(alt_source)}</a>'
+                for alt_source, alt_url in article.alternative_sources[:3]
+            )
+            more = len(article.alternative_sources) - 3
+            alternatives = f"<span>외 {len(article.alternative_sources)}곳: {links}{' 등' if more > 0 else ''}</span>"
         
         # 개별 뉴스 카드 HTML 생성
         card_html = f"""
@@ -130,6 +139,7 @@ def render_news_list(articles: List[NewsArticle]):
                 <div class="news-meta">
                     <span>📅 {date}</span>
                     <span>출처: <b>{source}</b></span>
+                    {alternatives}
                 </div>
                 <a href="{url}" target="_blank" class="read-more-btn">원문 보기 ↗</a>
             </div>
@@ -141,3 +151,13 @@ def render_news_list(articles: List[NewsArticle]):
 
     # 3. st.markdown을 사용하여 실제 UI로 렌더링
     st.markdown(html_content, unsafe_allow_html=True)
+
+def render_load_more(remaining: int, on_load_more: Callable[[], None]):
+    """
+    미리 받아 둔 후보 기사가 남아 있으면 '더 보기' 버튼을 표시합니다. (API를 다시 호출하지 않음)
+    :param remaining: 남은 후보 기사 수
+    :param on_load_more: 버튼 클릭 시 호출할 콜백 (다음 기사들을 표시 목록으로 옮김)
+    """
+    if remaining <= 0:
+        return
+    st.button(f"더 보기 ({remaining}건 남음)", key="load_more", on_click=on_load_more, use_container_width=True)
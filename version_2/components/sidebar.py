@@ -1,6 +1,11 @@
 import streamlit as st
-from typing import List, Optional
-from datetime import datetime
+from typing import BinaryIO, Callable, List, Optional
+from datetime import datetime, time, timedelta
+from domain.search_entry import SearchEntry
+from utils.error_handler import ERROR_MESSAGES
+
+# 히스토리 목록의 페이지당 기록 수
+HISTORY_PAGE_SIZE = 20
 
 def render_sidebar_header():
     """사이드바 헤더 영역을 렌더링합니다."""
@@ -59,27 +64,44 @@ def render_settings() -> tuple:
         
     return count, category, time_range, use_ai_expansion, use_all_sources, language, spell_check
 
-def render_history_list(search_keys: List[str], keywords_map: dict) -> Optional[str]:
-    """과거 검색 기록 목록을 렌더링하고 선택된 search_key를 반환합니다."""
+def _change_history_page(step: int):
+    """히스토리 페이지 이동 버튼의 콜백. 페이지를 바꾸고 이전 선택을 초기화합니다."""
+    st.session_state.history_page = max(st.session_state.get("history_page", 0) + step, 0)
+    st.session_state.history_selectbox = None
+
+def render_history_list(fetch_page: Callable[..., List[SearchEntry]], page_size: int = HISTORY_PAGE_SIZE) -> Optional[str]:
+    """
+    과거 검색 기록 목록을 페이지 단위로 렌더링하고 선택된 search_key를 반환합니다.
+    한 번에 한 페이지만 조회하므로 전체 기록 수와 관계없이 렌더링 비용이 일정합니다.
+    :param fetch_page: repository.list_searches (offset, limit, keyword_prefix를 받아 최신순 SearchEntry 목록 반환)
+    :param page_size: 페이지당 표시할 기록 수
+    """
     st.sidebar.markdown("---")
     st.sidebar.subheader("히스토리")
-    
-    if not search_keys:
-        st.sidebar.info("검색 기록이 없습니다.")
+
+    keyword_prefix = st.sidebar.text_input(
+        "키워드로 찾기", placeholder="키워드 앞부분 입력", key="history_prefix"
+    ).strip()
+    # 필터가 바뀌면 첫 페이지부터 다시 표시
+    if st.session_state.get("history_prefix_applied") != keyword_prefix:
+        st.session_state.history_prefix_applied = keyword_prefix
+        st.session_state.history_page = 0
+    page = st.session_state.get("history_page", 0)
+
+    # 다음 페이지 존재 여부를 알기 위해 1건 더 조회
+    entries = fetch_page(offset=page * page_size, limit=page_size + 1, keyword_prefix=keyword_prefix or None)
+    has_next = len(entries) > page_size
+    entries = entries[:page_size]
+
+    if not entries and page == 0:
+        st.sidebar.info("일치하는 검색 기록이 없습니다." if keyword_prefix else "검색 기록이 없습니다.")
         return None
-        
+
     options = []
-    for key in search_keys:
-        keyword = keywords_map.get(key, "키워드")
-        try:
-            timestamp_str = key.split('-')[-1]
-            dt = datetime.strptime(timestamp_str, "%Y%m%d%H%M")
-            display_time = dt.strftime("%m/%d %H:%M")
-        except:
-            display_time = "Unk"
-            
-        options.append(f"{keyword} ({display_time})")
-    
+    for entry in entries:
+        display_time = entry.search_time.strftime("%m/%d %H:%M") if entry.search_time else "Unk"
+        options.append(f"{entry.keyword} ({display_time})")
+
     selected_option = st.sidebar.selectbox(
         "기록 불러오기",
         options=options,
@@ -87,25 +109,152 @@ def render_history_list(search_keys: List[str], keywords_map: dict) -> Optional[
         placeholder="과거 기록 선택",
         key="history_selectbox"
     )
-    
+
+    if page > 0 or has_next:
+        prev_col, page_col, next_col = st.sidebar.columns([1, 1, 1])
+        prev_col.button("◀ 이전", key="history_prev", disabled=page == 0,
+                        on_click=_change_history_page, args=(-1,), use_container_width=True)
+        page_col.markdown(f"<div style='text-align:center; padding-top:0.4rem'>{page + 1}</div>", unsafe_allow_html=True)
+        next_col.button("다음 ▶", key="history_next", disabled=not has_next,
+                        on_click=_change_history_page, args=(1,), use_container_width=True)
+
     if selected_option:
-        idx = options.index(selected_option)
-        return search_keys[idx]
+        return entries[options.index(selected_option)].search_key
         
     return None
 
-def render_download_button(csv_data: str, is_empty: bool):
-    """CSV 전체 데이터를 다운로드하는 버튼을 렌더링합니다."""
+def render_archive_search(search_fn: Callable[[str], list]) -> Optional[str]:
+    """
+    저장된 기록(기사 제목, 내용, AI 요약)을 검색하는 입력창을 렌더링하고 선택된 search_key를 반환합니다.
+    :param search_fn: 검색어를 받아 [(SearchEntry, 점수), ...]를 반환하는 함수
+    """
+    query = st.sidebar.text_input("기록 검색", placeholder="예: NVIDIA, 반도체", key="archive_query").strip()
+    if not query:
+        return None
+
+    hits = search_fn(query)
+    if not hits:
+        st.sidebar.caption("일치하는 기록이 없습니다.")
+        return None
+
+    options = []
+    for entry, _ in hits:
+        display_time = entry.search_time.strftime("%m/%d %H:%M") if entry.search_time else "Unk"
+        options.append(f"{entry.keyword} ({display_time})")
+
+    selected_option = st.sidebar.selectbox(
+        f"검색 결과 {len(hits)}건",
+        options=options,
+        index=None,
+        placeholder="기록 선택",
+        key="archive_selectbox"
+    )
+    if selected_option:
+        return hits[options.index(selected_option)][0].search_key
+    return None
+
+def render_download_button(export_provider: Callable[..., BinaryIO], export_formats: dict, is_empty: bool):
+    """
+    검색 기록 내보내기 옵션(형식, 기간, 키워드, 기사 발행 기간)과 다운로드 버튼을 렌더링합니다.
+    내보내기 파일은 버튼을 눌렀을 때만
+    export_provider(fmt, since, until, keyword, published_since=..., published_until=...)를 호출해 생성합니다.
+    :param export_formats: {형식: (파일 확장자, MIME 타입)}
+    """
     if not is_empty:
         st.sidebar.markdown("---")
-        now = datetime.now().strftime("%Y%m%d")
-        st.sidebar.download_button(
-            label="전체 데이터 내보내기",
-            data=csv_data,
-            file_name=f"antigravity_{now}.csv",
-            mime="text/csv",
-            use_container_width=True
+        with st.sidebar.expander("데이터 내보내기", expanded=False):
+            fmt = st.selectbox("파일 형식", options=list(export_formats.keys()), index=0, key="export_format")
+            extension, mime = export_formats[fmt]
+
+            date_range = st.date_input("검색 기간 (선택)", value=(), key="export_date_range")
+            since = until = None
+            if len(date_range) >= 1:
+                since = datetime.combine(date_range[0], time.min)
+            if len(date_range) == 2:
+                until = datetime.combine(date_range[1] + timedelta(days=1), time.min)
+
+            keyword = st.text_input("키워드 포함 (선택)", key="export_keyword").strip() or None
+
+            published_range = st.date_input("기사 발행 기간 (선택)", value=(), key="export_published_range")
+            published_since = published_until = None
+            if len(published_range) >= 1:
+                published_since = datetime.combine(published_range[0], time.min)
+            if len(published_range) == 2:
+                published_until = datetime.combine(published_range[1] + timedelta(days=1), time.min)
+
+            now = datetime.now().strftime("%Y%m%d")
+            st.download_button(
+                label="검색 기록 내보내기",
+                data=lambda: export_provider(fmt, since, until, keyword,
+                                             published_since=published_since, published_until=published_until),
+                file_name=f"antigravity_{now}.{extension}",
+                mime=mime,
+                use_container_width=True
+            )
+
+def render_watchlist(watch_statuses, on_refresh: Callable[[], None]) -> Optional[str]:
+    """
+    관심 키워드별 자동 갱신 상태(마지막 확인 시각, 새 기사 수, 오류)와 '지금 갱신' 버튼을 렌더링하고,
+    새 기사가 저장된 키워드를 선택하면 그 검색의 search_key를 반환합니다.
+    :param watch_statuses: WatchStatus 리스트
+    :param on_refresh: '지금 갱신' 버튼 콜백 (백그라운드 갱신 요청)
+    """
+    st.sidebar.markdown("---")
+    with st.sidebar.expander("관심 키워드 자동 갱신", expanded=False):
+        for status in watch_statuses:
+            if status.last_checked is None:
+                detail = "확인 대기 중"
+            elif status.last_error:
+                detail = f"실패: {ERROR_MESSAGES.get(status.last_error, status.last_error)}"
+            elif status.new_articles:
+                detail = f"{status.last_checked.strftime('%H:%M')} 새 기사 {status.new_articles}건"
+            else:
+                detail = f"{status.last_checked.strftime('%H:%M')} 변경 없음"
+            st.caption(f"**{status.keyword}** · {detail}")
+
+        st.button("지금 갱신", key="watchlist_refresh", on_click=on_refresh, use_container_width=True)
+
+        changed = [status for status in watch_statuses if status.last_search_key]
+        if not changed:
+            return None
+        options = [f"{status.keyword} ({status.last_changed.strftime('%m/%d %H:%M')})" for status in changed]
+        selected_option = st.selectbox(
+            "새 기사 보기",
+            options=options,
+            index=None,
+            placeholder="키워드 선택",
+            key="watchlist_selectbox"
         )
+        if selected_option:
+            return changed[options.index(selected_option)].last_search_key
+    return None
+
+def render_cache_stats(cache_stats):
+    """
+    검색 캐시 적중률과 절약한 API 대기 시간을 사이드바에 표시합니다.
+    :param cache_stats: CacheStats 객체 (캐시가 꺼져 있으면 None)
+    """
+    if cache_stats is None or cache_stats.hits + cache_stats.misses == 0:
+        return
+    st.sidebar.caption(
+        f"검색 캐시 적중률 {cache_stats.hit_rate:.0%} "
+        f"({cache_stats.hits}/{cache_stats.hits + cache_stats.misses}) · "
+        f"절약 {cache_stats.saved_seconds:.1f}초"
+    )
+
+def render_quota_status(quota_statuses):
+    """
+    외부 API별 남은 호출 한도(분당/오늘)를 사이드바에 표시합니다.
+    :param quota_statuses: QuotaStatus 리스트 (한도가 설정된 제공자만 포함)
+    """
+    labels = {"tavily": "검색(Tavily)", "gemini": "AI(Gemini)"}
+    for status in quota_statuses:
+        parts = []
+        if status.per_minute is not None:
+            parts.append(f"분당 {status.minute_remaining}/{status.per_minute}")
+        if status.per_day is not None:
+            parts.append(f"오늘 {status.day_remaining}/{status.per_day}")
+        st.sidebar.caption(f"{labels.get(status.provider, status.provider)} 남은 호출: {' · '.join(parts)}")
 
 def render_info():
     """사이드바 하단에 이용 가이드북 섹션을 렌더링합니다."""
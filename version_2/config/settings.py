@@ -16,6 +16,15 @@ class Settings:
         "GEMINI_API_KEY",
         "CSV_PATH"
     ]
+
+    # 지원하는 검색 기록 저장소 종류
+    STORAGE_BACKENDS = ["csv", "sqlite", "parquet"]
+
+    # 지원하는 Parquet 파티션 단위 (repositories/parquet_search_repository.py의 PARTITION_FORMATS와 같아야 함)
+    PARQUET_PARTITIONS = ["month", "day"]
+
+    # 외부 API 호출 방식 (utils/api_fixtures.py)
+    API_MODES = ["live", "record", "replay"]
     
     def __init__(self):
         self._validate_required_vars()
@@ -35,8 +44,107 @@ class Settings:
         # 기본값은 data/search_history.csv
         self.csv_path = Path(os.getenv("CSV_PATH", "data/search_history.csv"))
         
+        # 저장소 종류 선택 (csv: 기존 CSV 파일, sqlite: 인덱스가 있는 SQLite DB, parquet: 기간별 Parquet 파티션)
+        self.storage_backend = os.getenv("STORAGE_BACKEND", "csv").strip().lower()
+        if self.storage_backend not in self.STORAGE_BACKENDS:
+            raise EnvironmentError(
+                f"지원하지 않는 STORAGE_BACKEND 값입니다: {self.storage_backend} "
+                f"(사용 가능: {', '.join(self.STORAGE_BACKENDS)})"
+            )
+        # SQLite 사용 시 DB 파일 경로 (최초 실행 시 CSV_PATH의 기존 기록을 1회 이관)
+        self.sqlite_path = Path(os.getenv("SQLITE_PATH", "data/search_history.db"))
+        # Parquet 사용 시 파티션 루트 디렉토리와 파티션 단위 (month 또는 day)
+        self.parquet_path = Path(os.getenv("PARQUET_PATH", "data/search_history_parquet"))
+        self.parquet_partition = os.getenv("PARQUET_PARTITION", "month").strip().lower()
+        if self.parquet_partition not in self.PARQUET_PARTITIONS:
+            raise EnvironmentError(
+                f"지원하지 않는 PARQUET_PARTITION 값입니다: {self.parquet_partition} "
+                f"(사용 가능: {', '.join(self.PARQUET_PARTITIONS)})"
+            )
+        # 과거 기록 전문 검색용 역색인 DB 경로
+        self.search_index_path = Path(os.getenv("SEARCH_INDEX_PATH", "data/search_index.db"))
+
+        # Tavily 검색 결과 캐시 (메모리 LRU + 디스크). time_range별 TTL은 services/search_cache.py 참고
+        self.search_cache_enabled = os.getenv("SEARCH_CACHE_ENABLED", "true").strip().lower() not in ("0", "false", "no", "off")
+        self.search_cache_path = Path(os.getenv("SEARCH_CACHE_PATH", "data/search_cache.db"))
+        # 0이면 메모리 캐시 없이 디스크 캐시만 사용
+        self.search_cache_max_entries = self._int("SEARCH_CACHE_MAX_ENTRIES", 256)
+
+        # 검색 기록 보존 정책 (비워 두면 제한 없음). 하나라도 설정하면 앱 시작 시 백그라운드에서 기록을 정리
+        self.history_max_age_days = self._optional_int("HISTORY_MAX_AGE_DAYS")
+        self.history_max_searches = self._optional_int("HISTORY_MAX_SEARCHES")
+        self.history_max_bytes = self._optional_int("HISTORY_MAX_BYTES")
+
+        # 요청 개수의 몇 배를 가져와 관련도/최신성으로 다시 고를지 (남는 후보는 '더 보기'에 사용, 0 또는 1이면 요청한 개수만 가져옴)
+        self.search_overfetch_factor = self._int("SEARCH_OVERFETCH_FACTOR", 3)
+
+        # 여러 매체에 실린 같은 기사를 하나로 합쳐 표시/요약 (services/near_duplicate.py)
+        self.near_duplicate_collapse = os.getenv("NEAR_DUPLICATE_COLLAPSE", "true").strip().lower() not in ("0", "false", "no", "off")
+
+        # 외부 API(Tavily, Gemini) HTTP 연결 풀. 연결을 재사용(Keep-Alive)해 요청마다 TLS 핸드셰이크를 반복하지 않음
+        self.http_pool_size = self._int("HTTP_POOL_SIZE", 10, minimum=1)
+        self.http_timeout = self._int("HTTP_TIMEOUT", 30, minimum=1)  # 초
+        self.http_keepalive_seconds = self._int("HTTP_KEEPALIVE_SECONDS", 120)  # 0이면 유휴 연결을 바로 닫음
+        # 앱 시작 시 API 서버로 미리 연결을 열어 첫 검색의 지연을 줄임
+        self.http_warmup = os.getenv("HTTP_WARMUP", "false").strip().lower() in ("1", "true", "yes", "on")
+
+        # 외부 API 호출 한도 (비워 두면 제한 없음). 한도를 넘는 호출은 API에 보내기 전에 막거나 기다림
+        self.tavily_per_minute = self._optional_int("TAVILY_MINUTE_LIMIT")
+        self.tavily_per_day = self._optional_int("TAVILY_DAILY_LIMIT")
+        self.gemini_per_minute = self._optional_int("GEMINI_MINUTE_LIMIT")
+        self.gemini_per_day = self._optional_int("GEMINI_DAILY_LIMIT")
+        # 일일 사용량 저장 DB (재시작 후에도 오늘 사용량 유지)와 분당 한도를 기다리는 최대 시간(초)
+        self.quota_path = Path(os.getenv("QUOTA_PATH", "data/api_quota.db"))
+        self.quota_max_wait = self._int("QUOTA_MAX_WAIT", 10)
+
+        # 관심 키워드 자동 갱신 (쉼표로 구분, 비워 두면 사용하지 않음). 새 기사가 있을 때만 요약해 저장
+        watchlist_raw = os.getenv("WATCHLIST_KEYWORDS", "")
+        self.watchlist_keywords = list(dict.fromkeys(k.strip() for k in watchlist_raw.split(",") if k.strip()))
+        self.watchlist_interval_minutes = self._int("WATCHLIST_INTERVAL_MINUTES", 60, minimum=1)
+
+        # 외부 API 호출 방식 (live: 실제 호출, record: 실제 호출 + 요청/응답 녹화, replay: 녹화한 응답만 사용)
+        self.api_mode = os.getenv("API_MODE", "live").strip().lower()
+        if self.api_mode not in self.API_MODES:
+            raise EnvironmentError(
+                f"지원하지 않는 API_MODE 값입니다: {self.api_mode} "
+                f"(사용 가능: {', '.join(self.API_MODES)})"
+            )
+        # 녹화한 요청/응답 쌍을 저장하는 디렉토리 (제공자별 하위 디렉토리)
+        self.api_fixture_path = Path(os.getenv("API_FIXTURE_PATH", "data/api_fixtures"))
+        # API 주소 재정의 (비워 두면 공식 주소). 로컬 스텁 서버(python -m utils.stub_server)를 가리킬 때 사용
+        self.tavily_base_url = os.getenv("TAVILY_BASE_URL", "").strip() or None
+        self.gemini_base_url = os.getenv("GEMINI_BASE_URL", "").strip() or None
+        
         # 데이터 디렉토리가 없으면 생성
         self.csv_path.parent.mkdir(parents=True, exist_ok=True)
+        self.sqlite_path.parent.mkdir(parents=True, exist_ok=True)
+        self.search_index_path.parent.mkdir(parents=True, exist_ok=True)
+        self.search_cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.quota_path.parent.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _optional_int(name: str, minimum: int = 0):
+        """
+        minimum 이상의 정수 환경 변수를 읽습니다. 비어 있으면 None을 반환합니다.
+        """
+        raw = os.getenv(name, "").strip()
+        if not raw:
+            return None
+        try:
+            value = int(raw)
+        except ValueError:
+            value = minimum - 1
+        if value < minimum:
+            raise EnvironmentError(f"{name} 값은 {minimum} 이상의 정수여야 합니다: {raw}")
+        return value
+
+    @staticmethod
+    def _int(name: str, default: int, minimum: int = 0) -> int:
+        """
+        minimum 이상의 정수 환경 변수를 읽습니다. 비어 있을 때만 기본값을 사용합니다. (명시한 0은 그대로 사용)
+        """
+        value = Settings._optional_int(name, minimum)
+        return value if value is not None else default
 
     def _validate_required_vars(self):
         """
@@ -0,0 +1,27 @@
+from dataclasses import dataclass
+
+@dataclass
+class CompactionReport:
+    """검색 기록 정리(Compaction) 결과를 담는 데이터클래스"""
+    searches_removed: int  # 보존 정책으로 삭제된 검색 수
+    rows_before: int  # 정리 전 기사 행 수 (Long format 기준)
+    rows_after: int  # 정리 후 기사 행 수
+    bytes_before: int  # 정리 전 저장소 크기
+    bytes_after: int  # 정리 후 저장소 크기
+
+    @property
+    def rows_reclaimed(self) -> int:
+        """삭제된 행 수 (보존 기간 만료 + 중복/고아 행)"""
+        return self.rows_before - self.rows_after
+
+    @property
+    def bytes_reclaimed(self) -> int:
+        """회수한 바이트 수"""
+        return self.bytes_before - self.bytes_after
+
+    def __str__(self) -> str:
+        return (
+            f"검색 {self.searches_removed}건 만료, 행 {self.rows_before} -> {self.rows_after} "
+            f"({self.rows_reclaimed}행 회수), {self.bytes_before:,}B -> {self.bytes_after:,}B "
+            f"({self.bytes_reclaimed:,}B 회수)"
+        )
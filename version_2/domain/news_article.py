@@ -1,5 +1,6 @@
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional, Tuple
 
 @dataclass
 class NewsArticle:
@@ -12,3 +13,7 @@ class NewsArticle:
     category: Optional[str] = None
     source: Optional[str] = None
     keywords: Optional[str] = None
+    # pub_date를 해석한 발행 시각 (UTC). 날짜가 없거나 해석할 수 없으면 None
+    published_at: Optional[datetime] = None
+    # 같은 내용으로 합쳐진 다른 매체의 기사 [(출처, URL), ...]
+    alternative_sources: List[Tuple[str, str]] = field(default_factory=list)
@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass
+class RetentionPolicy:
+    """검색 기록 보존 정책을 담는 데이터클래스 (None이면 해당 기준은 제한 없음)"""
+    max_age_days: Optional[int] = None  # 이 일수보다 오래된 검색 삭제
+    max_searches: Optional[int] = None  # 최신 검색을 이 개수까지만 보존
+    max_bytes: Optional[int] = None  # 저장소 크기가 이 바이트 수를 넘으면 오래된 검색부터 삭제
+
+    def is_active(self) -> bool:
+        """보존 기준이 하나라도 설정되어 있는지 여부"""
+        return any(limit is not None for limit in (self.max_age_days, self.max_searches, self.max_bytes))
@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+@dataclass
+class SearchEntry:
+    """검색 기록 목록(사이드바 히스토리)에 필요한 검색 단위 메타데이터를 담는 데이터클래스"""
+    search_key: str
+    keyword: str
+    search_time: datetime
+    article_count: int = 0
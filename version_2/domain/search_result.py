@@ -1,3 +1,4 @@
+import json
 from dataclasses import dataclass
 from datetime import datetime
 from typing import List
@@ -28,14 +29,17 @@ class SearchResult:
                 "snippet": article.snippet,
                 "pub_date": article.pub_date,
                 "ai_summary": self.ai_summary,
-                "ai_keywords": self.ai_keywords
+                "ai_keywords": self.ai_keywords,
+                # 대표 기사에 합쳐진 다른 매체 기사 [[출처, URL], ...] (없으면 빈 값)
+                "alternative_sources": json.dumps(article.alternative_sources, ensure_ascii=False)
+                                       if article.alternative_sources else None
             })
         
         # 검색 결과가 없는 경우에도 기본 구조를 가진 DataFrame 반환
         if not data:
             return pd.DataFrame(columns=[
                 "search_key", "search_time", "keyword", "article_index",
-                "title", "url", "snippet", "pub_date", "ai_summary", "ai_keywords"
+                "title", "url", "snippet", "pub_date", "ai_summary", "ai_keywords", "alternative_sources"
             ])
             
         return pd.DataFrame(data)
@@ -0,0 +1,26 @@
+from dataclasses import dataclass
+
+@dataclass
+class StorageReport:
+    """기사 중복 제거 저장소의 공간 절감 현황을 담는 데이터클래스"""
+    article_refs: int  # 검색들이 참조하는 기사 수 (중복 포함)
+    unique_articles: int  # 실제로 저장된 기사 수
+    logical_bytes: int  # 검색마다 기사를 따로 저장했을 때의 기사 필드 바이트 수
+    stored_bytes: int  # 실제로 저장된 기사 필드 바이트 수 (검색별 차이 포함)
+
+    @property
+    def saved_bytes(self) -> int:
+        """중복 제거로 절약한 바이트 수"""
+        return self.logical_bytes - self.stored_bytes
+
+    @property
+    def saved_ratio(self) -> float:
+        """절약 비율 (0.0 ~ 1.0)"""
+        return self.saved_bytes / self.logical_bytes if self.logical_bytes else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"기사 참조 {self.article_refs}건 -> 저장 {self.unique_articles}건, "
+            f"{self.logical_bytes:,}B -> {self.stored_bytes:,}B "
+            f"({self.saved_bytes:,}B, {self.saved_ratio:.1%} 절약)"
+        )
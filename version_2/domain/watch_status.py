@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+@dataclass
+class WatchStatus:
+    """관심 키워드 1개의 최근 자동 갱신 결과를 담는 데이터클래스"""
+    keyword: str
+    last_checked: Optional[datetime] = None  # 마지막으로 다시 검색한 시각
+    last_changed: Optional[datetime] = None  # 마지막으로 새 기사를 찾아 저장한 시각
+    new_articles: int = 0  # 마지막 갱신에서 찾은 새 기사 수
+    last_search_key: Optional[str] = None  # 마지막으로 저장한 검색의 search_key
+    last_error: Optional[str] = None  # 마지막 갱신 실패 원인 (AppError 유형, 성공하면 None)
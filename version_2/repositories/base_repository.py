@@ -0,0 +1,291 @@
+import json
+import logging
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+import pandas as pd
+from domain.search_result import SearchResult
+from domain.news_article import NewsArticle
+from domain.search_entry import SearchEntry
+from domain.retention_policy import RetentionPolicy
+from domain.compaction_report import CompactionReport
+from repositories.search_index import SearchIndex
+from utils.date_parser import parse_datetimes, clean_date_text, to_utc
+from utils.key_generator import normalize_url
+
+logger = logging.getLogger(__name__)
+
+# 검색 기록의 Long format(기사 1건=1행) 컬럼 정의
+HISTORY_COLUMNS = [
+    "search_key", "search_time", "keyword", "article_index",
+    "title", "url", "snippet", "pub_date", "ai_summary", "ai_keywords", "alternative_sources"
+]
+
+# 내보내기 시 한 번에 읽는 기본 행 수
+EXPORT_CHUNK_SIZE = 5000
+
+class BaseSearchRepository(ABC):
+    """검색 기록 저장소의 공통 인터페이스. 저장 방식(CSV, SQLite 등)별 구현체가 상속합니다."""
+
+    # 저장 시 함께 갱신할 전문 검색 색인 (attach_index로 연결)
+    search_index: Optional[SearchIndex] = None
+
+    # compact()의 기본 보존 정책 (기본값은 제한 없음, 중복/고아 행 정리만 수행)
+    retention: RetentionPolicy = RetentionPolicy()
+
+    @abstractmethod
+    def load(self) -> pd.DataFrame:
+        """전체 검색 기록을 Long format DataFrame으로 반환합니다."""
+
+    @abstractmethod
+    def save(self, search_result: SearchResult) -> bool:
+        """SearchResult 객체를 저장하고 성공 여부를 반환합니다."""
+
+    @abstractmethod
+    def get_all_keys(self) -> List[str]:
+        """저장된 모든 search_key를 검색 시간 기준 최신순으로 반환합니다."""
+
+    @abstractmethod
+    def list_searches(self, offset: int = 0, limit: Optional[int] = None, keyword_prefix: Optional[str] = None,
+                      since: Optional[datetime] = None) -> List[SearchEntry]:
+        """
+        저장된 검색 목록(키, 키워드, 검색 시간, 기사 수)을 검색 시간 기준 최신순으로 반환합니다. 기사 본문은 읽지 않습니다.
+        :param offset: 건너뛸 검색 수 (페이지 시작 위치)
+        :param limit: 최대 반환 개수 (None이면 전체)
+        :param keyword_prefix: 키워드가 이 문자열로 시작하는 검색만 (대소문자 무시)
+        :param since: 이 시각 이후(포함) 검색만
+        """
+
+    @abstractmethod
+    def find_by_key(self, search_key: str) -> Optional[SearchResult]:
+        """search_key에 해당하는 SearchResult를 반환합니다. 없으면 None을 반환합니다."""
+
+    @abstractmethod
+    def get_all_as_csv(self) -> str:
+        """전체 데이터를 CSV 형식의 문자열로 반환합니다. (다운로드용)"""
+
+    @abstractmethod
+    def compact(self, retention: Optional[RetentionPolicy] = None) -> Optional[CompactionReport]:
+        """
+        보존 정책에 따라 만료된 검색을 삭제하고 중복/고아 행을 정리한 뒤 저장소를 원자적으로 다시 씁니다.
+        :param retention: 적용할 보존 정책 (None이면 self.retention)
+        :return: 정리 결과 보고서. 실패하면 None
+        """
+
+    def compact_in_background(self, retention: Optional[RetentionPolicy] = None) -> threading.Thread:
+        """
+        compact()를 백그라운드 스레드에서 실행합니다.
+        :return: 실행 중인 스레드 객체 (완료 대기가 필요하면 join() 호출)
+        """
+        thread = threading.Thread(
+            target=self.compact, args=(retention,), name="search-history-compaction", daemon=True
+        )
+        thread.start()
+        return thread
+
+    @staticmethod
+    def _page_entries(entries: List[SearchEntry], offset: int = 0, limit: Optional[int] = None,
+                      keyword_prefix: Optional[str] = None, since: Optional[datetime] = None) -> List[SearchEntry]:
+        """최신순으로 정렬된 검색 목록에 키워드 접두어/시작 시각 조건과 페이지(offset, limit)를 적용합니다."""
+        if keyword_prefix:
+            prefix = keyword_prefix.lower()
+            entries = [entry for entry in entries if str(entry.keyword).lower().startswith(prefix)]
+        if since is not None:
+            entries = [entry for entry in entries if entry.search_time and entry.search_time >= since]
+        end = None if limit is None else offset + limit
+        return entries[offset:end]
+
+    @staticmethod
+    def _expired_keys(entries: List[SearchEntry], retention: RetentionPolicy, total_bytes: int,
+                      now: Optional[datetime] = None) -> Set[str]:
+        """
+        보존 정책에 따라 삭제할 search_key 집합을 계산합니다.
+        - max_age_days: 검색 시간이 기준보다 오래된 검색
+        - max_searches: 최신순으로 개수를 넘는 검색
+        - max_bytes: 남은 검색의 크기 합이 기준 이하가 될 때까지 오래된 검색부터 (크기는 기사 수 비율로 추정)
+        :param entries: 저장된 검색 목록 (list_searches() 결과)
+        :param total_bytes: 현재 저장소 크기
+        """
+        entries = sorted(entries, key=lambda e: e.search_time or datetime.min, reverse=True)
+        cutoff = None
+        if retention.max_age_days is not None:
+            cutoff = (now or datetime.now()) - timedelta(days=retention.max_age_days)
+
+        kept, expired = [], set()
+        for entry in entries:
+            too_old = cutoff is not None and (entry.search_time is None or entry.search_time < cutoff)
+            too_many = retention.max_searches is not None and len(kept) >= retention.max_searches
+            if too_old or too_many:
+                expired.add(entry.search_key)
+            else:
+                kept.append(entry)
+
+        if retention.max_bytes is not None and total_bytes > retention.max_bytes:
+            bytes_per_article = total_bytes / max(sum(entry.article_count for entry in entries), 1)
+            kept_bytes = sum(entry.article_count for entry in kept) * bytes_per_article
+            while kept and kept_bytes > retention.max_bytes:
+                entry = kept.pop()
+                kept_bytes -= entry.article_count * bytes_per_article
+                expired.add(entry.search_key)
+        return expired
+
+    def _unindex(self, search_keys: Iterable[str]):
+        """삭제된 검색을 전문 검색 색인에서 제거합니다. 실패해도 다음 sync()에서 정리됩니다."""
+        if self.search_index is None:
+            return
+        try:
+            self.search_index.remove(search_keys)
+        except Exception as e:
+            logger.warning(f"검색 색인 정리 실패: {e}")
+
+    def attach_index(self, search_index: SearchIndex):
+        """
+        전문 검색 색인을 연결합니다. 연결 후 save()가 성공할 때마다 색인이 갱신되며,
+        연결 시점에 저장소와 색인의 차이를 동기화합니다.
+        """
+        self.search_index = search_index
+        try:
+            search_index.sync(self)
+        except Exception as e:
+            logger.warning(f"검색 색인 동기화 실패: {e}")
+
+    def search_archive(self, query: str, limit: int = 10) -> List[Tuple[SearchEntry, float]]:
+        """
+        저장된 기사 제목/스니펫/AI 요약에서 질의와 관련된 과거 검색을 BM25 점수 순으로 반환합니다.
+        색인이 연결되지 않았으면 빈 리스트를 반환합니다.
+        """
+        if self.search_index is None:
+            return []
+        try:
+            return self.search_index.search(query, limit)
+        except Exception as e:
+            logger.error(f"기록 검색 실패: {e}")
+            return []
+
+    def _index_saved(self, search_result: SearchResult):
+        """저장된 SearchResult를 색인에 반영합니다. 색인 실패는 저장 결과에 영향을 주지 않습니다."""
+        if self.search_index is None:
+            return
+        try:
+            self.search_index.add(search_result)
+        except Exception as e:
+            logger.warning(f"검색 색인 갱신 실패: {e}")
+
+    def get_article_urls(self, keyword: str) -> Set[str]:
+        """
+        키워드가 정확히 같은 검색들에 저장된 기사(합쳐진 다른 매체 기사 포함)의 정규화 URL 집합을 반환합니다. (관심 키워드 증분 갱신용)
+        기본 구현은 iter_history로 조각 단위로 읽으며, 구현체는 저장소에서 URL만 읽도록 재정의합니다.
+        """
+        urls = set()
+        for chunk in self.iter_history(keyword=keyword):
+            matched = chunk.loc[chunk['keyword'].astype(str) == keyword]
+            urls.update(self._row_urls(matched['url'], matched.get('alternative_sources')))
+        urls.discard("")
+        return urls
+
+    @staticmethod
+    def _row_urls(urls: Iterable, alternative_sources: Optional[Iterable] = None) -> Set[str]:
+        """기사 URL과 저장된 다른 매체 기사 목록(JSON)의 URL을 정규화해 모읍니다."""
+        result = {normalize_url(url) for url in urls if isinstance(url, str) and url}
+        for sources in (alternative_sources if alternative_sources is not None else []):
+            result.update(normalize_url(url) for _, url in BaseSearchRepository._sources(sources))
+        return result
+
+    def iter_history(self, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                     keyword: Optional[str] = None, chunk_size: int = EXPORT_CHUNK_SIZE,
+                     published_since: Optional[datetime] = None,
+                     published_until: Optional[datetime] = None) -> Iterator[pd.DataFrame]:
+        """
+        기간/키워드 조건에 맞는 검색 기록을 Long format DataFrame 조각(chunk) 단위로 반환합니다. (내보내기용)
+        기본 구현은 전체 데이터를 읽어 나누며, 구현체는 저장소에서 직접 나눠 읽도록 재정의합니다.
+        :param since: 이 시각 이후(포함) 검색만
+        :param until: 이 시각 이전(미포함) 검색만
+        :param keyword: 검색 키워드에 포함된 문자열 (대소문자 무시)
+        :param chunk_size: 조각당 최대 행 수
+        :param published_since: 기사 발행 시각이 이 시각 이후(포함)인 행만 (발행일이 없는 기사는 제외)
+        :param published_until: 기사 발행 시각이 이 시각 이전(미포함)인 행만
+        """
+        df = self._filter_history(self.load(), since, until, keyword, published_since, published_until)
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size]
+
+    @staticmethod
+    def _filter_history(df: pd.DataFrame, since: Optional[datetime], until: Optional[datetime],
+                        keyword: Optional[str], published_since: Optional[datetime] = None,
+                        published_until: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        Long format DataFrame을 검색 시간 범위, 키워드 포함 여부, 기사 발행 시각 범위로 거릅니다.
+        발행 시각은 형식이 섞인 pub_date 문자열을 조각마다 한 번에 해석해 UTC로 비교합니다. (시간대 없는 기준 시각은 로컬 시각)
+        """
+        if df.empty or (since is None and until is None and not keyword
+                        and published_since is None and published_until is None):
+            return df
+        mask = pd.Series(True, index=df.index)
+        if since is not None or until is not None:
+            times = pd.to_datetime(df['search_time'], errors='coerce')
+            if since is not None:
+                mask &= times >= since
+            if until is not None:
+                mask &= times < until
+        if keyword:
+            mask &= df['keyword'].astype(str).str.contains(keyword, case=False, regex=False)
+        if published_since is not None or published_until is not None:
+            published = parse_datetimes(df['pub_date'])
+            published.index = df.index
+            if published_since is not None:
+                mask &= published >= to_utc(published_since)
+            if published_until is not None:
+                mask &= published < to_utc(published_until)
+        return df[mask]
+
+    @staticmethod
+    def _text(value) -> str:
+        """저장된 텍스트 값을 문자열로 복원합니다. 빈 값(None/NaN)은 빈 문자열입니다."""
+        return "" if value is None or (not isinstance(value, str) and pd.isna(value)) else str(value)
+
+    @staticmethod
+    def _sources(value) -> List[Tuple[str, str]]:
+        """저장된 다른 매체 기사 목록(JSON)을 [(출처, URL), ...]로 복원합니다. 빈 값이나 해석할 수 없는 값은 빈 리스트입니다."""
+        text = BaseSearchRepository._text(value)
+        if not text:
+            return []
+        try:
+            return [(str(source), str(url)) for source, url in json.loads(text)]
+        except (ValueError, TypeError):
+            logger.warning(f"다른 매체 기사 목록을 해석할 수 없습니다: {text[:80]}")
+            return []
+
+    @staticmethod
+    def _rows_to_result(result_df: pd.DataFrame) -> Optional[SearchResult]:
+        """
+        한 검색에 해당하는 Long format 행들을 SearchResult 객체로 복원합니다.
+        모든 저장소 구현체가 같은 방식으로 객체를 복원하도록 공유하는 헬퍼입니다.
+        """
+        if result_df.empty:
+            return None
+
+        first_row = result_df.iloc[0]
+
+        result_df = result_df.sort_values(by='article_index')
+        pub_dates = result_df['pub_date'] if 'pub_date' in result_df else pd.Series(None, index=result_df.index, dtype=object)
+        published = parse_datetimes(pub_dates)
+        articles = []
+        for (_, row), pub_date, published_at in zip(result_df.iterrows(), pub_dates, published):
+            articles.append(NewsArticle(
+                title=BaseSearchRepository._text(row['title']),  # 비어 있는 값은 'nan' 문자열 대신 빈 문자열로 복원
+                url=str(row['url']),
+                snippet=BaseSearchRepository._text(row['snippet']),
+                pub_date=clean_date_text(pub_date),  # 비어 있는 발행일은 'nan' 문자열 대신 None으로 복원
+                published_at=None if pd.isna(published_at) else published_at.to_pydatetime(),
+                alternative_sources=BaseSearchRepository._sources(row.get('alternative_sources'))
+            ))
+
+        return SearchResult(
+            search_key=str(first_row['search_key']),
+            search_time=pd.to_datetime(first_row['search_time']),
+            keyword=str(first_row['keyword']),
+            articles=articles,
+            ai_summary=BaseSearchRepository._text(first_row['ai_summary']),
+            ai_keywords=BaseSearchRepository._text(first_row.get('ai_keywords'))  # 이전 형식 기록에는 컬럼이 없을 수 있음
+        )
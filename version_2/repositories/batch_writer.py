@@ -0,0 +1,75 @@
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Callable, List, Tuple
+from domain.search_result import SearchResult
+
+logger = logging.getLogger(__name__)
+
+# 한 번의 그룹 커밋에 묶는 최대 저장 요청 수
+MAX_BATCH_SIZE = 64
+
+# 첫 요청이 도착한 뒤 다른 세션의 요청을 더 모으기 위해 기다리는 최대 시간(초)
+MAX_BATCH_WAIT = 0.005
+
+class BatchWriter:
+    """
+    여러 세션의 저장 요청을 하나의 쓰기 스레드로 모아 처리하는 그룹 커밋 작성기.
+    submit()으로 들어온 SearchResult를 큐에 쌓고, 쓰기 스레드가 모인 요청을 commit_fn으로 한 번에 기록합니다.
+    (예: CSV 추가 1회 + fsync 1회) 각 요청의 Future는 자신이 포함된 그룹이 디스크에 기록된 뒤 완료됩니다.
+    그룹에 포함되기 전에 취소(Future.cancel)된 요청은 기록하지 않습니다.
+    """
+    def __init__(self, commit_fn: Callable[[List[SearchResult]], None], name: str = "search-history-writer"):
+        """
+        :param commit_fn: SearchResult 목록을 한 번에 기록하는 함수. 예외를 던지면 그룹의 모든 요청이 실패 처리됩니다.
+        :param name: 쓰기 스레드 이름
+        """
+        self.commit_fn = commit_fn
+        self.name = name
+        self._queue: "queue.Queue[Tuple[SearchResult, Future]]" = queue.Queue()
+        self._thread_lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, search_result: SearchResult) -> Future:
+        """
+        저장 요청을 큐에 넣습니다.
+        :return: 그룹 커밋이 끝나면 True(성공)로 완료되고, 실패하면 예외로 완료되는 Future
+        """
+        future = Future()
+        self._queue.put((search_result, future))
+        self._ensure_thread()
+        return future
+
+    def _ensure_thread(self):
+        """쓰기 스레드가 없으면 시작합니다."""
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        """큐에서 요청을 꺼내 그룹 단위로 기록합니다."""
+        while True:
+            batch = [self._queue.get()]
+            # 이미 쌓여 있거나 잠시 뒤 도착하는 요청을 같은 그룹으로 묶음
+            while len(batch) < MAX_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get(timeout=MAX_BATCH_WAIT))
+                except queue.Empty:
+                    break
+
+            # 기다리다 취소된 요청은 빼고, 남은 요청은 실행 중으로 표시해 더는 취소되지 않게 함
+            batch = [(search_result, future) for search_result, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            results = [search_result for search_result, _ in batch]
+            try:
+                self.commit_fn(results)
+            except Exception as e:
+                logger.error(f"그룹 커밋 실패 ({len(batch)}건): {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+            else:
+                for _, future in batch:
+                    future.set_result(True)
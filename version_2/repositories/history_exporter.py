@@ -0,0 +1,90 @@
+import gzip
+import io
+import tempfile
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pandas as pd
+from datetime import datetime
+from typing import BinaryIO, Optional
+from repositories.base_repository import BaseSearchRepository, HISTORY_COLUMNS
+
+# 내보내기 형식별 (파일 확장자, MIME 타입)
+EXPORT_FORMATS = {
+    "csv": ("csv", "text/csv"),
+    "csv.gz": ("csv.gz", "application/gzip"),
+    "jsonl": ("jsonl", "application/x-ndjson"),
+    "parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+# 이 크기를 넘는 내보내기 결과는 메모리 대신 임시 파일에 기록
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+# 내보내기 파일의 컬럼 스키마 (저장소와 관계없이 article_index 외에는 문자열로 통일)
+EXPORT_SCHEMA = pa.schema([
+    (col, pa.int64() if col == "article_index" else pa.string()) for col in HISTORY_COLUMNS
+])
+
+def _normalize_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """저장소마다 다른 컬럼 타입을 내보내기 스키마(article_index는 정수, 나머지는 문자열)로 맞춥니다."""
+    chunk = chunk.reindex(columns=HISTORY_COLUMNS)
+    normalized = {}
+    for col in HISTORY_COLUMNS:
+        values = chunk[col]
+        if col == "article_index":
+            normalized[col] = pd.to_numeric(values, errors='coerce').astype("Int64")
+        else:
+            normalized[col] = values.astype(object).where(values.notna(), None).map(
+                lambda v: v if v is None or isinstance(v, str) else str(v)
+            )
+    return pd.DataFrame(normalized)
+
+def export_history(repository: BaseSearchRepository, fmt: str = "csv",
+                   since: Optional[datetime] = None, until: Optional[datetime] = None,
+                   keyword: Optional[str] = None, published_since: Optional[datetime] = None,
+                   published_until: Optional[datetime] = None) -> BinaryIO:
+    """
+    검색 기록을 저장소에서 조각 단위로 읽어 지정한 형식의 파일 객체로 내보냅니다.
+    전체 데이터를 하나의 문자열로 만들지 않고, 조각마다 바로 기록합니다.
+    결과는 SPOOL_MAX_BYTES까지는 메모리에, 넘으면 임시 파일에 저장됩니다.
+    :param repository: 검색 기록 리포지토리
+    :param fmt: 내보내기 형식 (EXPORT_FORMATS의 키)
+    :param since: 이 시각 이후(포함) 검색만
+    :param until: 이 시각 이전(미포함) 검색만
+    :param keyword: 검색 키워드에 포함된 문자열
+    :param published_since: 기사 발행 시각이 이 시각 이후(포함)인 기사만
+    :param published_until: 기사 발행 시각이 이 시각 이전(미포함)인 기사만
+    :return: 처음 위치로 되감긴 바이너리 파일 객체
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 내보내기 형식입니다: {fmt}")
+
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    chunks = (_normalize_chunk(chunk) for chunk in repository.iter_history(
+        since, until, keyword, published_since=published_since, published_until=published_until
+    ))
+
+    if fmt == "parquet":
+        with pq.ParquetWriter(output, EXPORT_SCHEMA, compression="zstd") as writer:
+            for chunk in chunks:
+                writer.write_table(pa.Table.from_pandas(chunk, schema=EXPORT_SCHEMA, preserve_index=False))
+    else:
+        raw = gzip.GzipFile(fileobj=output, mode='wb') if fmt == "csv.gz" else output
+        text = io.TextIOWrapper(raw, encoding='utf-8' if fmt == "jsonl" else 'utf-8-sig', newline='')
+        header_written = False
+        for chunk in chunks:
+            if fmt == "jsonl":
+                text.write(chunk.to_json(orient='records', lines=True, force_ascii=False))
+            else:
+                chunk.to_csv(text, index=False, header=not header_written)
+                header_written = True
+        if fmt != "jsonl" and not header_written:
+            # 조건에 맞는 기록이 없어도 헤더는 포함
+            pd.DataFrame(columns=HISTORY_COLUMNS).to_csv(text, index=False)
+        text.flush()
+        # TextIOWrapper를 닫으면 하위 파일까지 닫히므로 분리만 함
+        text.detach()
+        if raw is not output:
+            raw.close()
+
+    output.seek(0)
+    return output
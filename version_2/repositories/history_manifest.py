@@ -0,0 +1,291 @@
+import os
+import io
+import csv
+import json
+import logging
+import bisect
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from domain.search_entry import SearchEntry
+
+logger = logging.getLogger(__name__)
+
+def _parse_time(value: str) -> datetime:
+    """매니페스트의 search_time 문자열을 datetime으로 변환합니다. 형식이 잘못되면 가장 오래된 시각으로 취급합니다."""
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return datetime.min
+
+class HistoryManifest:
+    """
+    검색 기록 CSV 옆에 두는 경량 매니페스트(sidecar) 파일을 관리하는 클래스.
+    검색 단위로 (search_key, keyword, search_time, 기사 수, CSV 내 행 바이트 범위)만 보관하므로
+    히스토리 목록을 만들 때 기사 본문과 요약을 파싱하지 않아도 되고,
+    특정 검색의 행만 seek하여 읽을 수 있는 오프셋 인덱스 역할도 합니다.
+
+    파일 형식(JSON):
+    {"version": 2, "csv_size": <반영한 CSV 크기>, "csv_mtime_ns": <반영한 CSV 수정 시각>,
+     "entries": [{"search_key", "keyword", "search_time", "article_count",
+                  "ranges": [[시작 바이트, 길이], ...]}, ...]}
+    CSV 크기나 수정 시각이 기록과 다르면 앱 밖에서 CSV가 바뀐 것으로 보고 CSV를 스캔해 다시 만듭니다.
+    """
+    VERSION = 2
+
+    def __init__(self, csv_path: str):
+        """
+        :param csv_path: 매니페스트가 설명하는 검색 기록 CSV 경로
+        """
+        self.csv_path = csv_path
+        self.manifest_path = f"{csv_path}.manifest.json"
+        self._lock = threading.RLock()
+        self._csv_size: Optional[int] = None
+        self._csv_mtime_ns: Optional[int] = None
+        self._entries: Dict[str, dict] = {}
+        # 목록 조회용 정렬 인덱스 (필요할 때 만들고, 저장 시 삽입 위치를 찾아 갱신)
+        # _by_time: (검색 시간, search_key) 오름차순 / _by_keyword: (소문자 키워드, search_key) 오름차순
+        self._by_time: Optional[List[Tuple[datetime, str]]] = None
+        self._by_keyword: Optional[List[Tuple[str, str]]] = None
+
+    def list_entries(self, offset: int = 0, limit: Optional[int] = None, keyword_prefix: Optional[str] = None,
+                     since: Optional[datetime] = None) -> List[SearchEntry]:
+        """
+        매니페스트의 검색 항목을 검색 시간 기준 최신순으로 반환합니다.
+        정렬 인덱스에서 필요한 구간만 잘라 읽으므로 전체 기록 수와 관계없이 페이지 크기만큼만 처리합니다.
+        매니페스트가 없거나 CSV와 맞지 않으면 먼저 다시 만듭니다.
+        :param offset: 건너뛸 검색 수
+        :param limit: 최대 반환 개수 (None이면 전체)
+        :param keyword_prefix: 키워드가 이 문자열로 시작하는 검색만 (대소문자 무시)
+        :param since: 이 시각 이후(포함) 검색만
+        """
+        with self._lock:
+            self._ensure_fresh()
+            self._ensure_sorted()
+            if keyword_prefix:
+                # 키워드 인덱스에서 접두어 구간을 찾은 뒤 그 안에서만 시간순 정렬
+                prefix = keyword_prefix.lower()
+                lo = bisect.bisect_left(self._by_keyword, (prefix,))
+                hi = bisect.bisect_left(self._by_keyword, (prefix + "\U0010ffff",))
+                matches = sorted(
+                    ((_parse_time(self._entries[key]["search_time"]), key) for _, key in self._by_keyword[lo:hi]),
+                    reverse=True
+                )
+                if since is not None:
+                    matches = [match for match in matches if match[0] >= since]
+                window = matches[offset:None if limit is None else offset + limit]
+            else:
+                # 시간 인덱스의 끝(최신)에서 offset만큼 떨어진 구간만 잘라 냄
+                start = bisect.bisect_left(self._by_time, (since,)) if since is not None else 0
+                hi = len(self._by_time) - offset
+                lo = start if limit is None else max(start, hi - limit)
+                window = self._by_time[lo:hi][::-1] if hi > lo else []
+            return [self._to_entry(key) for _, key in window]
+
+    def _to_entry(self, search_key: str) -> SearchEntry:
+        """매니페스트 항목을 SearchEntry로 변환합니다."""
+        entry = self._entries[search_key]
+        return SearchEntry(
+            search_key=search_key,
+            keyword=entry["keyword"],
+            search_time=_parse_time(entry["search_time"]),
+            article_count=entry["article_count"]
+        )
+
+    def _ensure_sorted(self):
+        """정렬 인덱스가 없으면 현재 항목으로 만듭니다."""
+        if self._by_time is not None and self._by_keyword is not None:
+            return
+        self._by_time = sorted((_parse_time(entry["search_time"]), key) for key, entry in self._entries.items())
+        self._by_keyword = sorted((str(entry["keyword"]).lower(), key) for key, entry in self._entries.items())
+
+    def _invalidate_sorted(self):
+        """항목이 통째로 바뀌면 정렬 인덱스를 버립니다. (다음 조회 때 다시 만듦)"""
+        self._by_time = None
+        self._by_keyword = None
+
+    def get_ranges(self, search_key: str) -> Optional[List[Tuple[int, int]]]:
+        """
+        search_key에 해당하는 행들의 CSV 내 (시작 바이트, 길이) 목록을 반환합니다.
+        매니페스트가 없거나 CSV와 맞지 않으면 먼저 다시 만듭니다. 키가 없으면 None을 반환합니다.
+        """
+        with self._lock:
+            self._ensure_fresh()
+            entry = self._entries.get(search_key)
+            if entry is None:
+                return None
+            return [tuple(r) for r in entry["ranges"]]
+
+    def get_keyword_ranges(self, keyword: str) -> List[Tuple[int, int]]:
+        """
+        키워드가 정확히 같은 검색들의 행 (시작 바이트, 길이) 목록을 CSV 내 위치 순으로 반환합니다.
+        키워드 인덱스에서 해당 구간만 찾으므로 전체 기록 수와 관계없이 그 키워드의 검색만 처리합니다.
+        """
+        with self._lock:
+            self._ensure_fresh()
+            self._ensure_sorted()
+            lower = str(keyword).lower()
+            lo = bisect.bisect_left(self._by_keyword, (lower,))
+            hi = bisect.bisect_left(self._by_keyword, (lower + "\0",))
+            return sorted(
+                tuple(r)
+                for _, key in self._by_keyword[lo:hi] if str(self._entries[key]["keyword"]) == keyword
+                for r in self._entries[key]["ranges"]
+            )
+
+    def record_append(self, search_key: str, keyword: str, search_time: str, article_count: int,
+                      offset: int, length: int, csv_size: int):
+        """
+        save()가 CSV 끝에 추가한 행들을 매니페스트에 반영합니다.
+        :param offset: 추가한 행들의 CSV 내 시작 바이트 위치
+        :param length: 추가한 행들의 바이트 길이
+        :param csv_size: 추가 후 CSV 파일 크기
+        """
+        with self._lock:
+            # 메모리의 매니페스트가 추가 직전 CSV 끝과 다르면 다른 프로세스가 갱신한 매니페스트 파일을 먼저 읽음
+            if self._csv_size is None or not 0 <= offset - self._csv_size <= 1:
+                self._load()
+            # 추가 직전 CSV 끝과 매니페스트가 맞지 않으면(앱 밖에서 변경 등) 증분 반영 대신 전체를 다시 만듦
+            # 직전 기록이 줄바꿈 없이 끝나 save()가 줄바꿈 1바이트를 보정한 경우는 허용
+            if self._csv_size is None or not 0 <= offset - self._csv_size <= 1:
+                self.rebuild()
+                return
+            self._merge_entry(search_key, keyword, search_time, article_count, offset, offset + length)
+            self._csv_size = csv_size
+            self._csv_mtime_ns = self._stat_csv()[1]
+            self._write()
+
+    def rebuild(self):
+        """CSV 파일 전체를 한 번 스캔하여 매니페스트를 다시 만듭니다."""
+        with self._lock:
+            self._entries = {}
+            self._invalidate_sorted()
+            self._csv_size, self._csv_mtime_ns = self._stat_csv()
+            if os.path.exists(self.csv_path):
+                self._scan_csv()
+            self._write()
+
+    def _stat_csv(self) -> Tuple[int, int]:
+        """현재 CSV 파일의 (크기, 수정 시각 ns)를 반환합니다. 파일이 없으면 (0, 0)입니다."""
+        try:
+            stat = os.stat(self.csv_path)
+            return stat.st_size, stat.st_mtime_ns
+        except FileNotFoundError:
+            return 0, 0
+
+    def _ensure_fresh(self):
+        """메모리/파일의 매니페스트가 현재 CSV의 크기 및 수정 시각과 일치하도록 보장합니다."""
+        fingerprint = self._stat_csv()
+        if (self._csv_size, self._csv_mtime_ns) == fingerprint:
+            return
+        if self._load() and (self._csv_size, self._csv_mtime_ns) == fingerprint:
+            return
+        logger.info(f"검색 기록 매니페스트를 다시 생성합니다: {self.manifest_path}")
+        self.rebuild()
+
+    def _load(self) -> bool:
+        """매니페스트 파일을 읽어 메모리에 올립니다. 파일이 없거나 손상되었거나 형식이 다르면 False를 반환합니다."""
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != self.VERSION:
+                raise ValueError("manifest version mismatch")
+            self._entries = {entry["search_key"]: entry for entry in data["entries"]}
+            self._invalidate_sorted()
+            self._csv_size = data["csv_size"]
+            self._csv_mtime_ns = data["csv_mtime_ns"]
+            return True
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            self._entries = {}
+            self._invalidate_sorted()
+            self._csv_size = None
+            self._csv_mtime_ns = None
+            return False
+
+    def _write(self):
+        """매니페스트를 임시 파일에 기록한 뒤 원자적으로 교체합니다."""
+        data = {
+            "version": self.VERSION,
+            "csv_size": self._csv_size,
+            "csv_mtime_ns": self._csv_mtime_ns,
+            "entries": list(self._entries.values())
+        }
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _merge_entry(self, search_key: str, keyword: str, search_time: str, article_count: int,
+                     start: int, end: int):
+        """
+        검색 항목을 추가하거나, 같은 search_key가 이미 있으면 기사 수와 바이트 범위를 합칩니다.
+        (같은 분에 같은 키워드로 검색하면 search_key가 같아짐)
+        바로 이어지는 범위는 하나로 합쳐 대부분의 검색이 범위 1개만 갖도록 합니다.
+        """
+        entry = self._entries.get(search_key)
+        if entry is None:
+            self._entries[search_key] = {
+                "search_key": search_key,
+                "keyword": keyword,
+                "search_time": search_time,
+                "article_count": article_count,
+                "ranges": [[start, end - start]],
+            }
+            if self._by_time is not None and self._by_keyword is not None:
+                bisect.insort(self._by_time, (_parse_time(search_time), search_key))
+                bisect.insort(self._by_keyword, (str(keyword).lower(), search_key))
+            return
+        last_range = entry["ranges"][-1]
+        if last_range[0] + last_range[1] == start:
+            last_range[1] += end - start
+        else:
+            entry["ranges"].append([start, end - start])
+        entry["article_count"] += article_count
+        latest_time = max(entry["search_time"], search_time, key=_parse_time)
+        if latest_time != entry["search_time"] and self._by_time is not None:
+            # 검색 시간이 바뀐 항목은 시간 인덱스에서 위치를 옮김
+            self._by_time.remove((_parse_time(entry["search_time"]), search_key))
+            bisect.insort(self._by_time, (_parse_time(latest_time), search_key))
+        entry["search_time"] = latest_time
+
+    def _scan_csv(self):
+        """
+        CSV를 레코드 단위로 스캔하며 검색별 기사 수와 행 바이트 범위를 계산합니다.
+        따옴표 안의 줄바꿈을 고려해, 한 줄을 읽을 때마다 누적 따옴표 수가 짝수가 되면 레코드가 끝난 것으로 봅니다.
+        """
+        with open(self.csv_path, 'rb') as f:
+            header_line = f.readline()
+            header = next(csv.reader([header_line.decode('utf-8-sig')]), [])
+            try:
+                key_idx = header.index("search_key")
+                time_idx = header.index("search_time")
+                keyword_idx = header.index("keyword")
+            except ValueError:
+                return
+
+            offset = len(header_line)
+            record_start = offset
+            buffer = b""
+            quote_count = 0
+            for line in f:
+                # 스캔 시작 시점의 파일 크기까지만 반영 (스캔 중 추가된 행은 다음 갱신에서 처리)
+                if offset + len(line) > self._csv_size:
+                    break
+                buffer += line
+                offset += len(line)
+                quote_count += line.count(b'"')
+                if quote_count % 2:
+                    continue
+                row = next(csv.reader(io.StringIO(buffer.decode('utf-8'))), None)
+                if row and len(row) > max(key_idx, time_idx, keyword_idx):
+                    self._merge_entry(
+                        search_key=row[key_idx],
+                        keyword=row[keyword_idx],
+                        search_time=row[time_idx],
+                        article_count=1,
+                        start=record_start,
+                        end=offset
+                    )
+                buffer = b""
+                quote_count = 0
+                record_start = offset
@@ -0,0 +1,455 @@
+import os
+import glob
+import shutil
+import uuid
+import logging
+import threading
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from domain.search_result import SearchResult
+from domain.search_entry import SearchEntry
+from domain.retention_policy import RetentionPolicy
+from domain.compaction_report import CompactionReport
+from repositories.base_repository import BaseSearchRepository, HISTORY_COLUMNS, EXPORT_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Parquet 파일에 기록하는 컬럼 스키마 (파티션마다 동일해야 함께 읽을 수 있음)
+PARQUET_SCHEMA = pa.schema([
+    ("search_key", pa.string()),
+    ("search_time", pa.timestamp("us")),
+    ("keyword", pa.string()),
+    ("article_index", pa.int64()),
+    ("title", pa.string()),
+    ("url", pa.string()),
+    ("snippet", pa.string()),
+    ("pub_date", pa.string()),
+    ("ai_summary", pa.string()),
+    ("ai_keywords", pa.string()),
+    # 이전 파일에는 없는 컬럼 (읽을 때 NULL로 채워짐)
+    ("alternative_sources", pa.string()),
+])
+
+# 파티션 단위별 디렉토리 이름 형식
+PARTITION_FORMATS = {
+    "month": "%Y-%m",
+    "day": "%Y-%m-%d",
+}
+
+# search_key 끝에 붙는 타임스탬프 형식 (utils/key_generator.generate_search_key 참고)
+KEY_TIMESTAMP_FORMAT = "%Y%m%d%H%M"
+
+class ParquetSearchRepository(BaseSearchRepository):
+    """
+    월/일 단위로 파티션된 Parquet 파일에 검색 기록을 저장하는 리포지토리 클래스.
+    저장은 해당 파티션에 새 파일을 추가하는 방식이며, 조회 시 필요한 컬럼과 파티션만 읽습니다.
+    디렉토리 구조: <root>/<month|day>=<기간>/part-<시각>-<uuid>.parquet
+    """
+    def __init__(self, root_dir: str, partition: str = "month", legacy_csv_path: Optional[str] = None):
+        """
+        리포지토리 초기화 및 저장 디렉토리 생성
+        :param root_dir: 파티션 디렉토리들이 위치할 루트 경로
+        :param partition: 파티션 단위 ("month" 또는 "day")
+        :param legacy_csv_path: 기존 CSV 기록 경로. 지정하면 최초 1회 파티션으로 이관합니다.
+        """
+        if partition not in PARTITION_FORMATS:
+            raise ValueError(f"지원하지 않는 파티션 단위입니다: {partition}")
+        self.root_dir = root_dir
+        self.partition = partition
+        self._write_lock = threading.RLock()
+        # 검색 목록 캐시: 파일별 요약과 (파일 목록, 정렬된 목록)
+        self._listing_lock = threading.Lock()
+        self._file_summaries: Dict[str, pd.DataFrame] = {}
+        self._listing: Optional[Tuple[List[str], List[SearchEntry]]] = None
+        # 키워드별 기사 URL 캐시: {키워드: {파일 경로: 그 파일에 저장된 URL 집합}}
+        self._url_cache: Dict[str, Dict[str, Set[str]]] = {}
+        os.makedirs(self.root_dir, exist_ok=True)
+
+        if legacy_csv_path:
+            self.migrate_from_csv(legacy_csv_path)
+
+    def migrate_from_csv(self, csv_path: str) -> int:
+        """
+        기존 CSV 검색 기록을 파티션별 Parquet 파일로 1회 이관합니다.
+        이관 여부는 루트 디렉토리의 '_csv_migrated' 표시 파일로 판단합니다.
+        형식이 잘못된 행은 이관을 막지 않도록 _clean_legacy_rows에서 고치거나 제외합니다.
+        :param csv_path: 이관할 CSV 파일 경로
+        :return: 이관된 행 수
+        """
+        marker_path = os.path.join(self.root_dir, "_csv_migrated")
+        if os.path.exists(marker_path):
+            return 0
+
+        count = 0
+        if os.path.exists(csv_path) and os.path.getsize(csv_path) > 0:
+            df = self._clean_legacy_rows(pd.read_csv(csv_path).reindex(columns=HISTORY_COLUMNS))
+            periods = [
+                self._key_timestamp(str(key)) or time.to_pydatetime()
+                for key, time in zip(df['search_key'], df['search_time'])
+            ]
+            labels = [self._partition_dir(period) for period in periods]
+            for partition_dir, group in df.groupby(labels, sort=True):
+                self._write_partition_file(partition_dir, group)
+            count = len(df)
+
+        with open(marker_path, 'w', encoding='utf-8') as f:
+            f.write(f"{os.path.abspath(csv_path)}\n{datetime.now().isoformat(sep=' ')}\n")
+        logger.info(f"CSV 기록 {count}행을 Parquet으로 이관했습니다: {csv_path}")
+        return count
+
+    def _clean_legacy_rows(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        이관할 CSV 행을 Parquet 스키마에 맞게 정리하고, 고치거나 제외한 행 수를 로그로 남깁니다.
+        - search_key가 없는 행: 조회할 수 없으므로 제외
+        - 해석할 수 없는 search_time: search_key의 시각, 그것도 없으면 현재 시각
+        - 비어 있거나 숫자가 아닌 article_index: 같은 검색 안에서의 순서 (1부터)
+        """
+        no_key = df['search_key'].isna()
+        if no_key.any():
+            logger.warning(f"search_key가 없는 {int(no_key.sum())}행은 이관하지 않습니다.")
+            df = df[~no_key]
+        df = df.copy()
+
+        times = pd.to_datetime(df['search_time'], errors='coerce', format='mixed')
+        bad_time = times.isna()
+        if bad_time.any():
+            now = datetime.now()
+            times[bad_time] = [self._key_timestamp(str(key)) or now for key in df.loc[bad_time, 'search_key']]
+            logger.warning(
+                f"검색 시간을 해석할 수 없는 {int(bad_time.sum())}행은 search_key의 시각(없으면 현재 시각)으로 이관합니다."
+            )
+        df['search_time'] = times
+
+        index = pd.to_numeric(df['article_index'], errors='coerce')
+        bad_index = index.isna()
+        if bad_index.any():
+            index[bad_index] = df.groupby('search_key').cumcount()[bad_index] + 1
+            logger.warning(f"article_index가 없는 {int(bad_index.sum())}행은 검색 안에서의 순서로 채워 이관합니다.")
+        df['article_index'] = index.astype('int64')
+        return df
+
+    def _write_partition_file(self, partition_dir: str, df: pd.DataFrame):
+        """Long format DataFrame을 파티션 디렉토리에 새 Parquet 파일로 기록합니다."""
+        with self._write_lock:
+            tmp_path, path = self._stage_partition_file(partition_dir, df)
+            os.replace(tmp_path, path)
+
+    @staticmethod
+    def _stage_partition_file(partition_dir: str, df: pd.DataFrame) -> Tuple[str, str]:
+        """
+        Long format DataFrame을 파티션 디렉토리의 임시 파일로 기록합니다.
+        '_'로 시작하는 임시 파일은 조회 대상에서 제외되므로, 반환된 최종 경로로 이름을 바꿔야 원자적으로 공개됩니다.
+        :return: (임시 파일 경로, 최종 파일 경로)
+        """
+        os.makedirs(partition_dir, exist_ok=True)
+        table = pa.Table.from_pandas(df.reindex(columns=HISTORY_COLUMNS), schema=PARQUET_SCHEMA, preserve_index=False)
+
+        file_name = f"part-{datetime.now().strftime('%Y%m%d%H%M%S%f')}-{uuid.uuid4().hex[:8]}.parquet"
+        tmp_path = os.path.join(partition_dir, f"_{file_name}.tmp")
+        pq.write_table(table, tmp_path, compression="zstd")
+        return tmp_path, os.path.join(partition_dir, file_name)
+
+    def _partition_dir(self, period: datetime) -> str:
+        """기간(시각)에 해당하는 파티션 디렉토리 경로를 반환합니다."""
+        label = period.strftime(PARTITION_FORMATS[self.partition])
+        return os.path.join(self.root_dir, f"{self.partition}={label}")
+
+    @staticmethod
+    def _key_timestamp(search_key: str) -> Optional[datetime]:
+        """search_key 끝의 'yyyymmddhhmm' 타임스탬프를 datetime으로 변환합니다. 형식이 다르면 None을 반환합니다."""
+        try:
+            return datetime.strptime(search_key.rsplit('-', 1)[-1], KEY_TIMESTAMP_FORMAT)
+        except ValueError:
+            return None
+
+    def _all_files(self) -> List[str]:
+        """모든 파티션의 Parquet 파일 경로를 반환합니다."""
+        return sorted(glob.glob(os.path.join(self.root_dir, f"{self.partition}=*", "*.parquet")))
+
+    def _read(self, files: List[str], columns: Optional[List[str]] = None, filter_expr=None) -> pd.DataFrame:
+        """지정한 파일들에서 필요한 컬럼/행만 읽어 DataFrame으로 반환합니다. NULL 값은 CSV 로드와 같이 NaN으로 맞춥니다."""
+        if not files:
+            return pd.DataFrame(columns=columns or HISTORY_COLUMNS)
+        dataset = ds.dataset(files, schema=PARQUET_SCHEMA, format="parquet")
+        df = dataset.to_table(columns=columns, filter=filter_expr).to_pandas()
+        return df.where(df.notna(), np.nan)
+
+    def load(self) -> pd.DataFrame:
+        """
+        모든 파티션의 기록을 저장 순서대로 DataFrame으로 반환합니다.
+        """
+        try:
+            return self._read(self._all_files())
+        except Exception as e:
+            logger.warning(f"Parquet 로드 실패: {e}")
+            return pd.DataFrame(columns=HISTORY_COLUMNS)
+
+    def save(self, search_result: SearchResult) -> bool:
+        """
+        SearchResult 객체를 search_key의 타임스탬프가 속한 파티션에 새 Parquet 파일로 저장합니다.
+        기존 파일은 다시 읽거나 재작성하지 않습니다.
+        :param search_result: 저장할 검색 결과 객체
+        :return: 저장 성공 여부
+        """
+        try:
+            df = search_result.to_dataframe()
+            if df.empty:
+                return True
+
+            # find_by_key가 키만으로 파티션을 찾을 수 있도록 키의 타임스탬프 기준으로 파티셔닝
+            period = self._key_timestamp(search_result.search_key) or pd.Timestamp(search_result.search_time).to_pydatetime()
+            df['search_time'] = pd.to_datetime(df['search_time'])
+            self._write_partition_file(self._partition_dir(period), df)
+        except Exception as e:
+            logger.error(f"Parquet 저장 실패: {e}")
+            return False
+        self._index_saved(search_result)
+        return True
+
+    def get_all_keys(self) -> List[str]:
+        """
+        저장된 모든 search_key 고유값 리스트를 검색 시간 기준 최신순으로 반환합니다.
+        search_key/search_time 두 컬럼만 읽습니다.
+        """
+        try:
+            df = self._read(self._all_files(), columns=["search_key", "search_time"])
+            if df.empty:
+                return []
+            return df.sort_values(by='search_time', ascending=False)['search_key'].unique().tolist()
+        except Exception as e:
+            logger.error(f"키 목록 추출 실패: {e}")
+            return []
+
+    def list_searches(self, offset: int = 0, limit: Optional[int] = None, keyword_prefix: Optional[str] = None,
+                      since: Optional[datetime] = None) -> List[SearchEntry]:
+        """
+        저장된 검색 목록(키, 키워드, 검색 시간, 기사 수)을 검색 시간 기준 최신순으로 반환합니다.
+        파일 구성이 바뀌지 않았으면 정렬해 둔 목록에서 필요한 구간만 잘라 반환합니다.
+        """
+        try:
+            entries = self._sorted_entries()
+        except Exception as e:
+            logger.error(f"검색 목록 조회 실패: {e}")
+            return []
+        return self._page_entries(entries, offset, limit, keyword_prefix, since)
+
+    def _sorted_entries(self) -> List[SearchEntry]:
+        """
+        전체 검색 목록을 최신순으로 정렬해 캐시하고 반환합니다.
+        Parquet 파일은 기록 후 바뀌지 않으므로 파일별로 search_key/keyword/search_time 세 컬럼의 요약을 보관하고,
+        새로 생긴 파일만 읽어 목록을 다시 만듭니다.
+        """
+        files = self._all_files()
+        with self._listing_lock:
+            if self._listing is not None and self._listing[0] == files:
+                return self._listing[1]
+
+            self._file_summaries = {path: self._file_summaries.get(path) for path in files}
+            for path, summary in self._file_summaries.items():
+                if summary is None:
+                    df = self._read([path], columns=["search_key", "keyword", "search_time"])
+                    self._file_summaries[path] = df.groupby('search_key', sort=False).agg(
+                        keyword=('keyword', 'first'),
+                        search_time=('search_time', 'max'),
+                        article_count=('search_time', 'size')
+                    )
+
+            entries = []
+            if files:
+                combined = pd.concat(self._file_summaries.values())
+                summary = combined.groupby(level=0, sort=False).agg(
+                    keyword=('keyword', 'first'),
+                    search_time=('search_time', 'max'),
+                    article_count=('article_count', 'sum')
+                ).sort_values(by='search_time', ascending=False)
+                entries = [
+                    SearchEntry(
+                        search_key=search_key,
+                        keyword=row.keyword,
+                        search_time=row.search_time.to_pydatetime(),
+                        article_count=int(row.article_count)
+                    )
+                    for search_key, row in summary.iterrows()
+                ]
+            self._listing = (files, entries)
+            return entries
+
+    def get_article_urls(self, keyword: str) -> Set[str]:
+        """
+        키워드가 정확히 같은 검색들에 저장된 기사(합쳐진 다른 매체 기사 포함)의 정규화 URL 집합을 반환합니다.
+        파일마다 keyword 조건으로 URL 컬럼만 읽고 결과를 파일별로 보관하므로(Parquet 파일은 기록 후 바뀌지 않음),
+        관심 키워드를 주기적으로 갱신해도 지난 조회 이후 새로 생긴 파일만 읽습니다.
+        """
+        try:
+            files = self._all_files()
+            with self._listing_lock:
+                cached = self._url_cache.get(keyword, {})
+                per_file = {path: cached.get(path) for path in files}
+            for path, urls in per_file.items():
+                if urls is None:
+                    df = self._read([path], columns=["url", "alternative_sources"],
+                                    filter_expr=ds.field("keyword") == keyword)
+                    per_file[path] = self._row_urls(df["url"], df["alternative_sources"])
+            with self._listing_lock:
+                # 정리로 사라진 파일의 결과는 버림
+                self._url_cache[keyword] = per_file
+        except Exception as e:
+            logger.error(f"저장된 기사 URL 조회 실패: {e}")
+            return set()
+        urls = set().union(*per_file.values())
+        urls.discard("")
+        return urls
+
+    def find_by_key(self, search_key: str) -> Optional[SearchResult]:
+        """
+        search_key의 타임스탬프로 단일 파티션만 읽어 SearchResult 객체로 반환합니다.
+        키에서 시각을 알 수 없거나 해당 파티션에 없으면 전체 파티션에서 찾습니다.
+        :param search_key: 찾을 검색 키
+        :return: SearchResult 객체 또는 None
+        """
+        key_filter = ds.field("search_key") == search_key
+        try:
+            timestamp = self._key_timestamp(search_key)
+            if timestamp is not None:
+                files = sorted(glob.glob(os.path.join(self._partition_dir(timestamp), "*.parquet")))
+                result_df = self._read(files, filter_expr=key_filter)
+                if not result_df.empty:
+                    return self._rows_to_result(result_df)
+            result_df = self._read(self._all_files(), filter_expr=key_filter)
+        except Exception as e:
+            logger.error(f"기록 조회 실패: {e}")
+            return None
+        return self._rows_to_result(result_df)
+
+    def iter_history(self, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                     keyword: Optional[str] = None, chunk_size: int = EXPORT_CHUNK_SIZE,
+                     published_since: Optional[datetime] = None,
+                     published_until: Optional[datetime] = None) -> Iterator[pd.DataFrame]:
+        """
+        조건을 Parquet 스캔 필터로 전달해 레코드 배치 단위로 반환합니다. (내보내기용)
+        기간 조건은 파티션 이름으로 먼저 걸러 범위 밖 파티션은 열지 않습니다.
+        """
+        files = self._all_files()
+        if since is not None or until is not None:
+            since_label = since.strftime(PARTITION_FORMATS[self.partition]) if since else None
+            until_label = until.strftime(PARTITION_FORMATS[self.partition]) if until else None
+            files = [
+                path for path in files
+                if (since_label is None or self._partition_label(path) >= since_label)
+                and (until_label is None or self._partition_label(path) <= until_label)
+            ]
+        if not files:
+            return
+
+        filter_expr = None
+        if since is not None:
+            filter_expr = ds.field("search_time") >= pa.scalar(pd.Timestamp(since), type=pa.timestamp("us"))
+        if until is not None:
+            expr = ds.field("search_time") < pa.scalar(pd.Timestamp(until), type=pa.timestamp("us"))
+            filter_expr = expr if filter_expr is None else filter_expr & expr
+
+        dataset = ds.dataset(files, schema=PARQUET_SCHEMA, format="parquet")
+        for batch in dataset.to_batches(filter=filter_expr, batch_size=chunk_size):
+            chunk = self._filter_history(batch.to_pandas(), None, None, keyword, published_since, published_until)
+            if not chunk.empty:
+                yield chunk
+
+    @staticmethod
+    def _partition_label(path: str) -> str:
+        """파일 경로에서 파티션 기간 라벨(예: '2026-02')을 추출합니다."""
+        return os.path.basename(os.path.dirname(path)).split('=', 1)[1]
+
+    def get_all_as_csv(self) -> str:
+        """
+        전체 데이터를 Long format CSV 문자열로 반환합니다. (다운로드용)
+        """
+        return self.load().to_csv(index=False, encoding='utf-8-sig')
+
+    def compact(self, retention: Optional[RetentionPolicy] = None) -> Optional[CompactionReport]:
+        """
+        보존 정책에 따라 만료된 검색을 삭제하고 파티션을 정리합니다.
+        파티션마다 남길 행(만료되지 않고 중복이 아닌 행)을 새 파일 1개로 기록한 뒤 기존 파일들을 삭제하므로,
+        저장할 때마다 생긴 작은 파일들도 하나로 합쳐집니다. 모든 파티션의 새 파일을 임시 파일로 기록한 뒤에만
+        이름 변경으로 공개하고 기존 파일을 삭제하므로, 기록 중 실패하면 기존 파티션은 그대로 남습니다.
+        공개 도중 중단되어 행이 중복되더라도 다음 정리에서 제거됩니다.
+        :param retention: 적용할 보존 정책 (None이면 self.retention)
+        :return: 정리 결과 보고서. 실패하면 None
+        """
+        retention = retention or self.retention
+        try:
+            with self._write_lock:
+                files = self._all_files()
+                bytes_before = sum(os.path.getsize(path) for path in files)
+                expired = self._expired_keys(self.list_searches(), retention, bytes_before)
+
+                rows_before = rows_after = 0
+                staged, obsolete, emptied = [], [], []
+                try:
+                    partition_dirs = sorted({os.path.dirname(path) for path in files})
+                    for partition_dir in partition_dirs:
+                        partition_files = [path for path in files if os.path.dirname(path) == partition_dir]
+                        df = self._read(partition_files)
+                        rows_before += len(df)
+                        kept = df[df['search_key'].notna() & ~df['search_key'].isin(expired)].drop_duplicates()
+                        rows_after += len(kept)
+                        if len(kept) == len(df) and len(partition_files) == 1:
+                            continue
+                        if kept.empty:
+                            emptied.append(partition_dir)
+                        else:
+                            staged.append(self._stage_partition_file(partition_dir, kept))
+                        obsolete.extend(partition_files)
+
+                    # 모든 파티션을 기록한 뒤에만 공개하고 기존 파일 삭제
+                    for tmp_path, path in staged:
+                        os.replace(tmp_path, path)
+                finally:
+                    for tmp_path, _ in staged:
+                        if os.path.exists(tmp_path):
+                            os.remove(tmp_path)
+                for path in obsolete:
+                    os.remove(path)
+                for partition_dir in emptied:
+                    shutil.rmtree(partition_dir, ignore_errors=True)
+
+                report = CompactionReport(
+                    searches_removed=len(expired),
+                    rows_before=rows_before,
+                    rows_after=rows_after,
+                    bytes_before=bytes_before,
+                    bytes_after=sum(os.path.getsize(path) for path in self._all_files())
+                )
+        except Exception as e:
+            logger.error(f"Parquet 정리 실패: {e}")
+            return None
+        self._unindex(expired)
+        logger.info(f"Parquet 기록 정리 완료: {report}")
+        return report
+
+    def drop_partitions_before(self, cutoff: datetime) -> int:
+        """
+        cutoff 이전 기간의 파티션 디렉토리를 통째로 삭제합니다. (보존 기간 관리용)
+        삭제한 파티션에만 있던 검색은 compact()와 같이 전문 검색 색인에서도 제거합니다.
+        :param cutoff: 이 시각이 속한 파티션보다 이전 파티션을 삭제
+        :return: 삭제한 파티션 수
+        """
+        cutoff_label = cutoff.strftime(PARTITION_FORMATS[self.partition])
+        dropped_keys = set()
+        dropped = 0
+        with self._write_lock:
+            for partition_dir in glob.glob(os.path.join(self.root_dir, f"{self.partition}=*")):
+                label = os.path.basename(partition_dir).split('=', 1)[1]
+                if label < cutoff_label:
+                    files = glob.glob(os.path.join(partition_dir, "*.parquet"))
+                    dropped_keys.update(self._read(files, columns=['search_key'])['search_key'].dropna())
+                    shutil.rmtree(partition_dir)
+                    dropped += 1
+            if dropped_keys:
+                dropped_keys -= set(self._read(self._all_files(), columns=['search_key'])['search_key'].dropna())
+        self._unindex(dropped_keys)
+        return dropped
@@ -0,0 +1,36 @@
+from config.settings import settings
+from domain.retention_policy import RetentionPolicy
+from repositories.base_repository import BaseSearchRepository
+from repositories.search_repository import SearchRepository
+from repositories.sqlite_search_repository import SqliteSearchRepository
+from repositories.parquet_search_repository import ParquetSearchRepository
+from repositories.search_index import SearchIndex
+
+def create_repository() -> BaseSearchRepository:
+    """
+    설정(STORAGE_BACKEND)에 맞는 검색 기록 리포지토리를 생성하고 전문 검색 색인(SEARCH_INDEX_PATH)을 연결합니다.
+    - csv: CSV_PATH의 CSV 파일
+    - sqlite: SQLITE_PATH의 SQLite DB (CSV_PATH의 기존 기록을 최초 1회 이관)
+    - parquet: PARQUET_PATH 아래 월/일 단위 Parquet 파티션 (CSV_PATH의 기존 기록을 최초 1회 이관)
+    보존 정책(HISTORY_MAX_*)이 설정되어 있으면 백그라운드에서 기록 정리를 한 번 실행합니다.
+    """
+    if settings.storage_backend == "sqlite":
+        repository = SqliteSearchRepository(str(settings.sqlite_path), legacy_csv_path=str(settings.csv_path))
+    elif settings.storage_backend == "parquet":
+        repository = ParquetSearchRepository(
+            str(settings.parquet_path),
+            partition=settings.parquet_partition,
+            legacy_csv_path=str(settings.csv_path)
+        )
+    else:
+        repository = SearchRepository(str(settings.csv_path))
+
+    repository.attach_index(SearchIndex(str(settings.search_index_path)))
+    repository.retention = RetentionPolicy(
+        max_age_days=settings.history_max_age_days,
+        max_searches=settings.history_max_searches,
+        max_bytes=settings.history_max_bytes
+    )
+    if repository.retention.is_active():
+        repository.compact_in_background()
+    return repository
@@ -0,0 +1,264 @@
+import os
+import re
+import math
+import sqlite3
+import logging
+import threading
+import pandas as pd
+from collections import Counter
+from contextlib import closing, contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from domain.search_result import SearchResult
+from domain.search_entry import SearchEntry
+
+logger = logging.getLogger(__name__)
+
+# BM25 파라미터
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 필드별 가중치 (제목에 나온 단어를 본문보다 중요하게 취급)
+FIELD_WEIGHTS = {
+    "title": 2,
+    "snippet": 1,
+    "ai_summary": 1,
+}
+
+# 한글/한자/가나 연속 구간과 그 외 영문/숫자 연속 구간을 나누는 패턴
+_CJK_RUN = re.compile(r"[가-힣㄰-㆏一-鿿぀-ヿ]+")
+_WORD_RUN = re.compile(r"[^\W_]+")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    search_key TEXT PRIMARY KEY,
+    keyword TEXT,
+    search_time TEXT,
+    length INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    token TEXT NOT NULL,
+    search_key TEXT NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (token, search_key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_postings_search_key ON postings(search_key);
+CREATE TABLE IF NOT EXISTS index_stats (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    doc_count INTEGER NOT NULL,
+    total_length INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO index_stats (id, doc_count, total_length) VALUES (1, 0, 0);
+"""
+
+def tokenize(text: str) -> List[str]:
+    """
+    한국어 친화적인 토크나이저.
+    - 한글/한자/가나 구간은 글자 2-gram으로 나눔 (한 글자 구간은 그대로 사용)
+    - 영문/숫자 구간은 소문자 단어 단위로 사용
+    형태소 분석기 없이도 '엔비디아' 검색이 '엔비디아의', '엔비디아가'와 일치합니다.
+    """
+    if not text or not isinstance(text, str):
+        return []
+    tokens = []
+    for word in _WORD_RUN.findall(text.lower()):
+        position = 0
+        for match in _CJK_RUN.finditer(word):
+            if match.start() > position:
+                tokens.append(word[position:match.start()])
+            run = match.group()
+            if len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+            position = match.end()
+        if position < len(word):
+            tokens.append(word[position:])
+    return tokens
+
+class SearchIndex:
+    """
+    저장된 검색 기록(기사 제목, 스니펫, AI 요약)에 대한 증분 역색인.
+    검색 1건을 문서 1개로 보고 SQLite의 postings 테이블에 (토큰, search_key, 빈도)를 저장하며,
+    질의는 토큰별 postings만 읽어 BM25로 점수를 매깁니다.
+    """
+    def __init__(self, db_path: str):
+        """
+        :param db_path: 역색인 SQLite DB 파일 경로
+        """
+        self.db_path = db_path
+        self._write_lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """작업 단위별 커넥션을 열고 트랜잭션을 커밋/롤백한 뒤 닫습니다."""
+        with closing(sqlite3.connect(self.db_path, timeout=30)) as conn:
+            with conn:
+                yield conn
+
+    @staticmethod
+    def _count_tokens(fields: Iterable[Tuple[str, str]]) -> Counter:
+        """(필드 이름, 텍스트) 목록의 토큰 빈도를 필드 가중치를 반영해 셉니다."""
+        counts = Counter()
+        for field, text in fields:
+            weight = FIELD_WEIGHTS.get(field, 1)
+            for token in tokenize(text):
+                counts[token] += weight
+        return counts
+
+    def add(self, search_result: SearchResult):
+        """
+        저장된 SearchResult 1건을 색인에 추가합니다.
+        같은 search_key가 이미 있으면(같은 분의 재검색) 빈도를 누적합니다.
+        """
+        fields = [("ai_summary", search_result.ai_summary)]
+        for article in search_result.articles:
+            fields.append(("title", article.title))
+            fields.append(("snippet", article.snippet))
+        self._add_document(
+            search_result.search_key,
+            search_result.keyword,
+            str(pd.Timestamp(search_result.search_time)),
+            self._count_tokens(fields)
+        )
+
+    def _add_document(self, search_key: str, keyword: str, search_time: str, counts: Counter):
+        """문서 1건의 토큰 빈도를 docs/postings/index_stats에 반영합니다."""
+        length = sum(counts.values())
+        with self._write_lock, self._connect() as conn:
+            existing = conn.execute("SELECT 1 FROM docs WHERE search_key = ?", (search_key,)).fetchone()
+            conn.execute(
+                "INSERT INTO docs (search_key, keyword, search_time, length) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(search_key) DO UPDATE SET length = length + excluded.length, "
+                "search_time = MAX(search_time, excluded.search_time)",
+                (search_key, keyword, search_time, length)
+            )
+            conn.executemany(
+                "INSERT INTO postings (token, search_key, tf) VALUES (?, ?, ?) "
+                "ON CONFLICT(token, search_key) DO UPDATE SET tf = tf + excluded.tf",
+                ((token, search_key, tf) for token, tf in counts.items())
+            )
+            conn.execute(
+                "UPDATE index_stats SET doc_count = doc_count + ?, total_length = total_length + ? WHERE id = 1",
+                (0 if existing else 1, length)
+            )
+
+    def remove(self, search_keys: Iterable[str]) -> int:
+        """
+        색인에서 문서들을 제거합니다. (기록 정리 등으로 삭제된 검색)
+        :return: 제거한 문서 수
+        """
+        removed = 0
+        with self._write_lock, self._connect() as conn:
+            for search_key in search_keys:
+                row = conn.execute("SELECT length FROM docs WHERE search_key = ?", (search_key,)).fetchone()
+                if row is None:
+                    continue
+                conn.execute("DELETE FROM postings WHERE search_key = ?", (search_key,))
+                conn.execute("DELETE FROM docs WHERE search_key = ?", (search_key,))
+                conn.execute(
+                    "UPDATE index_stats SET doc_count = doc_count - 1, total_length = total_length - ? WHERE id = 1",
+                    (row[0],)
+                )
+                removed += 1
+        return removed
+
+    def indexed_keys(self) -> set:
+        """색인된 search_key 집합을 반환합니다."""
+        with self._connect() as conn:
+            return {row[0] for row in conn.execute("SELECT search_key FROM docs")}
+
+    def sync(self, repository) -> Tuple[int, int]:
+        """
+        저장소와 색인을 맞춥니다. 색인에 없는 검색은 추가하고, 저장소에서 사라진 검색은 제거합니다.
+        색인이 처음 만들어지거나 앱 밖에서 기록이 바뀐 경우에 사용합니다.
+        :param repository: BaseSearchRepository 구현체
+        :return: (추가한 문서 수, 제거한 문서 수)
+        """
+        stored_keys = {entry.search_key for entry in repository.list_searches()}
+        indexed_keys = self.indexed_keys()
+        removed = self.remove(indexed_keys - stored_keys)
+        missing = stored_keys - indexed_keys
+        if not missing:
+            return 0, removed
+
+        # 저장소를 조각 단위로 읽으며 누락된 검색의 행만 누적 (요약은 검색당 한 번만 셈)
+        documents: Dict[str, dict] = {}
+        for chunk in repository.iter_history():
+            chunk = chunk[chunk['search_key'].isin(missing)]
+            for row in chunk.itertuples(index=False):
+                doc = documents.get(row.search_key)
+                if doc is None:
+                    doc = documents[row.search_key] = {
+                        "keyword": str(row.keyword),
+                        "search_time": str(row.search_time),
+                        "counts": self._count_tokens([("ai_summary", row.ai_summary)]),
+                    }
+                doc["counts"].update(self._count_tokens([("title", row.title), ("snippet", row.snippet)]))
+
+        for search_key, doc in documents.items():
+            self._add_document(search_key, doc["keyword"], doc["search_time"], doc["counts"])
+        logger.info(f"검색 기록 색인 동기화: {len(documents)}건 추가, {removed}건 제거")
+        return len(documents), removed
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[SearchEntry, float]]:
+        """
+        질의와 관련된 과거 검색을 BM25 점수 순으로 반환합니다.
+        :param query: 검색어 (예: "NVIDIA", "반도체 수출")
+        :param limit: 최대 결과 수
+        :return: [(검색 항목, 점수), ...]
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+
+        with self._connect() as conn:
+            doc_count, total_length = conn.execute(
+                "SELECT doc_count, total_length FROM index_stats WHERE id = 1"
+            ).fetchone()
+            if doc_count <= 0:
+                return []
+            avg_length = total_length / doc_count
+
+            placeholders = ", ".join("?" for _ in tokens)
+            rows = conn.execute(
+                f"SELECT p.token, p.search_key, p.tf, d.length FROM postings p "
+                f"JOIN docs d ON d.search_key = p.search_key WHERE p.token IN ({placeholders})",
+                tokens
+            ).fetchall()
+
+            document_frequency = Counter(row[0] for row in rows)
+            scores: Dict[str, float] = {}
+            for token, search_key, tf, length in rows:
+                df = document_frequency[token]
+                idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+                norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+                scores[search_key] = scores.get(search_key, 0.0) + idf * tf * (BM25_K1 + 1) / norm
+
+            top = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+            if not top:
+                return []
+            meta = {
+                row[0]: row[1:]
+                for row in conn.execute(
+                    f"SELECT search_key, keyword, search_time FROM docs "
+                    f"WHERE search_key IN ({', '.join('?' for _ in top)})",
+                    [key for key, _ in top]
+                )
+            }
+
+        results = []
+        for search_key, score in top:
+            keyword, search_time = meta.get(search_key, (search_key, None))
+            results.append((
+                SearchEntry(
+                    search_key=search_key,
+                    keyword=keyword,
+                    search_time=pd.to_datetime(search_time, errors='coerce').to_pydatetime() if search_time else None
+                ),
+                score
+            ))
+        return results
@@ -1,18 +1,47 @@
 import os
+import io
+import csv
+import threading
 import pandas as pd
 import logging
-from typing import List, Optional
+from contextlib import contextmanager
+from concurrent.futures import wait
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 from datetime import datetime
 from config.settings import settings
 from domain.search_result import SearchResult
-from domain.news_article import NewsArticle
+from domain.search_entry import SearchEntry
+from domain.retention_policy import RetentionPolicy
+from domain.compaction_report import CompactionReport
+from repositories.base_repository import BaseSearchRepository, EXPORT_CHUNK_SIZE
+from repositories.history_manifest import HistoryManifest
+from repositories.batch_writer import BatchWriter
+from utils.file_lock import FileLock
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class SearchRepository:
+# 프로세스 전역 DataFrame 스냅샷 캐시: {CSV 절대 경로: (mtime_ns, 파일 크기, DataFrame)}
+# 모든 세션과 리포지토리 인스턴스가 공유하며, 파일이 바뀌지 않았다면 CSV를 다시 파싱하지 않습니다.
+_snapshot_cache: Dict[str, Tuple[int, int, pd.DataFrame]] = {}
+_snapshot_lock = threading.Lock()
+
+# 프로세스 전역 쓰기 스레드: {CSV 절대 경로: BatchWriter}
+_writers: Dict[str, BatchWriter] = {}
+_writers_lock = threading.Lock()
+
+# 저장 요청이 그룹 커밋될 때까지 기다리는 최대 시간(초). 넘으면 아직 큐에 있는 요청은 취소하고 실패로 반환합니다.
+WRITE_TIMEOUT = 60
+
+# 다른 프로세스가 잡은 CSV 파일 잠금(<csv>.lock)을 기다리는 최대 시간(초)
+LOCK_TIMEOUT = 30
+
+class SearchRepository(BaseSearchRepository):
     """CSV 파일을 사용하여 검색 기록 데이터를 관리하는 리포지토리 클래스"""
+    # 같은 프로세스의 모든 인스턴스(세션)가 공유하는 쓰기 잠금 (다른 프로세스와는 FileLock으로 조율)
+    _write_lock = threading.RLock()
+
     def __init__(self, csv_path: str):
         """
         리포지토리 초기화 및 데이터 저장 경로 설정
@@ -28,57 +57,255 @@ class SearchRepository:
             "title", "url", "snippet", "pub_date", "ai_summary"
         ]
 
+        # 히스토리 목록용 경량 매니페스트 (search_history.csv.manifest.json)
+        self.manifest = HistoryManifest(self.csv_path)
+
     def load(self) -> pd.DataFrame:
         """
         CSV 파일을 로드하여 DataFrame으로 반환합니다.
         파일이 없으면 기본 컬럼 구조를 가진 빈 DataFrame을 반환합니다.
+        반환값은 공유 스냅샷의 복사본이므로 호출자가 자유롭게 수정해도 됩니다.
+        """
+        return self._snapshot().copy()
+
+    def _snapshot(self) -> pd.DataFrame:
+        """
+        프로세스 전역 캐시에서 파싱된 DataFrame 스냅샷을 반환합니다.
+        파일의 mtime/크기가 캐시 시점과 다를 때만 CSV를 다시 읽습니다.
+        반환된 DataFrame은 여러 세션이 공유하므로 읽기 전용으로만 사용해야 합니다.
         """
-        if not os.path.exists(self.csv_path):
+        try:
+            stat = os.stat(self.csv_path)
+        except FileNotFoundError:
             return pd.DataFrame(columns=self.columns)
-        
+
+        cache_key = os.path.abspath(self.csv_path)
+        with _snapshot_lock:
+            cached = _snapshot_cache.get(cache_key)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+
         try:
             df = pd.read_csv(self.csv_path)
             # 저장된 데이터의 컬럼이 일치하는지 확인 (필요시 보정)
             for col in self.columns:
                 if col not in df.columns:
                     df[col] = None
-            return df
         except Exception as e:
             logger.warning(f"CSV 로드 실패: {e}")
-            return pd.DataFrame(columns=self.columns)
+            df = pd.DataFrame(columns=self.columns)
+
+        with _snapshot_lock:
+            _snapshot_cache[cache_key] = (stat.st_mtime_ns, stat.st_size, df)
+        return df
+
+    def _invalidate_snapshot(self):
+        """자체 쓰기 이후 공유 스냅샷을 무효화합니다."""
+        with _snapshot_lock:
+            _snapshot_cache.pop(os.path.abspath(self.csv_path), None)
 
     def save(self, search_result: SearchResult) -> bool:
         """
-        SearchResult 객체를 CSV 파일에 추가(Append) 저장합니다.
+        SearchResult 객체의 새 행만 CSV 파일 끝에 추가(Append) 저장합니다.
+        저장 요청은 프로세스 공용 쓰기 스레드(BatchWriter)로 보내져 동시에 들어온 다른 세션의 요청과 함께
+        한 번의 추가 + fsync로 기록(그룹 커밋)되며, 이 메서드는 해당 그룹이 디스크에 기록된 뒤 반환합니다.
+        WRITE_TIMEOUT 안에 기록되지 않은 요청은 메모리 큐에만 있어 프로세스가 끝나면 사라지므로, 취소하고 실패로 반환합니다.
+        (취소한 요청은 쓰기 스레드가 건너뛰므로 다시 저장해도 두 번 기록되지 않음)
+        이미 기록 중인 그룹에 포함되었다면 취소할 수 없으므로 그 결과를 기다립니다. (파일 잠금 대기 LOCK_TIMEOUT으로 제한)
         :param search_result: 저장할 검색 결과 객체
-        :return: 저장 성공 여부
+        :return: 저장 성공 여부 (파일 잠금 시간 초과 등 그룹 커밋의 모든 예외는 실패)
+        """
+        future = self._writer().submit(search_result)
+        done, _ = wait([future], timeout=WRITE_TIMEOUT)
+        if not done and future.cancel():
+            logger.error(f"CSV 저장 대기 시간 초과({WRITE_TIMEOUT}초), 저장 요청을 취소했습니다: {search_result.search_key}")
+            return False
+        error = future.exception()
+        if error is not None:
+            logger.error(f"CSV 저장 실패: {error}")
+            return False
+        self._index_saved(search_result)
+        return True
+
+    def _writer(self) -> BatchWriter:
+        """이 CSV 파일의 프로세스 공용 쓰기 스레드를 반환합니다. (없으면 생성)"""
+        cache_key = os.path.abspath(self.csv_path)
+        with _writers_lock:
+            writer = _writers.get(cache_key)
+            if writer is None:
+                writer = _writers[cache_key] = BatchWriter(self._commit_batch)
+            return writer
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """같은 프로세스의 스레드 잠금과 다른 프로세스와의 파일 잠금(<csv>.lock)을 함께 얻습니다."""
+        with self._write_lock, FileLock(f"{self.csv_path}.lock", timeout=LOCK_TIMEOUT):
+            yield
+
+    def _commit_batch(self, results: List[SearchResult]):
+        """
+        여러 SearchResult의 행을 한 번의 추가 + fsync로 CSV 끝에 기록하고 매니페스트를 갱신합니다.
+        (BatchWriter의 쓰기 스레드에서 호출됨)
+        """
+        # SearchResult별 DataFrame은 한 번만 만들어 헤더 확인과 행 추가에 함께 사용
+        frames = [result.to_dataframe() for result in results]
+        new_df = pd.concat(frames, ignore_index=True)
+
+        with self._locked():
+            header = self._read_header()
+            if header is None:
+                # 파일이 없거나 비어 있으면 헤더를 포함해 새로 작성
+                self._append_bytes(new_df.to_csv(index=False, encoding='utf-8-sig').encode('utf-8-sig'))
+                self._rebuild_manifest()
+                return
+
+            if any(col not in header for col in new_df.columns):
+                # 기존 헤더에 없는 컬럼이 있으면 추가만으로는 저장할 수 없으므로 스키마를 갱신하며 재작성
+                # (기존 행은 compact()와 같이 저장된 문자열 그대로 읽어 다시 씀)
+                stored_df = pd.read_csv(self.csv_path, dtype=str, keep_default_na=False)
+                final_df = pd.concat([stored_df, new_df], ignore_index=True)
+                self._rewrite(final_df)
+                return
+
+            chunks = [
+                frame.reindex(columns=header).to_csv(index=False, header=False).encode('utf-8')
+                for frame in frames
+            ]
+            data = b"".join(chunks)
+            if not data:
+                return
+
+            offset = self._append_bytes(data)
+            for result, chunk in zip(results, chunks):
+                if chunk:
+                    self._record_manifest(result, offset, len(chunk))
+                    offset += len(chunk)
+
+    def compact(self, retention: Optional[RetentionPolicy] = None) -> Optional[CompactionReport]:
+        """
+        Append로 누적된 CSV 파일을 한 번에 정리(Compaction)합니다.
+        - 보존 정책(retention)에 따라 만료된 검색 삭제
+        - search_key가 없는 고아 행과 완전히 동일한 중복 행 제거
+        - 현재 스키마 기준으로 헤더 정렬
+        임시 파일에 기록한 뒤 원자적으로 교체하므로 도중에 실패해도 기존 파일은 보존됩니다.
+        :param retention: 적용할 보존 정책 (None이면 self.retention)
+        :return: 정리 결과 보고서. 실패하면 None
         """
+        retention = retention or self.retention
         try:
-            new_df = search_result.to_dataframe()
-            
-            if os.path.exists(self.csv_path):
-                # 기존 데이터가 있으면 불러와서 합침
-                existing_df = self.load()
-                final_df = pd.concat([existing_df, new_df], ignore_index=True)
-            else:
-                final_df = new_df
-                
-            final_df.to_csv(self.csv_path, index=False, encoding='utf-8-sig')
-            return True
+            with self._locked():
+                if not os.path.exists(self.csv_path):
+                    return CompactionReport(0, 0, 0, 0, 0)
+                bytes_before = os.path.getsize(self.csv_path)
+                # 저장된 문자열을 그대로 다시 쓰도록 모든 값을 문자열로 읽음 (article_index가 '1.0', 빈 값이 'nan'이 되지 않게)
+                df = pd.read_csv(self.csv_path, dtype=str, keep_default_na=False)
+                rows_before = len(df)
+
+                expired = self._expired_keys(self.list_searches(), retention, bytes_before)
+                df = df[(df['search_key'] != "") & ~df['search_key'].isin(expired)]
+                df = df.drop_duplicates(ignore_index=True)
+                self._rewrite(df)
+
+                report = CompactionReport(
+                    searches_removed=len(expired),
+                    rows_before=rows_before,
+                    rows_after=len(df),
+                    bytes_before=bytes_before,
+                    bytes_after=os.path.getsize(self.csv_path)
+                )
         except Exception as e:
-            logger.error(f"CSV 저장 실패: {e}")
-            return False
+            logger.error(f"CSV 정리 실패: {e}")
+            return None
+        self._unindex(expired)
+        logger.info(f"CSV 기록 정리 완료: {report}")
+        return report
+
+    def _read_header(self) -> Optional[List[str]]:
+        """CSV 파일의 헤더(컬럼 목록)만 읽어 반환합니다. 파일이 없거나 비어 있으면 None을 반환합니다."""
+        if not os.path.exists(self.csv_path) or os.path.getsize(self.csv_path) == 0:
+            return None
+        with open(self.csv_path, newline='', encoding='utf-8-sig') as f:
+            return next(csv.reader(f), None)
+
+    def _append_bytes(self, data: bytes) -> int:
+        """
+        파일 끝에 바이트를 추가하고 fsync로 디스크에 반영합니다.
+        :return: 추가한 데이터의 파일 내 시작 바이트 위치
+        """
+        with open(self.csv_path, 'ab') as f:
+            if f.tell() > 0 and not self._ends_with_newline():
+                # 이전 기록이 줄바꿈 없이 끝난 경우 행이 붙지 않도록 보정
+                f.write(b'\n')
+            offset = f.tell()
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self._invalidate_snapshot()
+        return offset
+
+    def _ends_with_newline(self) -> bool:
+        """CSV 파일의 마지막 바이트가 줄바꿈인지 확인합니다."""
+        with open(self.csv_path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+
+    def _rewrite(self, df: pd.DataFrame):
+        """DataFrame으로 CSV 파일 전체를 원자적으로 교체합니다. (임시 파일 기록 -> fsync -> 교체)"""
+        tmp_path = f"{self.csv_path}.tmp"
+        with open(tmp_path, 'w', newline='', encoding='utf-8-sig') as f:
+            df.to_csv(f, index=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.csv_path)
+        self._invalidate_snapshot()
+        self._rebuild_manifest()
+
+    def _record_manifest(self, search_result: SearchResult, offset: int, length: int):
+        """CSV 끝에 추가한 검색을 매니페스트에 반영합니다. 실패해도 다음 조회 때 CSV 스캔으로 복구됩니다."""
+        try:
+            self.manifest.record_append(
+                search_key=search_result.search_key,
+                keyword=search_result.keyword,
+                search_time=str(pd.Timestamp(search_result.search_time)),
+                article_count=len(search_result.articles),
+                offset=offset,
+                length=length,
+                csv_size=offset + length
+            )
+        except Exception as e:
+            logger.warning(f"매니페스트 갱신 실패: {e}")
+
+    def _rebuild_manifest(self):
+        """CSV를 스캔하여 매니페스트를 다시 만듭니다. 실패해도 다음 조회 때 다시 시도합니다."""
+        try:
+            self.manifest.rebuild()
+        except Exception as e:
+            logger.warning(f"매니페스트 재생성 실패: {e}")
+
+    def list_searches(self, offset: int = 0, limit: Optional[int] = None, keyword_prefix: Optional[str] = None,
+                      since: Optional[datetime] = None) -> List[SearchEntry]:
+        """
+        저장된 검색 목록(키, 키워드, 검색 시간, 기사 수)을 검색 시간 기준 최신순으로 반환합니다.
+        CSV 본문 대신 매니페스트의 정렬 인덱스에서 요청한 구간만 읽습니다.
+        """
+        return self.manifest.list_entries(offset, limit, keyword_prefix, since)
 
     def get_all_keys(self) -> List[str]:
         """
         저장된 모든 search_key 고유값 리스트를 검색 시간 기준 최신순으로 반환합니다.
+        매니페스트를 사용할 수 없으면 CSV 전체를 읽어 계산합니다.
         """
-        df = self.load()
+        try:
+            return [entry.search_key for entry in self.list_searches()]
+        except Exception as e:
+            logger.warning(f"매니페스트 조회 실패: {e}")
+
+        df = self._snapshot()
         if df.empty:
             return []
             
         try:
-            df['search_time'] = pd.to_datetime(df['search_time'])
+            df = df.assign(search_time=pd.to_datetime(df['search_time']))
             unique_keys = df.sort_values(by='search_time', ascending=False)['search_key'].unique().tolist()
             return unique_keys
         except Exception as e:
@@ -88,39 +315,80 @@ class SearchRepository:
     def find_by_key(self, search_key: str) -> Optional[SearchResult]:
         """
         특정 search_key에 해당하는 검색 데이터를 찾아 SearchResult 객체로 반환합니다.
+        매니페스트의 바이트 범위로 해당 행만 seek하여 파싱하며, 매니페스트를 쓸 수 없으면 전체 데이터에서 찾습니다.
         :param search_key: 찾을 검색 키
         :return: SearchResult 객체 또는 None
         """
-        df = self.load()
+        try:
+            ranges = self.manifest.get_ranges(search_key)
+            if ranges is None:
+                return None
+            result_df = self._read_ranges(ranges)
+            return self._rows_to_result(result_df[result_df['search_key'] == search_key])
+        except Exception as e:
+            logger.warning(f"오프셋 인덱스 조회 실패: {e}")
+
+        df = self._snapshot()
         if df.empty:
             return None
             
         result_df = df[df['search_key'] == search_key]
-        if result_df.empty:
-            return None
-            
-        first_row = result_df.iloc[0]
-        
-        articles = []
-        for _, row in result_df.sort_values(by='article_index').iterrows():
-            articles.append(NewsArticle(
-                title=str(row['title']),
-                url=str(row['url']),
-                snippet=str(row['snippet']),
-                pub_date=str(row.get('pub_date', ''))
-            ))
-            
-        return SearchResult(
-            search_key=str(first_row['search_key']),
-            search_time=pd.to_datetime(first_row['search_time']),
-            keyword=str(first_row['keyword']),
-            articles=articles,
-            ai_summary=str(first_row['ai_summary'])
-        )
+        return self._rows_to_result(result_df)
+
+    def _read_ranges(self, ranges: List[Tuple[int, int]], columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        CSV 헤더와 지정한 바이트 범위의 행들만 읽어 DataFrame으로 파싱합니다.
+        article_index 외 컬럼은 문자열로 읽어 전체 파일을 읽을 때와 같은 값을 유지합니다.
+        :param columns: 읽을 컬럼 (None이면 전체, 헤더에 없는 컬럼은 무시)
+        """
+        with open(self.csv_path, 'rb') as f:
+            chunks = [f.readline()]
+            for offset, length in ranges:
+                f.seek(offset)
+                chunks.append(f.read(length))
+        buffer = io.BytesIO(b"".join(chunks))
+        header = pd.read_csv(buffer, nrows=0, encoding='utf-8-sig').columns
+        buffer.seek(0)
+        dtypes = {col: str for col in header if col != 'article_index'}
+        usecols = None if columns is None else [col for col in header if col in columns]
+        return pd.read_csv(buffer, encoding='utf-8-sig', dtype=dtypes, usecols=usecols)
+
+    def get_article_urls(self, keyword: str) -> Set[str]:
+        """
+        키워드가 정확히 같은 검색들에 저장된 기사(합쳐진 다른 매체 기사 포함)의 정규화 URL 집합을 반환합니다.
+        매니페스트의 키워드 인덱스로 그 키워드 검색의 행만 읽으며, 매니페스트를 쓸 수 없으면 전체 기록을 스캔합니다.
+        """
+        try:
+            ranges = self.manifest.get_keyword_ranges(keyword)
+            if not ranges:
+                return set()
+            df = self._read_ranges(ranges, columns=['keyword', 'url', 'alternative_sources'])
+            df = df[df['keyword'] == keyword]
+            urls = self._row_urls(df['url'], df.get('alternative_sources'))
+            urls.discard("")
+            return urls
+        except Exception as e:
+            logger.warning(f"매니페스트로 기사 URL 조회 실패: {e}")
+        return super().get_article_urls(keyword)
+
+    def iter_history(self, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                     keyword: Optional[str] = None, chunk_size: int = EXPORT_CHUNK_SIZE,
+                     published_since: Optional[datetime] = None,
+                     published_until: Optional[datetime] = None) -> Iterator[pd.DataFrame]:
+        """
+        CSV 파일을 chunk_size 행씩 나눠 읽으며 조건에 맞는 행만 반환합니다. (내보내기용)
+        저장된 문자열을 그대로 내보내도록 모든 값을 문자열로 읽습니다.
+        """
+        if not os.path.exists(self.csv_path) or os.path.getsize(self.csv_path) == 0:
+            return
+        for chunk in pd.read_csv(self.csv_path, chunksize=chunk_size, dtype=str, keep_default_na=False):
+            chunk = self._filter_history(chunk, since, until, keyword, published_since, published_until)
+            if not chunk.empty:
+                yield chunk
 
     def get_all_as_csv(self) -> str:
         """
         전체 데이터를 CSV 형식의 문자열로 반환합니다. (다운로드용)
         """
-        df = self.load()
+        df = self._snapshot()
         return df.to_csv(index=False, encoding='utf-8-sig')
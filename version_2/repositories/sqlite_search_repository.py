@@ -0,0 +1,572 @@
+import os
+import sqlite3
+import logging
+import numpy as np
+import pandas as pd
+from contextlib import closing, contextmanager
+from datetime import datetime
+from typing import Iterator, List, Optional, Set
+from domain.search_result import SearchResult
+from domain.search_entry import SearchEntry
+from domain.storage_report import StorageReport
+from domain.retention_policy import RetentionPolicy
+from domain.compaction_report import CompactionReport
+from repositories.base_repository import BaseSearchRepository, HISTORY_COLUMNS, EXPORT_CHUNK_SIZE
+from repositories.text_codec import compress_text, decompress_text
+from utils.key_generator import generate_article_key, normalize_url
+
+logger = logging.getLogger(__name__)
+
+# 스키마 버전 (PRAGMA user_version)
+# 1: 기사 1건=1행의 search_history 단일 테이블
+# 2: 검색 단위 searches 테이블 + 기사 단위 articles 테이블로 정규화
+# 3: 기사를 정규화 URL 해시로 한 번만 저장하고 searches와 search_articles로 연결 (검색 간 중복 제거)
+# 4: 스니펫과 AI 요약을 압축해 BLOB으로 저장 (text_codec)
+# 5: search_articles.cleared로 검색에서 비어 있던 필드를 기록 (NULL은 '기사 저장소 값과 같음'이라 빈 값과 구분)
+# 6: searches.superseded/article_count를 저장 시 갱신 (목록 조회에서 검색 키별 최신 행을 매번 다시 계산하지 않음)
+# 7: search_articles.alternative_sources로 대표 기사에 합쳐진 다른 매체 기사 목록(JSON) 보관
+SCHEMA_VERSION = 7
+
+# search_articles.cleared 비트: 이 검색에서는 비어 있었지만 기사 저장소에는 값이 있는 필드
+CLEARED_TITLE = 1
+CLEARED_SNIPPET = 2
+CLEARED_PUB_DATE = 4
+
+# 압축 저장하는 (테이블, 컬럼). 목록/키 조회는 이 컬럼을 읽지 않으며 find_by_key/내보내기에서만 압축을 풂
+COMPRESSED_COLUMNS = [
+    ("articles", "snippet"),
+    ("search_articles", "snippet"),
+    ("searches", "ai_summary"),
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS searches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    search_key TEXT NOT NULL,
+    search_time TEXT NOT NULL,
+    keyword TEXT,
+    ai_summary TEXT,
+    ai_keywords TEXT,
+    superseded INTEGER NOT NULL DEFAULT 0,
+    article_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_searches_search_key ON searches(search_key);
+CREATE INDEX IF NOT EXISTS idx_searches_search_time ON searches(search_time, search_key);
+CREATE INDEX IF NOT EXISTS idx_searches_keyword ON searches(keyword);
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url_hash TEXT NOT NULL UNIQUE,
+    url TEXT,
+    title TEXT,
+    snippet TEXT,
+    pub_date TEXT
+);
+CREATE TABLE IF NOT EXISTS search_articles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    search_id INTEGER NOT NULL REFERENCES searches(id) ON DELETE CASCADE,
+    article_index INTEGER,
+    article_id INTEGER NOT NULL REFERENCES articles(id),
+    title TEXT,
+    snippet TEXT,
+    pub_date TEXT,
+    cleared INTEGER NOT NULL DEFAULT 0,
+    alternative_sources TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_search_articles_search_id ON search_articles(search_id, article_index);
+CREATE INDEX IF NOT EXISTS idx_search_articles_article_id ON search_articles(article_id);
+CREATE TABLE IF NOT EXISTS migrations (
+    name TEXT PRIMARY KEY,
+    applied_at TEXT NOT NULL
+);
+"""
+
+# search_articles의 title/snippet/pub_date는 검색마다 달라진 값만 담고, 같으면 NULL로 두어 articles의 값을 사용
+# 이 검색에서 비어 있던 필드는 cleared 비트로 표시해 articles의 값 대신 NULL로 복원
+SA_TITLE = f"CASE WHEN sa.cleared & {CLEARED_TITLE} THEN NULL ELSE COALESCE(sa.title, a.title) END"
+SA_SNIPPET = f"CASE WHEN sa.cleared & {CLEARED_SNIPPET} THEN NULL ELSE COALESCE(sa.snippet, a.snippet) END"
+SA_PUB_DATE = f"CASE WHEN sa.cleared & {CLEARED_PUB_DATE} THEN NULL ELSE COALESCE(sa.pub_date, a.pub_date) END"
+
+# 검색 목록 조회용 인덱스 (superseded 컬럼이 추가된 뒤 생성)
+LATEST_INDEX = "CREATE INDEX IF NOT EXISTS idx_searches_latest ON searches(superseded, search_time, search_key)"
+
+# 검색 키별 최신 행 표시(superseded)와 키 전체의 기사 수(article_count)를 다시 계산하는 조회문
+# 같은 분에 다시 검색하면 같은 search_key가 여러 행이 되며, 목록에는 가장 최근 행만 나타남
+REFRESH_LATEST = """
+UPDATE searches SET
+    superseded = EXISTS (
+        SELECT 1 FROM searches newer WHERE newer.search_key = searches.search_key
+        AND (newer.search_time > searches.search_time
+             OR (newer.search_time = searches.search_time AND newer.id > searches.id))
+    ),
+    article_count = (
+        SELECT COUNT(*) FROM searches s2 JOIN search_articles sa ON sa.search_id = s2.id
+        WHERE s2.search_key = searches.search_key
+    )
+"""
+
+# 정규화된 테이블을 기존 Long format 컬럼 순서로 펼치는 조회문
+FLAT_SELECT = f"""
+SELECT s.search_key, s.search_time, s.keyword, sa.article_index,
+       {SA_TITLE} AS title, a.url,
+       decompress_text({SA_SNIPPET}) AS snippet,
+       {SA_PUB_DATE} AS pub_date,
+       decompress_text(s.ai_summary) AS ai_summary, s.ai_keywords, sa.alternative_sources
+FROM searches s
+JOIN search_articles sa ON sa.search_id = s.id
+JOIN articles a ON a.id = sa.article_id
+"""
+
+# 기사 필드의 UTF-8 바이트 수 (공간 절감 보고용)
+_FIELD_BYTES = "COALESCE(LENGTH(CAST({0}title AS BLOB)), 0) + COALESCE(LENGTH(CAST({0}snippet AS BLOB)), 0) " \
+               "+ COALESCE(LENGTH(CAST({0}pub_date AS BLOB)), 0)"
+
+class SqliteSearchRepository(BaseSearchRepository):
+    """
+    SQLite DB를 사용하여 검색 기록 데이터를 관리하는 리포지토리 클래스.
+    검색 단위 정보(searches)와 기사(articles)를 분리 저장하고, 조회 시 기존 Long format으로 복원합니다.
+    """
+    def __init__(self, db_path: str, legacy_csv_path: Optional[str] = None):
+        """
+        리포지토리 초기화 및 스키마 생성
+        :param db_path: SQLite DB 파일 경로
+        :param legacy_csv_path: 기존 CSV 기록 경로. 지정하면 최초 1회 DB로 이관합니다.
+        """
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._upgrade_schema(conn)
+
+        if legacy_csv_path:
+            self.migrate_from_csv(legacy_csv_path)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        작업 단위별 커넥션을 열고 트랜잭션을 커밋/롤백한 뒤 닫습니다.
+        Streamlit 세션마다 스레드가 다르므로 커넥션을 공유하지 않습니다.
+        """
+        with closing(sqlite3.connect(self.db_path, timeout=30)) as conn:
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.create_function("article_key", 2, generate_article_key, deterministic=True)
+            conn.create_function("compress_text", 1, compress_text, deterministic=True)
+            conn.create_function("decompress_text", 1, decompress_text, deterministic=True)
+            with conn:
+                yield conn
+
+    @staticmethod
+    def _upgrade_schema(conn: sqlite3.Connection):
+        """
+        스키마를 만들고, 이전 버전 스키마의 DB는 현재 스키마로 업그레이드합니다.
+        - v1 search_history 테이블의 행은 (search_key, search_time) 단위로 searches에 나누고 기사는 기사 저장소로 옮김
+        - v2 articles 테이블(검색마다 기사 사본)은 URL 해시 기준으로 합쳐 기사 저장소로 옮김
+        - v3 이하에서 평문으로 저장된 스니펫/AI 요약은 압축
+        - v4 이하의 search_articles에 cleared 컬럼 추가 (이전에 NULL로 저장된 빈 값은 구분할 수 없어 그대로 둠)
+        - v5 이하의 searches에 superseded/article_count 컬럼을 추가하고 한 번 계산
+        - v6 이하의 search_articles에 alternative_sources 컬럼 추가 (이전 기록은 다른 매체 기사 없음)
+        """
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            conn.executescript(SCHEMA)
+            conn.execute(LATEST_INDEX)
+            return
+
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        legacy_source = None
+        if "search_history" in tables:
+            legacy_source = """
+                SELECT s.id AS search_id, h.article_index, h.title, h.url, h.snippet, h.pub_date, h.id AS ord
+                FROM search_history h
+                JOIN searches s ON s.search_key = h.search_key AND s.search_time = h.search_time
+            """
+        elif "articles" in tables and "search_articles" not in tables:
+            conn.execute("ALTER TABLE articles RENAME TO articles_v2")
+            legacy_source = """
+                SELECT search_id, article_index, title, url, snippet, pub_date, id AS ord FROM articles_v2
+            """
+
+        conn.executescript(SCHEMA)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(search_articles)")}
+        if "cleared" not in columns:
+            conn.execute("ALTER TABLE search_articles ADD COLUMN cleared INTEGER NOT NULL DEFAULT 0")
+        if "alternative_sources" not in columns:
+            conn.execute("ALTER TABLE search_articles ADD COLUMN alternative_sources TEXT")
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(searches)")}
+        for column in ("superseded", "article_count"):
+            if column not in columns:
+                conn.execute(f"ALTER TABLE searches ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0")
+        conn.execute(LATEST_INDEX)
+        if "search_history" in tables:
+            conn.execute("""
+                INSERT INTO searches (search_key, search_time, keyword, ai_summary, ai_keywords)
+                SELECT search_key, search_time, keyword, ai_summary, ai_keywords
+                FROM search_history GROUP BY search_key, search_time ORDER BY MIN(id)
+            """)
+        if legacy_source:
+            # 먼저 저장된 기사 내용을 대표값으로 두고, 검색별로 다른 필드만 search_articles에 남김
+            conn.execute(f"""
+                INSERT OR IGNORE INTO articles (url_hash, url, title, snippet, pub_date)
+                SELECT article_key(url, title), url, title, snippet, pub_date FROM ({legacy_source}) ORDER BY ord
+            """)
+            conn.execute(f"""
+                INSERT INTO search_articles (search_id, article_index, article_id, title, snippet, pub_date, cleared)
+                SELECT l.search_id, l.article_index, a.id,
+                       CASE WHEN l.title IS a.title THEN NULL ELSE l.title END,
+                       CASE WHEN l.snippet IS a.snippet THEN NULL ELSE l.snippet END,
+                       CASE WHEN l.pub_date IS a.pub_date THEN NULL ELSE l.pub_date END,
+                       (CASE WHEN l.title IS NULL AND a.title IS NOT NULL THEN {CLEARED_TITLE} ELSE 0 END)
+                       | (CASE WHEN l.snippet IS NULL AND a.snippet IS NOT NULL THEN {CLEARED_SNIPPET} ELSE 0 END)
+                       | (CASE WHEN l.pub_date IS NULL AND a.pub_date IS NOT NULL THEN {CLEARED_PUB_DATE} ELSE 0 END)
+                FROM ({legacy_source}) l JOIN articles a ON a.url_hash = article_key(l.url, l.title)
+                ORDER BY l.ord
+            """)
+            conn.execute("DROP TABLE IF EXISTS search_history")
+            conn.execute("DROP TABLE IF EXISTS articles_v2")
+            logger.info("SQLite 스키마를 기사 중복 제거 구조로 업그레이드했습니다.")
+        for table, column in COMPRESSED_COLUMNS:
+            conn.execute(
+                f"UPDATE {table} SET {column} = compress_text({column}) WHERE typeof({column}) = 'text'"
+            )
+        conn.execute(REFRESH_LATEST)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def migrate_from_csv(self, csv_path: str) -> int:
+        """
+        기존 CSV 검색 기록을 DB로 1회 이관합니다.
+        이관 여부는 migrations 테이블에 기록되어 이후 호출에서는 아무 작업도 하지 않습니다.
+        :param csv_path: 이관할 CSV 파일 경로
+        :return: 이관된 행 수
+        """
+        migration_name = f"csv:{os.path.abspath(csv_path)}"
+        with self._connect() as conn:
+            if conn.execute("SELECT 1 FROM migrations WHERE name = ?", (migration_name,)).fetchone():
+                return 0
+
+            count = 0
+            if os.path.exists(csv_path) and os.path.getsize(csv_path) > 0:
+                df = pd.read_csv(csv_path)
+                self._insert_rows(conn, df)
+                count = len(df)
+
+            conn.execute(
+                "INSERT INTO migrations (name, applied_at) VALUES (?, ?)",
+                (migration_name, datetime.now().isoformat(sep=' '))
+            )
+        logger.info(f"CSV 기록 {count}행을 SQLite로 이관했습니다: {csv_path} ({self.storage_report()})")
+        return count
+
+    @staticmethod
+    def _insert_rows(conn: sqlite3.Connection, df: pd.DataFrame):
+        """
+        Long format DataFrame을 검색 단위로 묶어 searches에 추가하고 기사는 기사 저장소를 참조하도록 연결합니다.
+        검색 단위 필드(요약, 키워드 등)는 기사 수와 관계없이 searches에 한 번만 저장됩니다.
+        추가한 검색 키의 최신 행 표시와 기사 수는 여기서 갱신해 목록 조회가 다시 계산하지 않게 합니다.
+        """
+        if df.empty:
+            return
+        df = df.reindex(columns=HISTORY_COLUMNS).astype(object)
+        df['search_time'] = df['search_time'].map(str)
+        df = df.where(pd.notna(df), None)
+
+        for (search_key, search_time), group in df.groupby(['search_key', 'search_time'], sort=False, dropna=False):
+            first_row = group.iloc[0]
+            cursor = conn.execute(
+                "INSERT INTO searches (search_key, search_time, keyword, ai_summary, ai_keywords) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (search_key, search_time, first_row['keyword'], compress_text(first_row['ai_summary']),
+                 first_row['ai_keywords'])
+            )
+            search_id = cursor.lastrowid
+            for row in group.itertuples(index=False):
+                SqliteSearchRepository._link_article(conn, search_id, row)
+        conn.executemany(
+            f"{REFRESH_LATEST} WHERE search_key = ?",
+            ((search_key,) for search_key in df['search_key'].unique())
+        )
+
+    @staticmethod
+    def _link_article(conn: sqlite3.Connection, search_id: int, row):
+        """
+        기사 1건을 기사 저장소에 (없으면) 추가하고 검색과 연결합니다.
+        이미 저장된 기사와 제목/스니펫/발행일이 다르면 다른 필드만 연결 행에 보관하고,
+        이 검색에서 비어 있던 필드는 cleared 비트로 표시해 원래 내용을 그대로 복원할 수 있게 합니다.
+        """
+        url_hash = generate_article_key(row.url, row.title)
+        conn.execute(
+            "INSERT INTO articles (url_hash, url, title, snippet, pub_date) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(url_hash) DO NOTHING",
+            (url_hash, row.url, row.title, compress_text(row.snippet), row.pub_date)
+        )
+        article_id, title, snippet, pub_date = conn.execute(
+            "SELECT id, title, snippet, pub_date FROM articles WHERE url_hash = ?", (url_hash,)
+        ).fetchone()
+        snippet = decompress_text(snippet)
+        cleared = (
+            (CLEARED_TITLE if row.title is None and title is not None else 0)
+            | (CLEARED_SNIPPET if row.snippet is None and snippet is not None else 0)
+            | (CLEARED_PUB_DATE if row.pub_date is None and pub_date is not None else 0)
+        )
+        conn.execute(
+            "INSERT INTO search_articles (search_id, article_index, article_id, title, snippet, pub_date, cleared, "
+            "alternative_sources) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                search_id, row.article_index, article_id,
+                None if row.title == title else row.title,
+                None if row.snippet == snippet else compress_text(row.snippet),
+                None if row.pub_date == pub_date else row.pub_date,
+                cleared, row.alternative_sources
+            )
+        )
+
+    def _query(self, sql: str, params: tuple = ()) -> pd.DataFrame:
+        """쿼리 결과를 DataFrame으로 반환합니다. NULL 값은 CSV 로드와 같이 NaN으로 맞춥니다."""
+        with self._connect() as conn:
+            df = pd.read_sql_query(sql, conn, params=params)
+        return df.where(df.notna(), np.nan)
+
+    def load(self) -> pd.DataFrame:
+        """
+        DB의 전체 기록을 저장 순서대로 DataFrame으로 반환합니다.
+        """
+        try:
+            return self._query(f"{FLAT_SELECT} ORDER BY s.id, sa.id")
+        except Exception as e:
+            logger.warning(f"SQLite 로드 실패: {e}")
+            return pd.DataFrame(columns=HISTORY_COLUMNS)
+
+    def save(self, search_result: SearchResult) -> bool:
+        """
+        SearchResult 객체를 하나의 트랜잭션으로 DB에 추가 저장합니다.
+        기사가 없는 검색은 Long format과 마찬가지로 저장되지 않습니다.
+        :param search_result: 저장할 검색 결과 객체
+        :return: 저장 성공 여부
+        """
+        try:
+            with self._connect() as conn:
+                self._insert_rows(conn, search_result.to_dataframe())
+        except Exception as e:
+            logger.error(f"SQLite 저장 실패: {e}")
+            return False
+        self._index_saved(search_result)
+        return True
+
+    def get_all_keys(self) -> List[str]:
+        """
+        저장된 모든 search_key 고유값 리스트를 검색 시간 기준 최신순으로 반환합니다.
+        기사 행은 읽지 않고 searches 테이블의 (search_time, search_key) 인덱스만 사용합니다.
+        """
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT search_key FROM searches ORDER BY search_time DESC"
+                ).fetchall()
+            # 같은 분에 저장된 동일 키는 한 번만 반환
+            return list(dict.fromkeys(row[0] for row in rows))
+        except Exception as e:
+            logger.error(f"키 목록 추출 실패: {e}")
+            return []
+
+    def list_searches(self, offset: int = 0, limit: Optional[int] = None, keyword_prefix: Optional[str] = None,
+                      since: Optional[datetime] = None) -> List[SearchEntry]:
+        """
+        저장된 검색 목록(키, 키워드, 검색 시간, 기사 수)을 검색 시간 기준 최신순으로 반환합니다.
+        저장 시 갱신해 둔 최신 행 표시(superseded)와 기사 수(article_count)를 (superseded, search_time) 인덱스로 최신순으로 읽으며
+        조건과 페이지(LIMIT/OFFSET)를 SQL로 처리하므로 요청한 페이지까지만 읽습니다. (기사 본문은 읽지 않음)
+        검색 시간을 해석할 수 없는 행(이관된 CSV의 빈 값 등)은 건너뛰고 로그를 남깁니다.
+        """
+        conditions, params = [], []
+        if keyword_prefix:
+            conditions.append("s.keyword LIKE ? ESCAPE '\\'")
+            params.append(f"{self._escape_like(keyword_prefix)}%")
+        if since is not None:
+            conditions.append("s.search_time >= ?")
+            params.append(str(pd.Timestamp(since)))
+        filters = "".join(f" AND {condition}" for condition in conditions)
+        params.extend([-1 if limit is None else limit, offset])
+
+        entries = []
+        try:
+            with self._connect() as conn:
+                # 같은 search_key의 최신 행만(같은 분 재검색), search_time 인덱스 순서로 읽다가 LIMIT에서 멈춤
+                rows = conn.execute(f"""
+                    SELECT s.search_key, s.keyword, s.search_time, s.article_count
+                    FROM searches s
+                    WHERE s.superseded = 0{filters}
+                    ORDER BY s.search_time DESC, s.search_key DESC
+                    LIMIT ? OFFSET ?
+                """, params).fetchall()
+            for search_key, keyword, search_time, article_count in rows:
+                try:
+                    parsed_time = datetime.fromisoformat(search_time)
+                except (TypeError, ValueError):
+                    logger.warning(f"검색 시간을 해석할 수 없어 목록에서 제외합니다: {search_key} ({search_time!r})")
+                    continue
+                entries.append(SearchEntry(
+                    search_key=search_key,
+                    keyword=keyword,
+                    search_time=parsed_time,
+                    article_count=article_count or 0
+                ))
+        except Exception as e:
+            logger.error(f"검색 목록 조회 실패: {e}")
+            return []
+        return entries
+
+    @staticmethod
+    def _escape_like(text: str) -> str:
+        """LIKE 패턴의 특수 문자(%, _)를 이스케이프합니다."""
+        return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+    def find_by_key(self, search_key: str) -> Optional[SearchResult]:
+        """
+        search_key 인덱스로 해당 검색의 행만 조회하여 SearchResult 객체로 반환합니다.
+        :param search_key: 찾을 검색 키
+        :return: SearchResult 객체 또는 None
+        """
+        try:
+            result_df = self._query(
+                f"{FLAT_SELECT} WHERE s.search_key = ? ORDER BY sa.article_index, s.id, sa.id",
+                (search_key,)
+            )
+        except Exception as e:
+            logger.error(f"기록 조회 실패: {e}")
+            return None
+        return self._rows_to_result(result_df)
+
+    def get_article_urls(self, keyword: str) -> Set[str]:
+        """
+        키워드가 정확히 같은 검색들에 저장된 기사(합쳐진 다른 매체 기사 포함)의 정규화 URL 집합을 반환합니다.
+        (keyword 인덱스 사용, 본문은 읽지 않음)
+        """
+        try:
+            with self._connect() as conn:
+                rows = conn.execute("""
+                    SELECT DISTINCT a.url, sa.alternative_sources FROM searches s
+                    JOIN search_articles sa ON sa.search_id = s.id
+                    JOIN articles a ON a.id = sa.article_id
+                    WHERE s.keyword = ?
+                """, (keyword,)).fetchall()
+        except Exception as e:
+            logger.error(f"저장된 기사 URL 조회 실패: {e}")
+            return set()
+        urls = self._row_urls((row[0] for row in rows), (row[1] for row in rows))
+        urls.discard("")
+        return urls
+
+    def iter_history(self, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                     keyword: Optional[str] = None, chunk_size: int = EXPORT_CHUNK_SIZE,
+                     published_since: Optional[datetime] = None,
+                     published_until: Optional[datetime] = None) -> Iterator[pd.DataFrame]:
+        """
+        조건을 SQL로 거른 뒤 chunk_size 행씩 나눠 반환합니다. (내보내기용)
+        기간 조건은 searches의 search_time 인덱스를 사용합니다.
+        발행 시각 조건은 형식이 섞인 pub_date를 조각마다 한 번에 해석해 거릅니다.
+        """
+        conditions, params = [], []
+        if since is not None:
+            conditions.append("s.search_time >= ?")
+            params.append(str(pd.Timestamp(since)))
+        if until is not None:
+            conditions.append("s.search_time < ?")
+            params.append(str(pd.Timestamp(until)))
+        if keyword:
+            conditions.append("s.keyword LIKE ? ESCAPE '\\'")
+            params.append(f"%{self._escape_like(keyword)}%")
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self._connect() as conn:
+            for chunk in pd.read_sql_query(f"{FLAT_SELECT} {where} ORDER BY s.id, sa.id", conn,
+                                           params=params, chunksize=chunk_size):
+                chunk = self._filter_history(chunk, None, None, None, published_since, published_until)
+                if not chunk.empty:
+                    yield chunk
+
+    def storage_report(self) -> StorageReport:
+        """
+        기사 중복 제거로 절약한 공간을 계산합니다.
+        검색마다 기사를 따로 저장했을 때의 기사 필드(제목, 스니펫, 발행일) 바이트 수와
+        실제 저장된 바이트 수(기사 저장소 + 검색별로 다른 필드)를 비교합니다. (스니펫은 압축된 크기 기준)
+        """
+        with self._connect() as conn:
+            article_refs, logical_bytes, override_bytes = conn.execute(f"""
+                SELECT COUNT(*),
+                       COALESCE(SUM({_FIELD_BYTES.format('f.')}), 0),
+                       COALESCE(SUM({_FIELD_BYTES.format('f.o_')}), 0)
+                FROM (
+                    SELECT {SA_TITLE} AS title, {SA_SNIPPET} AS snippet, {SA_PUB_DATE} AS pub_date,
+                           sa.title AS o_title, sa.snippet AS o_snippet, sa.pub_date AS o_pub_date
+                    FROM search_articles sa JOIN articles a ON a.id = sa.article_id
+                ) f
+            """).fetchone()
+            unique_articles, article_bytes = conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM({_FIELD_BYTES.format('')}), 0) FROM articles"
+            ).fetchone()
+        return StorageReport(
+            article_refs=article_refs,
+            unique_articles=unique_articles,
+            logical_bytes=logical_bytes,
+            stored_bytes=article_bytes + override_bytes
+        )
+
+    def compact(self, retention: Optional[RetentionPolicy] = None) -> Optional[CompactionReport]:
+        """
+        보존 정책에 따라 만료된 검색을 삭제하고 DB를 정리합니다.
+        - 만료된 검색 삭제 (search_articles 연결은 ON DELETE CASCADE로 함께 삭제)
+        - 같은 검색이 두 번 저장된 중복(search_key, search_time이 같은 검색)과 중복 연결된 기사 행 제거
+        - 어떤 검색도 참조하지 않는 고아 기사 삭제
+        - VACUUM으로 DB 파일을 다시 써서 빈 공간 회수 (SQLite가 원자적으로 교체)
+        :param retention: 적용할 보존 정책 (None이면 self.retention)
+        :return: 정리 결과 보고서. 실패하면 None
+        """
+        retention = retention or self.retention
+        try:
+            bytes_before = self._file_bytes()
+            expired = self._expired_keys(self.list_searches(), retention, bytes_before)
+            with self._connect() as conn:
+                rows_before = conn.execute("SELECT COUNT(*) FROM search_articles").fetchone()[0]
+                conn.executemany("DELETE FROM searches WHERE search_key = ?", ((key,) for key in expired))
+                conn.execute("""
+                    DELETE FROM searches WHERE id NOT IN (
+                        SELECT MIN(id) FROM searches GROUP BY search_key, search_time
+                    )
+                """)
+                conn.execute("""
+                    DELETE FROM search_articles WHERE id NOT IN (
+                        SELECT MIN(id) FROM search_articles GROUP BY search_id, article_index, article_id
+                    )
+                """)
+                conn.execute("DELETE FROM articles WHERE id NOT IN (SELECT article_id FROM search_articles)")
+                conn.execute(REFRESH_LATEST)
+                rows_after = conn.execute("SELECT COUNT(*) FROM search_articles").fetchone()[0]
+
+            # VACUUM과 체크포인트는 트랜잭션 밖에서 실행해야 함
+            with closing(sqlite3.connect(self.db_path, timeout=30, isolation_level=None)) as conn:
+                conn.execute("VACUUM")
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+            report = CompactionReport(
+                searches_removed=len(expired),
+                rows_before=rows_before,
+                rows_after=rows_after,
+                bytes_before=bytes_before,
+                bytes_after=self._file_bytes()
+            )
+        except Exception as e:
+            logger.error(f"SQLite 정리 실패: {e}")
+            return None
+        self._unindex(expired)
+        logger.info(f"SQLite 기록 정리 완료: {report}")
+        return report
+
+    def _file_bytes(self) -> int:
+        """DB 파일과 WAL 파일의 크기 합을 반환합니다."""
+        return sum(
+            os.path.getsize(path) for path in (self.db_path, f"{self.db_path}-wal") if os.path.exists(path)
+        )
+
+    def get_all_as_csv(self) -> str:
+        """
+        전체 데이터를 기존과 같은 Long format CSV 문자열로 반환합니다. (다운로드용)
+        """
+        return self.load().to_csv(index=False, encoding='utf-8-sig')
@@ -0,0 +1,33 @@
+import zlib
+from typing import Optional, Union
+
+# 압축 형식 표시 바이트 (압축 값의 첫 바이트). 이후 다른 코덱을 추가해도 기존 값을 그대로 읽을 수 있게 함
+CODEC_ZLIB = b"\x01"
+
+# 이보다 짧은(UTF-8 바이트 기준) 텍스트는 압축 이득이 거의 없어 원문 그대로 저장
+MIN_COMPRESS_BYTES = 256
+
+ZLIB_LEVEL = 6
+
+def compress_text(text: Optional[str]) -> Union[str, bytes, None]:
+    """
+    저장할 텍스트를 압축합니다.
+    충분히 길고 압축 후 실제로 작아지는 텍스트만 형식 바이트 + zlib 데이터(bytes)로 바꾸고,
+    그 외(짧은 텍스트, None, 이미 압축된 값)는 그대로 반환합니다.
+    """
+    if not isinstance(text, str):
+        return text
+    raw = text.encode("utf-8")
+    if len(raw) < MIN_COMPRESS_BYTES:
+        return text
+    packed = CODEC_ZLIB + zlib.compress(raw, ZLIB_LEVEL)
+    return packed if len(packed) < len(raw) else text
+
+def decompress_text(value: Union[str, bytes, None]) -> Optional[str]:
+    """compress_text로 저장한 값을 원래 텍스트로 되돌립니다. 압축되지 않은 값은 그대로 반환합니다."""
+    if not isinstance(value, (bytes, bytearray, memoryview)):
+        return value
+    value = bytes(value)
+    if value[:1] == CODEC_ZLIB:
+        return zlib.decompress(value[1:]).decode("utf-8")
+    raise ValueError(f"알 수 없는 압축 형식입니다: {value[:1]!r}")
@@ -1,20 +1,84 @@
-from typing import List
+import logging
+from typing import List, Optional
 from google import genai
+from google.genai import types
 from config.settings import settings
 from domain.news_article import NewsArticle
+from services.quota_limiter import quota_limiter
 from utils.exceptions import AppError
+from utils.http_client import create_httpx_client, warm_up
+from utils.api_fixtures import FixtureStore
+from utils.retry import RetryPolicy, NO_RETRY, call_with_retry, get_breaker
+from utils.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Gemini API 기본 주소 (연결 예열 대상, GEMINI_BASE_URL로 재정의)
+GEMINI_API_BASE_URL = "https://generativelanguage.googleapis.com/"
+
+# 요약 호출 재시도 정책. 검색어 교정/확장, 키워드 추출은 없어도 되는 단계이므로 재시도하지 않음(NO_RETRY)
+SUMMARY_RETRY_POLICY = RetryPolicy(max_attempts=3, base_delay=0.5, max_delay=8.0)
 
 class AIService:
     """Gemini API를 사용하여 뉴스 요약 기능을 제공하는 서비스 클래스"""
     def __init__(self):
-        """Gemini 클라이언트를 초기화합니다."""
-        self.client = genai.Client(api_key=settings.gemini_api_key)
+        """
+        Gemini 클라이언트를 초기화합니다.
+        요청마다 연결을 새로 열지 않도록 연결 풀(HTTP_POOL_SIZE, HTTP_KEEPALIVE_SECONDS)을 가진 HTTP 클라이언트를 공유합니다.
+        GEMINI_BASE_URL이 있으면 그 주소(로컬 스텁 서버 등)로 요청하고, API_MODE에 따라 응답을 녹화/재생합니다.
+        """
+        self.base_url = settings.gemini_base_url or GEMINI_API_BASE_URL
+        self.http_client = create_httpx_client(
+            settings.http_pool_size, settings.http_timeout, settings.http_keepalive_seconds,
+            settings.api_mode, FixtureStore(str(settings.api_fixture_path), "gemini")
+        )
+        self.client = genai.Client(
+            api_key=settings.gemini_api_key,
+            http_options=types.HttpOptions(
+                base_url=settings.gemini_base_url,
+                timeout=settings.http_timeout * 1000,  # 밀리초 단위
+                httpx_client=self.http_client
+            )
+        )
         self.model_id = settings.gemini_model
+        self.breaker = get_breaker("gemini.generate_content")
+        # 여러 세션의 같은 프롬프트 요청이 동시에 진행되면 API 호출 1건으로 묶음
+        self._in_flight = SingleFlight()
+
+    def _generate(self, prompt: str, policy: RetryPolicy, wait_for_quota: bool = True) -> str:
+        """
+        Gemini로 텍스트를 생성합니다. 재시도 정책과 서킷 브레이커를 적용하며 빈 응답은 AppError("ai_error")로 처리합니다.
+        Gemini 장애가 이어져 브레이커가 열리면 기다리지 않고 AppError("service_unavailable")로 실패합니다.
+        같은 모델/프롬프트의 호출이 이미 진행 중이면 새로 호출하지 않고 그 응답을 함께 받습니다.
+        :param wait_for_quota: False이면 분당 한도가 남아 있지 않을 때 기다리지 않고 AppError("rate_limit_exceeded")로 실패
+                               (없어도 되는 단계가 요약에 쓸 한도를 쓰지 않도록 함)
+        """
+        def generate_once():
+            if wait_for_quota:
+                quota_limiter.acquire("gemini", timeout=settings.quota_max_wait)
+            elif not quota_limiter.try_acquire("gemini"):
+                raise AppError("rate_limit_exceeded")
+            return self.client.models.generate_content(model=self.model_id, contents=prompt)
+
+        response = self._in_flight.do(
+            (self.model_id, prompt),
+            lambda: call_with_retry(generate_once, policy, self.breaker, default_error="ai_error")
+        )
+        if not response or not response.text:
+            raise AppError("ai_error")
+        return response.text.strip()
+
+    def warm_up(self) -> Optional[float]:
+        """
+        Gemini API 서버로 연결을 미리 열어 풀에 넣어 둡니다. (HTTP_WARMUP)
+        :return: 걸린 시간(초). 실패하면 None
+        """
+        return warm_up(self.http_client.head, self.base_url, settings.http_timeout)
 
     def summarize_news(self, articles: List[NewsArticle]) -> str:
         """
         Gemini API를 사용하여 뉴스 기사들을 요약합니다.
-        네트워크 오류 시 1회 재시도합니다.
+        네트워크/서버 오류와 429는 지수 백오프로 재시도합니다. (SUMMARY_RETRY_POLICY)
         """
         if not articles:
             return "요약할 기사가 없습니다."
@@ -34,37 +98,7 @@ class AIService:
 {context}
         """.strip()
 
-        max_retries = 1
-        attempt = 0
-        
-        while attempt <= max_retries:
-            try:
-                response = self.client.models.generate_content(
-                    model=self.model_id,
-                    contents=prompt
-                )
-                
-                if not response or not response.text:
-                    raise AppError("ai_error")
-                    
-                return response.text.strip()
-                
-            except Exception as e:
-                attempt += 1
-                error_str = str(e).lower()
-                
-                if attempt > max_retries or "401" in error_str or "400" in error_str:
-                    if "401" in error_str or "invalid" in error_str:
-                        raise AppError("api_key_invalid")
-                    elif "429" in error_str or "limit" in error_str:
-                        raise AppError("rate_limit_exceeded")
-                    elif "400" in error_str:
-                        raise AppError("bad_request")
-                    else:
-                        raise AppError("ai_error")
-                
-                import time
-                time.sleep(1)
+        return self._generate(prompt, SUMMARY_RETRY_POLICY)
 
     def expand_query(self, keyword: str) -> str:
         """
@@ -86,14 +120,9 @@ class AIService:
 최적화된 검색어:""".strip()
 
         try:
-            response = self.client.models.generate_content(
-                model=self.model_id,
-                contents=prompt
-            )
-            if response and response.text:
-                return response.text.strip()
-            return keyword
-        except Exception:
+            return self._generate(prompt, NO_RETRY, wait_for_quota=False)
+        except AppError as e:
+            logger.warning(f"검색어 확장 생략: {e.error_type}")
             return keyword
 
     def correct_spelling(self, keyword: str) -> str:
@@ -107,14 +136,9 @@ class AIService:
 수정결과:""".strip()
 
         try:
-            response = self.client.models.generate_content(
-                model=self.model_id,
-                contents=prompt
-            )
-            if response and response.text:
-                return response.text.strip().replace('"', '').replace("'", "")
-            return keyword
-        except Exception:
+            return self._generate(prompt, NO_RETRY, wait_for_quota=False).replace('"', '').replace("'", "")
+        except AppError as e:
+            logger.warning(f"검색어 교정 생략: {e.error_type}")
             return keyword
 
     def extract_keywords(self, articles: List[NewsArticle]) -> str:
@@ -133,12 +157,9 @@ class AIService:
         """.strip()
 
         try:
-            response = self.client.models.generate_content(
-                model=self.model_id,
-                contents=prompt
-            )
-            return response.text.strip() if response and response.text else ""
-        except:
+            return self._generate(prompt, NO_RETRY, wait_for_quota=False)
+        except AppError as e:
+            logger.warning(f"키워드 추출 생략: {e.error_type}")
             return ""
 
 # 싱글톤 인스턴스 또는 전역 함수 제공
@@ -158,3 +179,7 @@ def expand_query(keyword: str) -> str:
 def correct_spelling(keyword: str) -> str:
     """검색어의 오타를 AI로 수정합니다."""
     return _ai_service.correct_spelling(keyword)
+
+def warm_up_ai_connection() -> Optional[float]:
+    """Gemini API 연결을 미리 엽니다."""
+    return _ai_service.warm_up()
@@ -0,0 +1,109 @@
+import re
+from dataclasses import replace
+from typing import List, Sequence
+import numpy as np
+from domain.news_article import NewsArticle
+
+# 문자 n-gram(shingle) 길이. 띄어쓰기/조사 차이에 강하도록 단어 대신 글자 단위 사용
+SHINGLE_SIZE = 3
+
+# 문서당 사용하는 최대 글자 수 (정규화 후). 긴 본문 스니펫에서도 계산 시간이 일정하도록 앞부분만 사용
+MAX_TEXT_CHARS = 600
+
+# 같은 기사로 보는 SimHash 최대 해밍 거리 (64비트 중)
+DEFAULT_MAX_DISTANCE = 6
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+def _normalize(text: str) -> str:
+    """소문자로 바꾸고 기호/공백을 제거한 뒤 앞부분 MAX_TEXT_CHARS자만 남깁니다."""
+    # 긴 본문 전체에 정규식을 적용하지 않도록 기호/공백 몫을 감안해 먼저 자름
+    return _NON_WORD.sub("", (text or "")[:MAX_TEXT_CHARS * 2].lower())[:MAX_TEXT_CHARS]
+
+def _mix64(values: np.ndarray) -> np.ndarray:
+    """uint64 배열의 각 값을 splitmix64로 섞어 고르게 분포된 64비트 해시로 만듭니다."""
+    with np.errstate(over="ignore"):
+        z = values + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+def simhash(texts: Sequence[str]) -> np.ndarray:
+    """
+    문서별 64비트 SimHash를 계산합니다.
+    모든 문서의 글자 n-gram을 한 배열로 이어 붙여 해시/비트 다수결을 numpy 연산으로 한 번에 처리합니다.
+    :return: uint64 배열 (문서 수)
+    """
+    fingerprints = np.zeros(len(texts), dtype=np.uint64)
+    doc_hashes, doc_ids = [], []
+    for doc_id, text in enumerate(texts):
+        codes = np.frombuffer(_normalize(text).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+        if len(codes) == 0:
+            continue
+        if len(codes) < SHINGLE_SIZE:
+            codes = np.pad(codes, (0, SHINGLE_SIZE - len(codes)))
+        # 연속한 글자 코드(21비트)를 하나의 정수로 묶어 n-gram 키를 만듦
+        keys = np.zeros(len(codes) - SHINGLE_SIZE + 1, dtype=np.uint64)
+        for offset in range(SHINGLE_SIZE):
+            keys = (keys << np.uint64(21)) | codes[offset:offset + len(keys)]
+        doc_hashes.append(_mix64(keys))
+        doc_ids.append(np.full(len(keys), doc_id))
+    if not doc_hashes:
+        return fingerprints
+
+    hashes = np.concatenate(doc_hashes)
+    ids = np.concatenate(doc_ids)
+    # (n-gram 수, 64) 비트 행렬 -> 문서별 비트 1의 개수 (문서별 n-gram이 연속해 있으므로 reduceat 사용)
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    ones = np.add.reduceat(bits, starts, axis=0, dtype=np.int32)
+    counts = np.diff(np.r_[starts, len(ids)])
+    # 비트별 다수결: n-gram의 과반에서 1인 비트를 1로
+    majority = ones * 2 > counts[:, None]
+    fingerprints[ids[starts]] = np.packbits(majority, axis=1, bitorder="little").view(np.uint64).ravel()
+    return fingerprints
+
+def hamming_matrix(fingerprints: np.ndarray) -> np.ndarray:
+    """SimHash 배열의 모든 쌍에 대한 해밍 거리 행렬을 계산합니다."""
+    xor = fingerprints[:, None] ^ fingerprints[None, :]
+    return np.unpackbits(xor.view(np.uint8).reshape(len(fingerprints), len(fingerprints), 8), axis=2).sum(axis=2)
+
+def collapse_near_duplicates(articles: List[NewsArticle], max_distance: int = DEFAULT_MAX_DISTANCE) -> List[NewsArticle]:
+    """
+    제목+스니펫이 거의 같은 기사(여러 매체에 실린 같은 통신사 기사 등)를 하나로 합칩니다.
+    묶인 기사 중 목록에서 가장 앞선 기사를 대표로 남기고, 나머지의 (출처, URL)은 대표 기사의 alternative_sources에 기록합니다.
+    순서는 대표 기사 기준으로 원래 순서를 유지합니다.
+    :param max_distance: 같은 기사로 보는 SimHash 최대 해밍 거리 (0 미만이면 합치지 않음)
+    """
+    if len(articles) < 2 or max_distance < 0:
+        return articles
+
+    fingerprints = simhash([f"{article.title} {article.snippet}" for article in articles])
+    close = hamming_matrix(fingerprints) <= max_distance
+
+    # 가까운 쌍을 연결 요소로 묶음 (union-find, 대표는 더 앞선 기사)
+    parent = list(range(len(articles)))
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    for i, j in zip(*np.nonzero(np.triu(close, k=1))):
+        root_i, root_j = find(int(i)), find(int(j))
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    collapsed, positions = [], {}
+    for index, article in enumerate(articles):
+        root = find(index)
+        if root == index:
+            positions[index] = len(collapsed)
+            collapsed.append(replace(article, alternative_sources=list(article.alternative_sources)))
+            continue
+        representative = collapsed[positions[root]]
+        known_urls = {representative.url, *(url for _, url in representative.alternative_sources)}
+        for source, url in [(article.source, article.url), *article.alternative_sources]:
+            if url not in known_urls:
+                representative.alternative_sources.append((source or url, url))
+                known_urls.add(url)
+    return collapsed
@@ -0,0 +1,201 @@
+import os
+import time
+import sqlite3
+import logging
+import threading
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterator, List, Optional
+from config.settings import settings
+from utils.exceptions import AppError
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS quota_usage (
+    provider TEXT NOT NULL,
+    day TEXT NOT NULL,
+    used INTEGER NOT NULL,
+    PRIMARY KEY (provider, day)
+);
+"""
+
+@dataclass(frozen=True)
+class ProviderQuota:
+    """제공자(API)별 호출 한도. None이면 해당 한도를 적용하지 않습니다."""
+    per_minute: Optional[int] = None
+    per_day: Optional[int] = None
+
+    def is_active(self) -> bool:
+        return self.per_minute is not None or self.per_day is not None
+
+@dataclass
+class QuotaStatus:
+    """제공자별 남은 호출 한도를 담는 데이터클래스 (한도가 없으면 None)"""
+    provider: str
+    per_minute: Optional[int]
+    per_day: Optional[int]
+    minute_remaining: Optional[int]
+    day_remaining: Optional[int]
+
+class _Bucket:
+    """제공자 1개의 분당 토큰 버킷과 오늘 사용량"""
+    def __init__(self, quota: ProviderQuota):
+        self.quota = quota
+        self.tokens = float(quota.per_minute or 0)
+        self.refilled_at = time.monotonic()
+        self.day: Optional[str] = None
+        self.used_today = 0
+
+    def refill(self, now: float):
+        """지난 시간만큼 토큰을 채웁니다. (1분에 per_minute개, 최대 per_minute개)"""
+        if self.quota.per_minute is None:
+            return
+        rate = self.quota.per_minute / 60.0
+        self.tokens = min(float(self.quota.per_minute), self.tokens + (now - self.refilled_at) * rate)
+        self.refilled_at = now
+
+    def wait_seconds(self) -> float:
+        """토큰 1개가 생길 때까지 기다려야 하는 시간(초)"""
+        if self.quota.per_minute is None or self.tokens >= 1:
+            return 0.0
+        if self.quota.per_minute == 0:
+            return float("inf")
+        return (1 - self.tokens) * 60.0 / self.quota.per_minute
+
+class QuotaLimiter:
+    """
+    외부 API(Tavily, Gemini) 호출 한도를 호출 전에 관리하는 프로세스 전역 토큰 버킷.
+    분당 한도는 메모리의 토큰 버킷으로, 일일 한도는 SQLite에 저장하는 날짜별 사용량으로 관리하므로
+    앱을 다시 시작해도 오늘 사용량이 이어집니다. 모든 Streamlit 세션이 같은 인스턴스를 공유합니다.
+    """
+    def __init__(self, db_path: str, quotas: Dict[str, ProviderQuota]):
+        """
+        :param db_path: 일일 사용량을 저장할 SQLite DB 파일 경로
+        :param quotas: {제공자 이름: 한도}
+        """
+        self.db_path = db_path
+        self.quotas = quotas
+        self._condition = threading.Condition()
+        self._buckets = {provider: _Bucket(quota) for provider, quota in quotas.items()}
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """작업 단위별 커넥션을 열고 트랜잭션을 커밋/롤백한 뒤 닫습니다."""
+        with closing(sqlite3.connect(self.db_path, timeout=30)) as conn:
+            with conn:
+                yield conn
+
+    def _bucket(self, provider: str) -> Optional[_Bucket]:
+        """제공자의 버킷을 오늘 날짜 기준으로 맞춰 반환합니다. 한도가 없는 제공자는 None입니다. (잠금 안에서 호출)"""
+        bucket = self._buckets.get(provider)
+        if bucket is None or not bucket.quota.is_active():
+            return None
+        today = date.today().isoformat()
+        if bucket.day != today:
+            bucket.day = today
+            bucket.used_today = self._load_used(provider, today)
+        bucket.refill(time.monotonic())
+        return bucket
+
+    def _load_used(self, provider: str, day: str) -> int:
+        """저장된 날짜별 사용량을 읽습니다. 읽지 못하면 0으로 시작합니다."""
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT used FROM quota_usage WHERE provider = ? AND day = ?", (provider, day)
+                ).fetchone()
+            return row[0] if row else 0
+        except Exception as e:
+            logger.warning(f"호출 한도 사용량 조회 실패: {e}")
+            return 0
+
+    def _spend(self, provider: str, bucket: _Bucket):
+        """토큰 1개를 쓰고 오늘 사용량을 저장합니다. 저장 실패는 호출을 막지 않습니다. (잠금 안에서 호출)"""
+        if bucket.quota.per_minute is not None:
+            bucket.tokens -= 1
+        bucket.used_today += 1
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT INTO quota_usage (provider, day, used) VALUES (?, ?, 1) "
+                    "ON CONFLICT(provider, day) DO UPDATE SET used = used + 1",
+                    (provider, bucket.day)
+                )
+        except Exception as e:
+            logger.warning(f"호출 한도 사용량 저장 실패: {e}")
+
+    @staticmethod
+    def _day_exhausted(bucket: _Bucket) -> bool:
+        return bucket.quota.per_day is not None and bucket.used_today >= bucket.quota.per_day
+
+    def try_acquire(self, provider: str) -> bool:
+        """
+        기다리지 않고 호출 1건을 예약합니다. 분당/일일 한도가 남아 있으면 사용량을 차감하고 True를 반환합니다.
+        (검색어 교정/확장처럼 없어도 되는 단계용)
+        """
+        with self._condition:
+            bucket = self._bucket(provider)
+            if bucket is None:
+                return True
+            if self._day_exhausted(bucket) or bucket.wait_seconds() > 0:
+                return False
+            self._spend(provider, bucket)
+            return True
+
+    def acquire(self, provider: str, timeout: Optional[float] = None):
+        """
+        호출 1건을 예약합니다. 분당 한도가 다 찼으면 토큰이 생길 때까지 기다립니다.
+        :param timeout: 최대 대기 시간(초). 필요한 대기 시간이 이보다 길면 기다리지 않고 실패합니다. (None이면 제한 없음)
+        :raises AppError: 일일 한도 초과 시 "daily_limit_exceeded", 분당 한도를 timeout 안에 얻지 못하면 "rate_limit_exceeded"
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                bucket = self._bucket(provider)
+                if bucket is None:
+                    return
+                if self._day_exhausted(bucket):
+                    raise AppError("daily_limit_exceeded")
+                wait = bucket.wait_seconds()
+                if wait <= 0:
+                    self._spend(provider, bucket)
+                    return
+                if deadline is not None and time.monotonic() + wait > deadline:
+                    raise AppError("rate_limit_exceeded")
+                self._condition.wait(wait)
+
+    def status(self) -> List[QuotaStatus]:
+        """한도가 설정된 제공자별 남은 호출 수를 반환합니다."""
+        statuses = []
+        with self._condition:
+            for provider in self.quotas:
+                bucket = self._bucket(provider)
+                if bucket is None:
+                    continue
+                quota = bucket.quota
+                statuses.append(QuotaStatus(
+                    provider=provider,
+                    per_minute=quota.per_minute,
+                    per_day=quota.per_day,
+                    minute_remaining=None if quota.per_minute is None else int(bucket.tokens),
+                    day_remaining=None if quota.per_day is None else max(quota.per_day - bucket.used_today, 0)
+                ))
+        return statuses
+
+# 프로세스 전체에서 공유하는 호출 한도 관리자 (SearchService, AIService가 호출 전에 사용)
+quota_limiter = QuotaLimiter(
+    str(settings.quota_path),
+    {
+        "tavily": ProviderQuota(settings.tavily_per_minute, settings.tavily_per_day),
+        "gemini": ProviderQuota(settings.gemini_per_minute, settings.gemini_per_day),
+    }
+)
+
+def get_quota_status() -> List[QuotaStatus]:
+    return quota_limiter.status()
@@ -0,0 +1,56 @@
+from collections import Counter
+from datetime import datetime, timezone
+from typing import List, Optional
+import numpy as np
+import pandas as pd
+from domain.news_article import NewsArticle
+from repositories.search_index import tokenize, BM25_K1, BM25_B, FIELD_WEIGHTS
+
+# 최종 점수에서 최신성이 차지하는 비중 (나머지는 검색어 관련도)
+RECENCY_WEIGHT = 0.3
+
+# 최신성 점수가 절반이 되는 기사 나이(일)
+RECENCY_HALF_LIFE_DAYS = 2.0
+
+def rerank(articles: List[NewsArticle], query: str, now: Optional[datetime] = None) -> List[NewsArticle]:
+    """
+    후보 기사들을 검색어 관련도(BM25)와 최신성을 합친 점수 순으로 정렬합니다.
+    기사별 검색어 토큰 빈도를 (기사 수 x 토큰 수) 행렬로 만든 뒤 BM25와 최신성 점수를 numpy로 한 번에 계산합니다.
+    - 관련도: 제목(가중치 2)+스니펫에 대한 BM25를 후보 중 최고 점수 기준으로 0~1 정규화
+    - 최신성: 발행 시각(published_at) 기준 RECENCY_HALF_LIFE_DAYS마다 절반으로 줄어드는 0~1 점수 (날짜가 없으면 0)
+    점수가 같으면 원래 순서를 유지합니다.
+    :param query: 사용자 검색어
+    :param now: 최신성 기준 시각 (기본값: 현재 UTC)
+    """
+    if len(articles) < 2:
+        return articles
+
+    query_tokens = list(dict.fromkeys(tokenize(query)))
+    relevance = np.zeros(len(articles))
+    if query_tokens:
+        tf = np.zeros((len(articles), len(query_tokens)))
+        lengths = np.zeros(len(articles))
+        for row, article in enumerate(articles):
+            counts = Counter()
+            for field, text in (("title", article.title), ("snippet", article.snippet)):
+                for token in tokenize(text):
+                    counts[token] += FIELD_WEIGHTS[field]
+            tf[row] = [counts[token] for token in query_tokens]
+            lengths[row] = sum(counts.values())
+
+        doc_freq = (tf > 0).sum(axis=0)
+        idf = np.log(1 + (len(articles) - doc_freq + 0.5) / (doc_freq + 0.5))
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / max(lengths.mean(), 1))
+        scores = (idf * tf * (BM25_K1 + 1) / (tf + norm[:, None])).sum(axis=1)
+        if scores.max() > 0:
+            relevance = scores / scores.max()
+
+    published = pd.Series([article.published_at for article in articles], dtype="datetime64[ns, UTC]")
+    now = pd.Timestamp(now or datetime.now(timezone.utc))
+    now = now.tz_localize("UTC") if now.tzinfo is None else now
+    age_days = ((now - published).dt.total_seconds() / 86400).clip(lower=0).to_numpy(dtype=float, na_value=np.nan)
+    recency = np.nan_to_num(0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS), nan=0.0)
+
+    combined = (1 - RECENCY_WEIGHT) * relevance + RECENCY_WEIGHT * recency
+    order = np.argsort(-combined, kind="stable")
+    return [articles[i] for i in order]
@@ -0,0 +1,174 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# time_range별 캐시 유효 시간(초). 최근 기사일수록 결과가 빨리 바뀌므로 짧게 유지
+CACHE_TTLS: Dict[Optional[str], int] = {
+    "day": 10 * 60,
+    "week": 60 * 60,
+    "month": 6 * 60 * 60,
+    None: 6 * 60 * 60,  # 모든 시간
+}
+
+# 만료된 디스크 항목을 정리하는 주기 (저장 횟수 기준)
+PURGE_EVERY = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_cache (
+    cache_key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    fetch_seconds REAL NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_search_cache_expires_at ON search_cache(expires_at);
+"""
+
+@dataclass
+class CacheStats:
+    """검색 캐시 사용 현황을 담는 데이터클래스"""
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    saved_seconds: float = 0.0  # 캐시 적중으로 생략한 API 호출 시간의 합 (원래 호출에 걸린 시간 기준)
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        """적중률 (0.0 ~ 1.0)"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+class SearchCache:
+    """
+    검색 API 응답을 보관하는 2단계(메모리 LRU + 디스크 SQLite) 캐시.
+    응답 원본(JSON으로 직렬화 가능한 dict)을 그대로 저장하므로 적중 시에도 API 호출 때와 똑같이 결과를 만들 수 있고,
+    time_range별 TTL이 지나면 만료됩니다. 메모리에서 밀려난 항목도 디스크에 남아 앱을 다시 시작해도 재사용됩니다.
+    """
+    def __init__(self, db_path: str, max_memory_entries: int = 256):
+        """
+        :param db_path: 디스크 캐시 SQLite DB 파일 경로
+        :param max_memory_entries: 메모리 LRU에 보관할 최대 항목 수
+        """
+        self.db_path = db_path
+        self.max_memory_entries = max_memory_entries
+        self._lock = threading.Lock()
+        # {캐시 키: (만료 시각, 응답, 원래 호출 시간)}
+        self._memory: "OrderedDict[str, Tuple[float, dict, float]]" = OrderedDict()
+        self._stats = CacheStats()
+        self._puts = 0
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """작업 단위별 커넥션을 열고 트랜잭션을 커밋/롤백한 뒤 닫습니다."""
+        with closing(sqlite3.connect(self.db_path, timeout=30)) as conn:
+            with conn:
+                yield conn
+
+    @staticmethod
+    def make_key(params: dict) -> str:
+        """요청 파라미터(dict)로 캐시 키(SHA-1 hex)를 만듭니다. 키 순서와 관계없이 같은 요청은 같은 키가 됩니다."""
+        canonical = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def ttl_for(time_range: Optional[str]) -> int:
+        """time_range에 해당하는 TTL(초)을 반환합니다."""
+        return CACHE_TTLS.get(time_range, CACHE_TTLS[None])
+
+    def get(self, cache_key: str) -> Optional[dict]:
+        """
+        캐시된 응답을 반환합니다. 메모리 -> 디스크 순으로 찾으며 디스크에서 찾으면 메모리로 올립니다.
+        없거나 만료되었으면 None을 반환하고 미스로 집계합니다.
+        """
+        now = time.time()
+        with self._lock:
+            cached = self._memory.get(cache_key)
+            if cached and cached[0] > now:
+                self._memory.move_to_end(cache_key)
+                self._stats.memory_hits += 1
+                self._stats.saved_seconds += cached[2]
+                return cached[1]
+            if cached:
+                del self._memory[cache_key]
+
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT payload, fetch_seconds, expires_at FROM search_cache WHERE cache_key = ? AND expires_at > ?",
+                    (cache_key, now)
+                ).fetchone()
+        except Exception as e:
+            logger.warning(f"디스크 캐시 조회 실패: {e}")
+            row = None
+
+        with self._lock:
+            if row is None:
+                self._stats.misses += 1
+                return None
+            payload, fetch_seconds, expires_at = json.loads(row[0]), row[1], row[2]
+            self._remember(cache_key, expires_at, payload, fetch_seconds)
+            self._stats.disk_hits += 1
+            self._stats.saved_seconds += fetch_seconds
+            return payload
+
+    def put(self, cache_key: str, payload: dict, ttl: int, fetch_seconds: float = 0.0):
+        """
+        응답을 메모리와 디스크에 저장합니다. 디스크 저장 실패는 검색 결과에 영향을 주지 않습니다.
+        :param ttl: 유효 시간(초)
+        :param fetch_seconds: 이 응답을 받는 데 걸린 시간 (절약 시간 집계용)
+        """
+        now = time.time()
+        expires_at = now + ttl
+        with self._lock:
+            self._remember(cache_key, expires_at, payload, fetch_seconds)
+            self._puts += 1
+            purge = self._puts % PURGE_EVERY == 0
+
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO search_cache (cache_key, payload, fetch_seconds, created_at, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (cache_key, json.dumps(payload, ensure_ascii=False), fetch_seconds, now, expires_at)
+                )
+                if purge:
+                    conn.execute("DELETE FROM search_cache WHERE expires_at <= ?", (now,))
+        except Exception as e:
+            logger.warning(f"디스크 캐시 저장 실패: {e}")
+
+    def _remember(self, cache_key: str, expires_at: float, payload: dict, fetch_seconds: float):
+        """메모리 LRU에 항목을 넣고 용량을 넘으면 가장 오래 쓰지 않은 항목을 버립니다. (잠금 안에서 호출)"""
+        self._memory[cache_key] = (expires_at, payload, fetch_seconds)
+        self._memory.move_to_end(cache_key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> CacheStats:
+        """현재까지의 캐시 사용 현황 사본을 반환합니다."""
+        with self._lock:
+            return CacheStats(**vars(self._stats))
+
+    def clear(self):
+        """메모리와 디스크의 모든 캐시 항목을 삭제합니다."""
+        with self._lock:
+            self._memory.clear()
+        with self._connect() as conn:
+            conn.execute("DELETE FROM search_cache")
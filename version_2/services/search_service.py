@@ -1,118 +1,332 @@
-from typing import List
+import time
+import logging
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
 from tavily import TavilyClient
 from config.settings import settings
 from domain.news_article import NewsArticle
+from services.search_cache import SearchCache, CacheStats
+from services.quota_limiter import quota_limiter
+from services.near_duplicate import collapse_near_duplicates
+from services.reranker import rerank
 from utils.exceptions import AppError
+from utils.key_generator import normalize_url
+from utils.http_client import configure_session_pool, warm_up
+from utils.api_fixtures import FixtureStore
+from utils.retry import RetryPolicy, call_with_retry, get_breaker, retry_after_hook
+from utils.single_flight import SingleFlight
+from utils.date_parser import parse_datetimes, to_iso
+
+logger = logging.getLogger(__name__)
+
+# 언어별 검색 힌트 매핑
+LANG_HINTS = {
+    "한국어": "",
+    "English": " news",
+    "日本語": " ニュース",
+    "Deutsch": " nachrichten"
+}
+
+# 시간 범위별 검색 일수
+DAYS_MAP = {"day": 1, "week": 7, "month": 30}
+
+# 여러 검색어 변형을 동시에 호출할 때의 최대 스레드 수
+MAX_FANOUT_WORKERS = 8
+
+# Tavily 검색 1회에 요청할 수 있는 최대 결과 수
+TAVILY_MAX_RESULTS = 20
+
+# Tavily 검색 호출 재시도 정책 (utils/retry.py)
+SEARCH_RETRY_POLICY = RetryPolicy(max_attempts=3, base_delay=0.5, max_delay=8.0)
+
+@dataclass(frozen=True)
+class QueryVariant:
+    """동시 검색(search_news_multi)에 사용할 검색어 변형 1개"""
+    keyword: str
+    category: str = "전체"
+    language: str = "한국어"
+
+def language_hint(language: str) -> str:
+    """언어별 검색 힌트 (사이드바 값 'English (US)' 등은 괄호 앞 이름으로 찾음)"""
+    return LANG_HINTS.get(language, LANG_HINTS.get((language or "").split(" (")[0], ""))
+
+def build_query_text(keyword: str, category: str = "전체", language: str = "한국어") -> str:
+    """Tavily에 보낼 검색어를 만듭니다. (카테고리 접두어 + 키워드 + 언어 힌트)"""
+    search_query = keyword + language_hint(language)
+    if category and category != "전체":
+        search_query = f"{category} {search_query}"
+    return search_query
+
+def build_query_variants(keyword: str, category: str = "전체", language: str = "한국어",
+                         expanded: Optional[str] = None, max_variants: Optional[int] = None) -> List[QueryVariant]:
+    """
+    사용자 검색어 1개로 동시에 검색할 변형 목록을 우선순위 순으로 만듭니다.
+    1. AI 확장 검색어 (선택한 카테고리/언어)
+    2. 원래 검색어 (선택한 카테고리 접두어 + 언어 힌트)
+    3. 언어 힌트만 붙인 검색어 (카테고리를 고른 경우, 접두어 때문에 빠지는 기사 보완)
+    4. 접두어/힌트 없는 원래 검색어
+    실제 검색어가 같은 변형은 하나만 남기고, 스레드/연결 풀 크기와 남은 Tavily 호출 한도를 넘지 않게 잘라냅니다.
+    (검색 캐시에 있는 변형은 호출하지 않지만 한도 계산에서는 보수적으로 1회로 셉니다)
+    :param max_variants: 최대 변형 수 (기본값: MAX_FANOUT_WORKERS와 HTTP_POOL_SIZE 중 작은 값)
+    """
+    candidates = [QueryVariant(keyword, category, language), QueryVariant(keyword, "전체", language), QueryVariant(keyword)]
+    if expanded and expanded != keyword:
+        candidates.insert(0, QueryVariant(expanded, category, language))
+
+    limit = max_variants or min(MAX_FANOUT_WORKERS, settings.http_pool_size)
+    for status in quota_limiter.status():
+        if status.provider == "tavily":
+            remaining = [value for value in (status.minute_remaining, status.day_remaining) if value is not None]
+            if remaining:
+                limit = min(limit, max(min(remaining), 1))
+
+    variants = {}
+    for variant in candidates:
+        variants.setdefault(build_query_text(variant.keyword, variant.category, variant.language), variant)
+    return list(variants.values())[:limit]
 
 class SearchService:
     """Tavily API를 사용하여 뉴스 검색 기능을 제공하는 서비스 클래스"""
     def __init__(self):
-        """TavilyClient를 초기화합니다."""
-        self.client = TavilyClient(api_key=settings.tavily_api_key)
+        """
+        TavilyClient와 검색 결과 캐시(SEARCH_CACHE_ENABLED)를 초기화합니다.
+        동시 검색(search_news_multi)의 연결이 재사용되도록 클라이언트 세션의 연결 풀을 HTTP_POOL_SIZE로 맞춥니다.
+        TAVILY_BASE_URL이 있으면 그 주소(로컬 스텁 서버 등)로 요청하고, API_MODE에 따라 응답을 녹화/재생합니다.
+        """
+        self.client = TavilyClient(api_key=settings.tavily_api_key, api_base_url=settings.tavily_base_url)
+        configure_session_pool(
+            self.client.session, settings.http_pool_size, settings.api_mode,
+            FixtureStore(str(settings.api_fixture_path), "tavily")
+        )
+        self.client.session.hooks["response"].append(retry_after_hook)
+        self.breaker = get_breaker("tavily.search")
+        # 여러 세션의 같은 검색 요청이 동시에 진행되면 API 호출 1건으로 묶음
+        self._in_flight = SingleFlight()
+        self.cache: Optional[SearchCache] = None
+        if settings.search_cache_enabled:
+            self.cache = SearchCache(str(settings.search_cache_path), settings.search_cache_max_entries)
 
     def search_news(self, keyword: str, num_results: int = 5, category: str = "전체", time_range: str = None, include_all_sources: bool = False, language: str = "한국어") -> List[NewsArticle]:
         """
         Tavily API를 사용하여 최적화된 뉴스를 검색합니다.
         지원 언어에 따른 쿼리 힌트를 추가하여 정확도를 높입니다.
         """
-        max_retries = 1
-        attempt = 0
-        
-        # 언어별 검색 힌트 매핑
-        lang_hints = {
-            "한국어": "",
-            "English": " news",
-            "日本語": " ニュース",
-            "Deutsch": " nachrichten"
+        return self.search_news_ranked([QueryVariant(keyword, category, language)], num_results, time_range, include_all_sources)[0]
+
+    def search_news_multi(self, variants: List[QueryVariant], num_results: int = 5, time_range: str = None, include_all_sources: bool = False, query: Optional[str] = None) -> List[NewsArticle]:
+        """
+        여러 검색어 변형(원래 키워드, AI 확장 검색어, 언어/카테고리별 변형 등)을 동시에 검색하고 결과를 합칩니다.
+        각 변형은 스레드 풀에서 병렬로 호출되므로 전체 소요 시간은 가장 느린 호출 하나에 가깝습니다.
+        합친 결과는 정규화한 URL 기준으로 중복을 제거하고(앞선 변형의 기사를 유지) 최신순으로 다시 정렬한 뒤,
+        내용이 거의 같은 다른 매체의 기사를 하나로 합칩니다.
+        일부 변형만 실패하면 성공한 결과로 진행하고, 모두 실패하면 첫 번째 오류를 그대로 발생시킵니다.
+        """
+        return self.search_news_ranked(variants, num_results, time_range, include_all_sources, query)[0]
+
+    def search_news_ranked(self, variants: List[QueryVariant], num_results: int = 5, time_range: str = None, include_all_sources: bool = False, query: Optional[str] = None) -> Tuple[List[NewsArticle], List[NewsArticle]]:
+        """
+        검색어 변형별로 num_results의 SEARCH_OVERFETCH_FACTOR배(최대 TAVILY_MAX_RESULTS)를 가져와 합치고(search_news_multi 참고),
+        모든 후보를 사용자 검색어에 대한 관련도(BM25)와 최신성으로 다시 정렬합니다. (services/reranker.py)
+        :param query: 관련도를 계산할 사용자 검색어. AI 확장 검색어 등 변형에 붙은 단어로 순위가 치우치지 않도록
+                      변형 검색어가 아닌 원래 검색어를 넘깁니다. (기본값: 첫 번째 변형의 검색어)
+        :return: (상위 num_results건, 나머지 후보). 나머지 후보는 '더 보기'에서 API를 다시 호출하지 않고 사용합니다.
+        """
+        variants = list(dict.fromkeys(variants))
+        if not variants:
+            return [], []
+
+        fetch_count = max(num_results, min(num_results * settings.search_overfetch_factor, TAVILY_MAX_RESULTS))
+        merged = self._gather(variants, fetch_count, time_range, include_all_sources)
+        if not merged:
+            return [], []
+
+        # 발행일을 한 번에 해석해 최신순(날짜 없는 기사는 뒤)으로 정렬하고, 캐시/추가 수집분 중 기간을 벗어난 기사는 제외
+        published = parse_datetimes(item.get('published_date') for item, _, _ in merged)
+        in_range = pd.Series(True, index=published.index)
+        days_back = DAYS_MAP.get(time_range) if time_range else None
+        if days_back:
+            in_range = published.isna() | (published >= pd.Timestamp.now(tz="UTC") - pd.Timedelta(days=days_back))
+        order = published[in_range].sort_values(ascending=False, na_position="last", kind="stable").index
+        articles = [self._to_article(*merged[i], published[i]) for i in order]
+        ranked = rerank(self._collapse(articles), query or variants[0].keyword)
+        return ranked[:num_results], ranked[num_results:]
+
+    def _gather(self, variants: List[QueryVariant], max_results: int, time_range: Optional[str], include_all_sources: bool) -> List[Tuple[dict, Optional[str], str]]:
+        """
+        검색어 변형들을 (2개 이상이면 동시에) 검색하고, 정규화한 URL 기준으로 중복을 제거한 (결과, 이미지, 카테고리) 목록을 반환합니다.
+        일부 변형만 실패하면 성공한 결과로 진행하고, 모두 실패하면 첫 번째 오류를 그대로 발생시킵니다.
+        """
+        def run(variant: QueryVariant) -> List[Tuple[dict, Optional[str], str]]:
+            search_params = self._build_params(variant.keyword, max_results, variant.category, time_range, include_all_sources, variant.language)
+            results, images = self._search_raw(search_params, time_range)
+            return [(item, img_url, variant.category) for item, img_url in self._pair_images(results, images)]
+
+        if len(variants) == 1:
+            outcomes = [run(variants[0])]
+        else:
+            outcomes = []
+            with ThreadPoolExecutor(max_workers=min(len(variants), MAX_FANOUT_WORKERS), thread_name_prefix="search-fanout") as executor:
+                futures = [executor.submit(run, variant) for variant in variants]
+                for variant, future in zip(variants, futures):
+                    try:
+                        outcomes.append(future.result())
+                    except AppError as e:
+                        logger.warning(f"검색어 변형 실패 ({variant.keyword}): {e.error_type}")
+                        outcomes.append(e)
+
+            errors = [outcome for outcome in outcomes if isinstance(outcome, AppError)]
+            if len(errors) == len(outcomes):
+                raise errors[0]
+
+        merged, seen_urls = [], set()
+        for outcome in outcomes:
+            if isinstance(outcome, AppError):
+                continue
+            for item, img_url, category in outcome:
+                url_key = normalize_url(item.get('url')) or item.get('title')
+                if url_key in seen_urls:
+                    continue
+                seen_urls.add(url_key)
+                merged.append((item, img_url, category))
+        return merged
+
+    @staticmethod
+    def _collapse(articles: List[NewsArticle]) -> List[NewsArticle]:
+        """
+        여러 매체에 실린 같은 기사(제목+스니펫 SimHash가 가까운 기사)를 하나로 합칩니다. (NEAR_DUPLICATE_COLLAPSE)
+        개수 제한을 적용하기 전에 합치므로 중복이 빠진 자리는 다음 기사로 채워지고, AI 요약/키워드 추출도 중복 없이 호출됩니다.
+        """
+        if not settings.near_duplicate_collapse:
+            return articles
+        return collapse_near_duplicates(articles)
+
+    @staticmethod
+    def _build_params(keyword: str, num_results: int, category: str, time_range: Optional[str], include_all_sources: bool, language: str) -> dict:
+        """검색어와 옵션으로 Tavily 검색 요청 파라미터를 만듭니다."""
+        # 가속화를 위한 파라미터 튜닝
+        # 성능 우선을 위해 search_depth를 'basic'으로 변경 (사용자 피드백 반영)
+        search_params = {
+            "query": build_query_text(keyword, category, language),
+            "search_depth": "basic",
+            "max_results": num_results,
+            "topic": "news",
+            "include_images": False # 이미지 수집 비활성화 (사용자 요청)
         }
-        query_hint = lang_hints.get(language, "")
 
-        # 쿼리 구성 최적화
-        search_query = keyword + query_hint
-        if category and category != "전체":
-            search_query = f"{category} {search_query}"
-            
+        # Tavily API는 q=... 에 언어 필터를 넣거나 검색어 자체로 판단함.
+        # 명시적인 search_language 파라미터가 없으면 쿼리에 언어를 힌트로 줄 수 있음
+        include_domains = None if include_all_sources else settings.search_domains
+        if include_domains:
+            search_params["include_domains"] = include_domains
+
         # 시간 범위 설정
-        days_map = {"day": 1, "week": 7, "month": 30}
-        days_back = days_map.get(time_range) if time_range else None
-
-        while attempt <= max_retries:
-            try:
-                include_domains = None if include_all_sources else settings.search_domains
-                
-                # 가속화를 위한 파라미터 튜닝
-                # 성능 우선을 위해 search_depth를 'basic'으로 변경 (사용자 피드백 반영)
-                search_params = {
-                    "query": search_query,
-                    "search_depth": "basic", 
-                    "max_results": num_results,
-                    "topic": "news",
-                    "include_images": False # 이미지 수집 비활성화 (사용자 요청)
-                }
-                
-                # Tavily API는 q=... 에 언어 필터를 넣거나 검색어 자체로 판단함.
-                # 명시적인 search_language 파라미터가 없으면 쿼리에 언어를 힌트로 줄 수 있음
-                # 하지만 Tavily는 보통 쿼리 언어에 따라 자동 조절함.
-                # 여기서는 쿼리에 언어 힌트를 추가하거나 도메인 제한을 활용할 수 있으나, 일단 쿼리 자체는 유지함.
-                
-                if include_domains:
-                    search_params["include_domains"] = include_domains
-                
-                if days_back:
-                    search_params["days"] = days_back
-                
-                response = self.client.search(**search_params)
-                results = response.get('results', [])
-                images = response.get('images', []) # Tavily는 별도의 이미지 화일 리스트를 주기도 함
-                
-                if not results:
-                    return []
-                    
-                # 최신순 정렬 (Tavily basic search는 정렬을 보장하지 않으므로 수동 정렬)
-                results.sort(key=lambda x: x.get('published_date', ''), reverse=True)
-                
-                articles = []
-                for i, item in enumerate(results[:num_results]):
-                    # 도메인을 출처로 활용
-                    url = item.get('url', '#')
-                    source = url.split('//')[-1].split('/')[0].replace('www.', '')
-                    
-                    # 해당 기사와 관련된 이미지가 있다면 매칭 (tavily는 리스트 순서가 항상 보장되지는 않지만 최선)
-                    img_url = images[i] if i < len(images) else None
-                    
-                    articles.append(NewsArticle(
-                        title=item.get('title', '제목 정보 없음'),
-                        url=url,
-                        snippet=item.get('content', '요약된 내용이 없습니다.'),
-                        pub_date=item.get('published_date'),
-                        image_url=img_url,
-                        category=category if category != "전체" else "News",
-                        source=source
-                    ))
-                    
-                return articles
-                
-            except Exception as e:
-                attempt += 1
-                error_str = str(e).lower()
-                
-                if attempt > max_retries or "401" in error_str or "400" in error_str:
-                    if "401" in error_str or ("invalid" in error_str and "api" in error_str):
-                        raise AppError("api_key_invalid")
-                    elif "429" in error_str or "limit" in error_str:
-                        raise AppError("rate_limit_exceeded")
-                    elif "400" in error_str:
-                        raise AppError("bad_request")
-                    elif any(err in error_str for err in ["500", "502", "503"]):
-                        raise AppError("server_error")
-                    else:
-                        raise AppError("network_error")
-                
-                import time
-                time.sleep(1)
+        days_back = DAYS_MAP.get(time_range) if time_range else None
+        if days_back:
+            search_params["days"] = days_back
+        return search_params
+
+    def _search_raw(self, search_params: dict, time_range: Optional[str]) -> Tuple[List[dict], List[str]]:
+        """
+        Tavily 검색을 호출하고 (results, images) 원본을 반환합니다.
+        재시도(지수 백오프, Retry-After)와 서킷 브레이커는 _call_api에서 처리하며, 실패 원인은 AppError로 전달됩니다.
+        """
+        response = self._fetch(search_params, time_range)
+        results = list(response.get('results', []))
+        images = response.get('images', []) # Tavily는 별도의 이미지 화일 리스트를 주기도 함
+        return results, images
+
+    @staticmethod
+    def _pair_images(results: List[dict], images: List[str]) -> List[Tuple[dict, Optional[str]]]:
+        """결과를 최신순으로 정렬하고 같은 순번의 이미지와 짝지어 반환합니다."""
+        # 최신순 정렬 (Tavily basic search는 정렬을 보장하지 않으므로 수동 정렬, 날짜 형식이 섞여 있어 해석한 시각 기준)
+        published = parse_datetimes(item.get('published_date') for item in results)
+        results = [results[i] for i in published.sort_values(ascending=False, na_position="last", kind="stable").index]
+        # 해당 기사와 관련된 이미지가 있다면 매칭 (tavily는 리스트 순서가 항상 보장되지는 않지만 최선)
+        return [(item, images[i] if i < len(images) else None) for i, item in enumerate(results)]
+
+    @staticmethod
+    def _to_article(item: dict, img_url: Optional[str], category: str, published_at: Optional[pd.Timestamp] = None) -> NewsArticle:
+        """
+        Tavily 검색 결과 항목 1건을 NewsArticle로 변환합니다.
+        published_at(해석한 발행 시각)이 있으면 pub_date도 ISO-8601(UTC) 문자열로 통일해 저장합니다.
+        """
+        # 도메인을 출처로 활용
+        url = item.get('url', '#')
+        source = url.split('//')[-1].split('/')[0].replace('www.', '')
+        return NewsArticle(
+            title=item.get('title', '제목 정보 없음'),
+            url=url,
+            snippet=item.get('content', '요약된 내용이 없습니다.'),
+            pub_date=to_iso(published_at) or item.get('published_date'),
+            published_at=None if published_at is None or pd.isna(published_at) else published_at.to_pydatetime(),
+            image_url=img_url,
+            category=category if category != "전체" else "News",
+            source=source
+        )
+
+    def _fetch(self, search_params: dict, time_range: Optional[str]) -> dict:
+        """
+        Tavily 검색을 호출합니다. 캐시가 켜져 있으면 같은 요청 파라미터의 응답을 time_range별 TTL 동안 재사용합니다.
+        캐시에는 응답의 results/images 원본을 저장하므로 적중 시에도 NewsArticle을 똑같이 만들 수 있습니다.
+        같은 요청 파라미터의 호출이 이미 진행 중이면 새로 호출하지 않고 그 응답을 함께 받습니다.
+        """
+        cache_key = SearchCache.make_key(search_params)
+        if self.cache is None:
+            return self._in_flight.do(cache_key, lambda: self._call_api(search_params))
+
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        def fetch_and_store() -> dict:
+            started = time.perf_counter()
+            response = self._call_api(search_params)
+            payload = {"results": response.get('results', []), "images": response.get('images', [])}
+            self.cache.put(cache_key, payload, SearchCache.ttl_for(time_range), time.perf_counter() - started)
+            return payload
+
+        return self._in_flight.do(cache_key, fetch_and_store)
+
+    def _call_api(self, search_params: dict) -> dict:
+        """
+        Tavily 검색 API를 재시도 정책(SEARCH_RETRY_POLICY)과 서킷 브레이커를 적용해 호출합니다.
+        Tavily 장애가 이어져 브레이커가 열리면 기다리지 않고 AppError("service_unavailable")로 실패합니다.
+        재시도를 포함한 매 호출 전에 호출 한도(TAVILY_MINUTE_LIMIT, TAVILY_DAILY_LIMIT)를 차감하며,
+        한도를 넘으면 API를 호출하지 않고 AppError로 실패합니다.
+        """
+        def search_once() -> dict:
+            quota_limiter.acquire("tavily", timeout=settings.quota_max_wait)
+            return self.client.search(**search_params, timeout=settings.http_timeout)
+
+        return call_with_retry(search_once, SEARCH_RETRY_POLICY, self.breaker)
+
+    def warm_up(self) -> Optional[float]:
+        """
+        Tavily API 서버로 연결을 미리 열어 세션 풀에 넣어 둡니다. (HTTP_WARMUP)
+        :return: 걸린 시간(초). 실패하면 None
+        """
+        return warm_up(self.client.session.head, self.client.base_url, settings.http_timeout)
+
+    def cache_stats(self) -> Optional[CacheStats]:
+        """검색 캐시 사용 현황(적중률, 절약 시간)을 반환합니다. 캐시가 꺼져 있으면 None입니다."""
+        return self.cache.stats() if self.cache else None
 
 # 싱글톤 패턴 또는 전역 함수 제공
 _search_service = SearchService()
 
 def search_news(keyword: str, num_results: int = 5, category: str = "전체", time_range: str = None, include_all_sources: bool = False, language: str = "한국어") -> List[NewsArticle]:
     return _search_service.search_news(keyword, num_results, category, time_range, include_all_sources, language)
+
+def search_news_multi(variants: List[QueryVariant], num_results: int = 5, time_range: str = None, include_all_sources: bool = False, query: Optional[str] = None) -> List[NewsArticle]:
+    return _search_service.search_news_multi(variants, num_results, time_range, include_all_sources, query)
+
+def search_news_ranked(variants: List[QueryVariant], num_results: int = 5, time_range: str = None, include_all_sources: bool = False, query: Optional[str] = None) -> Tuple[List[NewsArticle], List[NewsArticle]]:
+    return _search_service.search_news_ranked(variants, num_results, time_range, include_all_sources, query)
+
+def get_search_cache_stats() -> Optional[CacheStats]:
+    return _search_service.cache_stats()
+
+def warm_up_search_connection() -> Optional[float]:
+    return _search_service.warm_up()
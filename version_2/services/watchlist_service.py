@@ -0,0 +1,125 @@
+import logging
+import threading
+from dataclasses import replace
+from datetime import datetime
+from typing import List, Optional, Set
+from domain.news_article import NewsArticle
+from domain.search_result import SearchResult
+from domain.watch_status import WatchStatus
+from repositories.base_repository import BaseSearchRepository
+from services.search_service import search_news_ranked, QueryVariant
+from services.ai_service import summarize_news, extract_keywords
+from utils.exceptions import AppError
+from utils.key_generator import generate_search_key, normalize_url
+
+logger = logging.getLogger(__name__)
+
+# 관심 키워드 갱신 1회에 가져오는 기사 수와 검색 기간
+WATCH_NUM_RESULTS = 10
+WATCH_TIME_RANGE = "day"
+
+class WatchListService:
+    """
+    관심 키워드(WATCHLIST_KEYWORDS)를 주기적으로 다시 검색하고, 이미 저장된 기사와 비교해 새 기사만 요약/저장하는 서비스.
+    - 갱신할 때마다 키워드로 저장된 기사 URL을 저장소에서 다시 읽으므로, 직접 검색해 저장했거나 다른 프로세스가 저장한 기사도 새 기사로 보지 않습니다.
+    - 새 기사가 없으면 검색 1회(검색 캐시 유효 시간 안이면 0회)로 끝나며 Gemini 호출과 저장을 하지 않습니다.
+    - 새 기사가 있으면 새 기사만 요약해 새 SearchResult로 저장합니다.
+    갱신은 백그라운드 스레드 1개에서 차례로 실행되므로 키워드가 많아도 API 호출이 몰리지 않습니다.
+    """
+    def __init__(self, repository: BaseSearchRepository, keywords: List[str], interval_minutes: int,
+                 num_results: int = WATCH_NUM_RESULTS, time_range: str = WATCH_TIME_RANGE):
+        """
+        :param keywords: 관심 키워드 목록
+        :param interval_minutes: 자동 갱신 주기(분)
+        """
+        self.repository = repository
+        self.keywords = list(keywords)
+        self.interval_minutes = interval_minutes
+        self.num_results = num_results
+        self.time_range = time_range
+        self._statuses = {keyword: WatchStatus(keyword) for keyword in self.keywords}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _article_urls(article: NewsArticle) -> Set[str]:
+        """기사와 합쳐진 다른 매체 기사(alternative_sources)의 정규화 URL"""
+        return {normalize_url(url) for url in [article.url, *(url for _, url in article.alternative_sources)]} - {""}
+
+    def _update_status(self, keyword: str, **changes):
+        with self._lock:
+            self._statuses[keyword] = replace(self._statuses[keyword], **changes)
+
+    def refresh(self, keyword: str) -> WatchStatus:
+        """
+        키워드 1개를 다시 검색해 저장된 기사에 없는 기사만 요약/저장합니다.
+        검색/요약 실패는 발생시키지 않고 상태의 last_error에 기록합니다.
+        :return: 갱신 후 상태
+        """
+        now = datetime.now()
+        try:
+            known = self.repository.get_article_urls(keyword)
+            articles, _ = search_news_ranked([QueryVariant(keyword)], self.num_results, self.time_range, query=keyword)
+            # 대표 기사나 합쳐진 다른 매체 기사 중 하나라도 이미 저장되어 있으면 같은 기사로 봄
+            new_articles = [article for article in articles if not self._article_urls(article) & known]
+            if not new_articles:
+                self._update_status(keyword, last_checked=now, new_articles=0, last_error=None)
+                return self.status(keyword)
+
+            result = SearchResult(
+                search_key=generate_search_key(keyword),
+                search_time=now,
+                keyword=keyword,
+                articles=new_articles,
+                ai_summary=summarize_news(new_articles),
+                ai_keywords=extract_keywords(new_articles)
+            )
+            if not self.repository.save(result):
+                self._update_status(keyword, last_checked=now, last_error="file_error")
+                return self.status(keyword)
+            logger.info(f"관심 키워드 '{keyword}': 새 기사 {len(new_articles)}건 저장 ({result.search_key})")
+            self._update_status(
+                keyword, last_checked=now, last_changed=now, new_articles=len(new_articles),
+                last_search_key=result.search_key, last_error=None
+            )
+        except AppError as e:
+            logger.warning(f"관심 키워드 '{keyword}' 갱신 실패: {e.error_type}")
+            self._update_status(keyword, last_checked=now, last_error=e.error_type)
+        except Exception as e:
+            logger.error(f"관심 키워드 '{keyword}' 갱신 실패: {e}")
+            self._update_status(keyword, last_checked=now, last_error="unknown_error")
+        return self.status(keyword)
+
+    def refresh_all(self) -> List[WatchStatus]:
+        """모든 관심 키워드를 차례로 갱신합니다."""
+        return [self.refresh(keyword) for keyword in self.keywords]
+
+    def _run(self):
+        while True:
+            self.refresh_all()
+            self._wake.wait(self.interval_minutes * 60)
+            self._wake.clear()
+
+    def start(self) -> threading.Thread:
+        """
+        시작 직후와 이후 interval_minutes마다 모든 관심 키워드를 갱신하는 백그라운드 스레드를 시작합니다.
+        이미 시작했으면 실행 중인 스레드를 반환합니다.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="watchlist-refresh", daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def request_refresh(self):
+        """다음 주기를 기다리지 않고 백그라운드 스레드가 바로 갱신하도록 요청합니다. (사이드바 '지금 갱신')"""
+        self._wake.set()
+
+    def status(self, keyword: str) -> WatchStatus:
+        with self._lock:
+            return replace(self._statuses[keyword])
+
+    def statuses(self) -> List[WatchStatus]:
+        """관심 키워드별 최근 갱신 상태를 목록 순서대로 반환합니다."""
+        with self._lock:
+            return [replace(self._statuses[keyword]) for keyword in self.keywords]
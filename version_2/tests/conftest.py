@@ -0,0 +1,50 @@
+import os
+import tempfile
+from datetime import datetime
+from typing import List, Optional
+import pytest
+
+# config.settings는 import 시 필수 환경 변수를 확인하고 데이터 디렉토리를 만들므로, 테스트 모듈을 불러오기 전에
+# 임시 디렉토리와 가짜 키로 설정합니다. 외부 API는 replay 모드로 막아 두어 실수로 네트워크를 쓰지 않게 합니다.
+_DATA_DIR = tempfile.mkdtemp(prefix="trendtracker-tests-")
+os.environ.update({
+    "TAVILY_API_KEY": "test-tavily-key",
+    "GEMINI_API_KEY": "test-gemini-key",
+    "CSV_PATH": os.path.join(_DATA_DIR, "search_history.csv"),
+    "SQLITE_PATH": os.path.join(_DATA_DIR, "search_history.db"),
+    "SEARCH_INDEX_PATH": os.path.join(_DATA_DIR, "search_index.db"),
+    "SEARCH_CACHE_PATH": os.path.join(_DATA_DIR, "search_cache.db"),
+    "QUOTA_PATH": os.path.join(_DATA_DIR, "api_quota.db"),
+    "API_MODE": "replay",
+    "API_FIXTURE_PATH": os.path.join(_DATA_DIR, "api_fixtures"),
+    "SEARCH_CACHE_ENABLED": "false",
+})
+
+from domain.news_article import NewsArticle
+from domain.search_result import SearchResult
+
+def make_result(search_key: str, articles: List[NewsArticle], keyword: Optional[str] = None,
+                search_time: Optional[datetime] = None, ai_summary: str = "요약") -> SearchResult:
+    """테스트용 SearchResult를 만듭니다."""
+    return SearchResult(
+        search_key=search_key,
+        search_time=search_time or datetime(2026, 10, 1, 9, 0),
+        keyword=keyword or search_key.rsplit("-", 1)[0],
+        articles=articles,
+        ai_summary=ai_summary,
+        ai_keywords="키워드"
+    )
+
+@pytest.fixture
+def article_factory():
+    """번호로 구분되는 테스트 기사를 만드는 함수"""
+    def make(i: int, **fields) -> NewsArticle:
+        values = dict(
+            title=f"기사 제목 {i}",
+            url=f"https://news.example.com/articles/{i}",
+            snippet=f"기사 {i}의 본문 스니펫",
+            pub_date="2026-10-01T09:00:00+00:00"
+        )
+        values.update(fields)
+        return NewsArticle(**values)
+    return make
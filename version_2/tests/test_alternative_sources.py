@@ -0,0 +1,64 @@
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from conftest import make_result
+from repositories.parquet_search_repository import PARQUET_SCHEMA, ParquetSearchRepository
+from repositories.search_repository import SearchRepository
+from repositories.sqlite_search_repository import SqliteSearchRepository
+
+SOURCES = [("한국경제", "https://hankyung.example.com/news/1?utm_source=feed"), ("매일경제", "https://mk.example.com/1")]
+
+@pytest.fixture(params=["csv", "sqlite", "parquet"])
+def repository(request, tmp_path):
+    if request.param == "csv":
+        return SearchRepository(str(tmp_path / "search_history.csv"))
+    if request.param == "sqlite":
+        return SqliteSearchRepository(str(tmp_path / "history.db"))
+    return ParquetSearchRepository(str(tmp_path / "parquet"))
+
+def test_alternative_sources_round_trip(repository, article_factory):
+    repository.save(make_result("반도체-202610010900", [
+        article_factory(1, alternative_sources=list(SOURCES)),
+        article_factory(2),
+    ]))
+
+    restored = repository.find_by_key("반도체-202610010900")
+    assert [a.alternative_sources for a in restored.articles] == [SOURCES, []]
+    assert restored.articles[0].url == "https://news.example.com/articles/1"
+
+def test_article_urls_include_collapsed_sources(repository, article_factory):
+    repository.save(make_result("반도체-202610010900", [article_factory(1, alternative_sources=list(SOURCES))]))
+    repository.save(make_result("환율-202610011000", [article_factory(2, alternative_sources=[("연합", "https://yna.example.com/2")])]))
+
+    # 대표 기사가 바뀌어 다른 매체 기사가 다시 수집되어도 이미 저장된 기사로 봄
+    assert repository.get_article_urls("반도체") == {
+        "https://news.example.com/articles/1", "https://hankyung.example.com/news/1", "https://mk.example.com/1"
+    }
+
+def test_csv_without_column_is_upgraded_keeping_stored_values(tmp_path, article_factory):
+    csv_path = tmp_path / "search_history.csv"
+    legacy = make_result("007-202609300900", [article_factory(1)], keyword="007").to_dataframe()
+    legacy.drop(columns=["alternative_sources"]).to_csv(csv_path, index=False, encoding="utf-8-sig")
+    repository = SearchRepository(str(csv_path))
+
+    assert repository.save(make_result("반도체-202610010900", [article_factory(2, alternative_sources=list(SOURCES))]))
+
+    assert "alternative_sources" in pd.read_csv(csv_path, nrows=0).columns
+    old = repository.find_by_key("007-202609300900")
+    assert (old.keyword, old.articles[0].alternative_sources) == ("007", [])
+    assert repository.find_by_key("반도체-202610010900").articles[0].alternative_sources == SOURCES
+
+def test_parquet_files_without_column_are_still_readable(tmp_path, article_factory):
+    repository = ParquetSearchRepository(str(tmp_path / "parquet"))
+    old_schema = pa.schema([field for field in PARQUET_SCHEMA if field.name != "alternative_sources"])
+    df = make_result("환율-202609300900", [article_factory(1)]).to_dataframe()
+    os.makedirs(tmp_path / "parquet" / "month=2026-10")
+    pq.write_table(pa.Table.from_pandas(df.drop(columns=["alternative_sources"]), schema=old_schema, preserve_index=False),
+                   tmp_path / "parquet" / "month=2026-10" / "part-old.parquet")
+
+    repository.save(make_result("반도체-202610010900", [article_factory(2, alternative_sources=list(SOURCES))]))
+
+    assert repository.find_by_key("환율-202609300900").articles[0].alternative_sources == []
+    assert repository.find_by_key("반도체-202610010900").articles[0].alternative_sources == SOURCES
@@ -0,0 +1,87 @@
+import json
+import threading
+import httpx
+import pytest
+import requests
+from utils.api_fixtures import FixtureNotFoundError, FixtureStore, fixture_key
+from utils.http_client import configure_session_pool, create_httpx_client
+from utils.stub_server import create_stub_server, StubConfig
+
+GEMINI_PATH = "/v1beta/models/gemini-2.5-flash:generateContent"
+
+@pytest.fixture
+def stub():
+    server, stats = create_stub_server()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", stats
+    server.shutdown()
+    server.server_close()
+
+def test_fixture_key_ignores_host_credentials_and_key_order():
+    body = json.dumps({"query": "반도체", "max_results": 5, "api_key": "tvly-live"}).encode("utf-8")
+    same = json.dumps({"api_key": "tvly-other", "max_results": 5, "query": "반도체"}).encode("utf-8")
+    key = fixture_key("post", "https://api.tavily.com/search", body)
+    assert key == fixture_key("POST", "http://127.0.0.1:8765/search?key=secret", same)
+
+    assert key != fixture_key("POST", "https://api.tavily.com/extract", body)
+    assert key != fixture_key("GET", "https://api.tavily.com/search", body)
+    assert key != fixture_key("POST", "https://api.tavily.com/search", json.dumps({"query": "AI", "max_results": 5}).encode("utf-8"))
+    # JSON이 아닌 본문도 그대로 키에 반영
+    assert fixture_key("POST", "/raw", b"a=1") != fixture_key("POST", "/raw", b"a=2")
+
+def test_requests_adapter_records_then_replays_offline(tmp_path, stub):
+    base_url, stats = stub
+    store = FixtureStore(str(tmp_path), "tavily")
+    payload = {"query": "반도체", "max_results": 3, "api_key": "tvly-secret"}
+
+    recorder = configure_session_pool(requests.Session(), 2, "record", store)
+    recorded = recorder.post(f"{base_url}/search", json=payload, headers={"Authorization": "Bearer tvly-secret"})
+    assert recorded.status_code == 200 and stats.tavily == 1
+
+    files = list((tmp_path / "tavily").glob("*.json"))
+    assert len(files) == 1
+    saved = files[0].read_text(encoding="utf-8")
+    # 인증 헤더와 본문의 api_key는 녹화 파일에 남지 않음
+    assert "tvly-secret" not in saved
+    assert json.loads(saved)["request"]["body"] == '{"query": "반도체", "max_results": 3}'
+    assert json.loads(saved)["response"]["headers"] == {"content-type": "application/json"}
+
+    # 다른 호스트, 다른 키로도 같은 응답을 재생하며 서버에는 요청하지 않음
+    player = configure_session_pool(requests.Session(), 2, "replay", store)
+    replayed = player.post("https://api.tavily.com/search", json={**payload, "api_key": "tvly-other"})
+    assert replayed.json() == recorded.json() and stats.tavily == 1
+
+    with pytest.raises(FixtureNotFoundError):
+        player.post("https://api.tavily.com/search", json={**payload, "query": "녹화 안 한 검색어"})
+
+def test_httpx_transport_records_then_replays_offline(tmp_path, stub):
+    base_url, stats = stub
+    store = FixtureStore(str(tmp_path), "gemini")
+    payload = {"contents": [{"parts": [{"text": "[뉴스 제목]\n- 반도체 수출 증가"}]}]}
+
+    with create_httpx_client(2, 5, 30, "record", store) as recorder:
+        recorded = recorder.post(f"{base_url}{GEMINI_PATH}", json=payload, headers={"x-goog-api-key": "secret"})
+    assert recorded.status_code == 200 and stats.gemini == 1
+
+    with create_httpx_client(2, 5, 30, "replay", store) as player:
+        replayed = player.post(f"https://generativelanguage.googleapis.com{GEMINI_PATH}", json=payload)
+        assert replayed.json() == recorded.json() and stats.gemini == 1
+        with pytest.raises(FixtureNotFoundError):
+            player.post(f"https://generativelanguage.googleapis.com{GEMINI_PATH}", json={"contents": []})
+
+def test_stub_server_serves_recorded_fixtures_first(tmp_path):
+    store = FixtureStore(str(tmp_path), "tavily")
+    body = json.dumps({"query": "반도체"}).encode("utf-8")
+    store.save(fixture_key("POST", "/search", body), "POST", "/search", body, 200,
+               {"content-type": "application/json"}, json.dumps({"results": [], "query": "녹화본"}).encode("utf-8"))
+
+    server, stats = create_stub_server(config=StubConfig(fixture_dir=str(tmp_path)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/search"
+        assert httpx.post(url, content=body).json()["query"] == "녹화본"
+        assert httpx.post(url, json={"query": "합성"}).json()["query"] == "합성"
+        assert stats.replayed == 1 and stats.tavily == 2
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,236 @@
+import os
+import sys
+import time
+import subprocess
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from conftest import make_result
+from repositories import search_repository
+from repositories.search_repository import SearchRepository
+from utils.file_lock import FileLock
+
+def _slow_commits(monkeypatch, delay: float, calls: list):
+    commit = SearchRepository._commit_batch
+    def slow_commit(self, results):
+        calls.append(len(results))
+        time.sleep(delay)
+        commit(self, results)
+    monkeypatch.setattr(SearchRepository, "_commit_batch", slow_commit)
+
+def test_concurrent_saves_are_group_committed(tmp_path, monkeypatch, article_factory):
+    calls = []
+    _slow_commits(monkeypatch, 0.05, calls)
+    repository = SearchRepository(str(tmp_path / "search_history.csv"))
+    results = [make_result(f"키워드{i}-202610010900", [article_factory(i), article_factory(100 + i)]) for i in range(12)]
+
+    outcomes = []
+    threads = [threading.Thread(target=lambda r=result: outcomes.append(repository.save(r))) for result in results]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert outcomes == [True] * len(results)
+    # 첫 커밋이 진행되는 동안 도착한 요청들은 다음 커밋 하나로 묶임
+    assert sum(calls) == len(results) and len(calls) < len(results)
+    assert sorted(repository.get_all_keys()) == sorted(result.search_key for result in results)
+    for result in results:
+        assert [a.url for a in repository.find_by_key(result.search_key).articles] == [a.url for a in result.articles]
+
+def test_save_past_write_timeout_cancels_queued_request(tmp_path, monkeypatch, article_factory):
+    _slow_commits(monkeypatch, 0.5, [])
+    monkeypatch.setattr(search_repository, "WRITE_TIMEOUT", 0.1)
+    repository = SearchRepository(str(tmp_path / "search_history.csv"))
+    first = make_result("반도체-202610010900", [article_factory(1)])
+    queued = make_result("환율-202610010900", [article_factory(2)])
+
+    outcomes = {}
+    writer = threading.Thread(target=lambda: outcomes.update(first=repository.save(first)))
+    writer.start()
+    time.sleep(0.05)
+    # 앞 그룹이 기록되는 동안 큐에서 기다리던 요청은 취소되고 실패로 반환
+    assert repository.save(queued) is False
+    writer.join()
+
+    # 이미 기록 중이던 요청은 취소할 수 없으므로 끝까지 기다려 성공으로 반환
+    assert outcomes == {"first": True}
+    time.sleep(0.1)
+    assert repository.get_all_keys() == ["반도체-202610010900"]
+
+def test_save_fails_when_the_file_lock_times_out(tmp_path, monkeypatch, article_factory):
+    monkeypatch.setattr(search_repository, "LOCK_TIMEOUT", 0.1)
+    repository = SearchRepository(str(tmp_path / "search_history.csv"))
+    # 다른 프로세스가 잠금을 잡고 있는 상황 (잠금은 열린 파일 단위라 같은 프로세스에서도 재현됨)
+    with FileLock(f"{repository.csv_path}.lock"):
+        assert repository.save(make_result("반도체-202610010900", [article_factory(1)])) is False
+    assert not os.path.exists(repository.csv_path)
+    assert repository.get_all_keys() == []
+
+    assert repository.save(make_result("반도체-202610010900", [article_factory(1)])) is True
+    assert repository.get_all_keys() == ["반도체-202610010900"]
+
+def _fields(result):
+    return (result.search_key, result.keyword, result.search_time, result.ai_summary,
+            [(a.title, a.url, a.snippet, a.pub_date) for a in result.articles])
+
+def _state(repository: SearchRepository):
+    keys = repository.get_all_keys()
+    return keys, [_fields(repository.find_by_key(key)) for key in keys], len(repository.load())
+
+def _legacy_csv(path, article_factory):
+    """append 방식 이전의 전체 재작성으로 저장된 CSV (ai_keywords 컬럼 없음)"""
+    legacy = make_result("AI-202609300900", [article_factory(1), article_factory(2, pub_date=None)],
+                         search_time=datetime(2026, 9, 30, 9, 0))
+    legacy.to_dataframe().drop(columns=["ai_keywords"]).to_csv(path, index=False, encoding="utf-8-sig")
+    return legacy
+
+def test_appended_saves_round_trip_through_load_find_and_keys(tmp_path, article_factory):
+    csv_path = str(tmp_path / "search_history.csv")
+    legacy = _legacy_csv(csv_path, article_factory)
+    repository = SearchRepository(csv_path)
+    saved = [
+        make_result("반도체-202610010900", [article_factory(3, snippet="", pub_date=None), article_factory(4)],
+                    search_time=datetime(2026, 10, 1, 9, 0)),
+        make_result("환율-202610011000", [article_factory(5)], search_time=datetime(2026, 10, 1, 10, 0)),
+    ]
+    for result in saved:
+        assert repository.save(result)
+
+    expected = [_fields(result) for result in [saved[1], saved[0], legacy]]
+    assert _state(repository) == (["환율-202610011000", "반도체-202610010900", "AI-202609300900"], expected, 5)
+    # 새 인스턴스(다른 세션)에서도 같은 결과
+    assert _state(SearchRepository(csv_path)) == _state(repository)
+    assert "ai_keywords" in repository.load().columns
+
+def test_compaction_keeps_stored_values_and_drops_duplicate_rows(tmp_path, article_factory):
+    csv_path = str(tmp_path / "search_history.csv")
+    repository = SearchRepository(csv_path)
+    # 숫자처럼 보이는 문자열도 저장된 그대로 다시 써야 함
+    result = make_result("007-202610010900", [article_factory(3, snippet="1e3", pub_date=None), article_factory(4)],
+                         keyword="007", search_time=datetime(2026, 10, 1, 9, 0))
+    repository.save(result)
+    before = _state(repository)
+    repository.save(result)  # 완전히 같은 행이 한 번 더 추가됨
+
+    report = repository.compact()
+
+    assert (report.searches_removed, report.rows_before, report.rows_after) == (0, 4, 2)
+    assert report.bytes_after < report.bytes_before
+    assert _state(repository) == before
+    raw = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    assert raw["article_index"].tolist() == ["1", "2"]
+    assert raw["keyword"].tolist() == ["007", "007"]
+    assert raw["snippet"].tolist()[0] == "1e3"
+    assert "nan" not in raw[["snippet", "pub_date"]].to_numpy()
+
+def _urls(*numbers):
+    return {f"https://news.example.com/articles/{i}" for i in numbers}
+
+def _save_keywords(repository, article_factory):
+    repository.save(make_result("반도체-202610010900", [article_factory(1), article_factory(2)]))
+    repository.save(make_result("환율-202610011000", [article_factory(3)]))
+    # 키워드가 접두어만 같은 검색은 포함하지 않음
+    repository.save(make_result("반도체 수출-202610011100", [article_factory(4)]))
+    repository.save(make_result("반도체-202610011200", [article_factory(5)]))
+
+def test_article_urls_read_only_rows_of_that_keyword(tmp_path, article_factory, monkeypatch):
+    repository = SearchRepository(str(tmp_path / "search_history.csv"))
+    _save_keywords(repository, article_factory)
+    read_rows = []
+    read_ranges = SearchRepository._read_ranges
+
+    def counting_read_ranges(self, ranges, columns=None):
+        df = read_ranges(self, ranges, columns)
+        read_rows.append(len(df))
+        return df
+
+    def full_scan(*args, **kwargs):
+        raise AssertionError("전체 기록을 스캔하면 안 됨")
+
+    monkeypatch.setattr(SearchRepository, "_read_ranges", counting_read_ranges)
+    monkeypatch.setattr(SearchRepository, "iter_history", full_scan)
+
+    assert repository.get_article_urls("반도체") == _urls(1, 2, 5)
+    assert read_rows == [3]
+    assert repository.get_article_urls("금리") == set()
+
+def test_article_urls_fall_back_to_scan_without_manifest(tmp_path, article_factory, monkeypatch):
+    repository = SearchRepository(str(tmp_path / "search_history.csv"))
+    _save_keywords(repository, article_factory)
+
+    def broken(keyword):
+        raise OSError("매니페스트를 읽을 수 없음")
+
+    monkeypatch.setattr(repository.manifest, "get_keyword_ranges", broken)
+    assert repository.get_article_urls("반도체") == _urls(1, 2, 5)
+
+def test_snapshot_is_reused_until_file_changes(tmp_path, article_factory):
+    repository = SearchRepository(str(tmp_path / "search_history.csv"))
+    repository.save(make_result("반도체-202610010900", [article_factory(1)]))
+
+    snapshot = repository._snapshot()
+    # 파일이 그대로면 다시 파싱하지 않고, 다른 인스턴스도 같은 스냅샷을 공유
+    assert repository._snapshot() is snapshot
+    assert SearchRepository(repository.csv_path)._snapshot() is snapshot
+    # load()는 복사본이므로 수정해도 공유 스냅샷에 영향 없음
+    df = repository.load()
+    df.loc[:, "title"] = "변경"
+    assert list(repository._snapshot()["title"]) == ["기사 제목 1"]
+
+def test_snapshot_is_invalidated_by_size_or_mtime_change(tmp_path, article_factory):
+    repository = SearchRepository(str(tmp_path / "search_history.csv"))
+    repository.save(make_result("반도체-202610010900", [article_factory(1)]))
+    snapshot = repository._snapshot()
+
+    # 캐시를 거치지 않고 같은 길이로 내용을 바꾸고 mtime만 다르게 함 (크기는 같음)
+    with open(repository.csv_path, "rb") as f:
+        data = f.read()
+    stat = os.stat(repository.csv_path)
+    with open(repository.csv_path, "wb") as f:
+        f.write(data.replace("기사 제목 1".encode("utf-8"), "기사 제목 9".encode("utf-8")))
+    os.utime(repository.csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert os.path.getsize(repository.csv_path) == stat.st_size
+
+    refreshed = repository._snapshot()
+    assert refreshed is not snapshot
+    assert list(refreshed["title"]) == ["기사 제목 9"]
+
+    # mtime은 같고 크기만 달라져도 다시 읽음
+    stat = os.stat(repository.csv_path)
+    with open(repository.csv_path, "ab") as f:
+        f.write(b"\n")
+    os.utime(repository.csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert repository._snapshot() is not refreshed
+
+def test_write_from_another_process_invalidates_snapshot(tmp_path, article_factory):
+    repository = SearchRepository(str(tmp_path / "search_history.csv"))
+    repository.save(make_result("반도체-202610010900", [article_factory(1)]))
+    snapshot = repository._snapshot()
+    assert len(snapshot) == 1
+
+    # 다른 프로세스(같은 설정)가 같은 CSV에 검색을 추가 저장
+    script = (
+        "import sys\n"
+        "from datetime import datetime\n"
+        "from domain.news_article import NewsArticle\n"
+        "from domain.search_result import SearchResult\n"
+        "from repositories.search_repository import SearchRepository\n"
+        "article = NewsArticle(title='다른 프로세스 기사', url='https://news.example.com/articles/2',\n"
+        "                      snippet='본문', pub_date='2026-10-01T10:00:00+00:00')\n"
+        "result = SearchResult(search_key='환율-202610011000', search_time=datetime(2026, 10, 1, 10, 0),\n"
+        "                      keyword='환율', articles=[article], ai_summary='요약', ai_keywords='키워드')\n"
+        "sys.exit(0 if SearchRepository(sys.argv[1]).save(result) else 1)\n"
+    )
+    project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", script, repository.csv_path], cwd=project_dir, env=os.environ.copy(),
+                   check=True, timeout=60)
+
+    # 이 프로세스는 _invalidate_snapshot()을 호출하지 않았지만 mtime/크기 변화로 새 데이터를 읽음
+    df = repository.load()
+    assert repository._snapshot() is not snapshot
+    assert sorted(df["search_key"]) == ["반도체-202610010900", "환율-202610011000"]
+    assert repository.get_all_keys() == ["환율-202610011000", "반도체-202610010900"]
+    assert [a.title for a in repository.find_by_key("환율-202610011000").articles] == ["다른 프로세스 기사"]
@@ -0,0 +1,71 @@
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+import pytest
+from utils.date_parser import clean_date_text, parse_datetimes, to_iso
+
+UTC_9AM = pd.Timestamp("2026-10-01 09:00:00", tz="UTC")
+
+@pytest.mark.parametrize("value", [
+    "2026-10-01T09:00:00Z",
+    "2026-10-01T09:00:00+00:00",
+    "2026-10-01T18:00:00+09:00",
+    "2026-10-01T05:00:00.000-04:00",
+    "2026-10-01 09:00:00",  # 시간대가 없으면 UTC로 간주
+    "Thu, 01 Oct 2026 09:00:00 GMT",
+    "Thu, 01 Oct 2026 18:00:00 +0900",
+    "  Thu, 01 Oct 2026 09:00:00 GMT  ",
+])
+def test_parses_iso_and_rfc822_to_utc(value):
+    assert parse_datetimes([value])[0] == UTC_9AM
+
+def test_mixed_formats_and_timezones_in_one_batch():
+    values = ["Thu, 01 Oct 2026 18:00:00 +0900", "2026-10-01T09:00:00Z", "2026-10-01T05:00:00-04:00",
+              "Thu, 01 Oct 2026 09:00:00 GMT", "2026-10-01"]
+    parsed = parse_datetimes(values)
+
+    assert str(parsed.dtype).startswith("datetime64") and str(parsed.dt.tz) == "UTC"
+    assert parsed.tolist() == [UTC_9AM] * 4 + [pd.Timestamp("2026-10-01", tz="UTC")]
+
+def test_offset_of_earlier_value_does_not_leak_into_naive_values():
+    parsed = parse_datetimes(["2026-10-01T18:00:00+09:00", "2026-10-01T09:00:00", "2026-10-01 09:00:00"])
+    assert parsed.tolist() == [UTC_9AM] * 3
+
+@pytest.mark.parametrize("value", [None, np.nan, "", "   ", "nan", "NaN", "None", "NaT", "null",
+                                   "최신", "not a date", "2026-13-45T99:00:00Z"])
+def test_empty_and_garbage_values_become_nat(value):
+    parsed = parse_datetimes(["2026-10-01T09:00:00Z", value])
+    assert parsed[0] == UTC_9AM
+    assert pd.isna(parsed[1])
+
+def test_empty_input_returns_empty_series():
+    assert parse_datetimes([]).empty
+
+def _parse_one(value):
+    """변경 전처럼 값마다 따로 해석한 결과 (해석할 수 없으면 NaT)"""
+    text = clean_date_text(value)
+    if text is None:
+        return pd.NaT
+    try:
+        return pd.to_datetime(text, utc=True)
+    except (ValueError, OverflowError):
+        return pd.NaT
+
+def test_batch_parsing_agrees_with_per_row_parsing():
+    values = [
+        "2026-10-01T09:00:00Z", "2026-09-30T23:59:59.123456+09:00", "2026-10-01 09:00:00", "2026-10-01",
+        "Wed, 30 Sep 2026 23:00:00 GMT", "Mon, 12 Oct 2026 07:15:00 -0700", "Tue, 1 Sep 2026 00:00:00 +0000",
+        "2026/10/01 09:00", "October 1, 2026", None, "", "nan", "garbage",
+    ] * 3
+    batch = parse_datetimes(values)
+    assert len(batch) == len(values)
+    for value, parsed in zip(values, batch):
+        expected = _parse_one(value)
+        assert (pd.isna(parsed) and pd.isna(expected)) or parsed == expected, value
+
+def test_clean_date_text_and_to_iso():
+    assert clean_date_text(" 2026-10-01 ") == "2026-10-01"
+    assert [clean_date_text(v) for v in (None, np.nan, "nan", " ")] == [None, None, None, None]
+    assert to_iso(UTC_9AM) == "2026-10-01T09:00:00+00:00"
+    assert to_iso(datetime(2026, 10, 1, 18, tzinfo=timezone.utc)) == "2026-10-01T18:00:00+00:00"
+    assert to_iso(pd.NaT) is None and to_iso(None) is None
@@ -0,0 +1,91 @@
+import gzip
+import io
+import functools
+from datetime import datetime, timezone
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+from conftest import make_result
+from repositories.base_repository import HISTORY_COLUMNS
+from repositories.history_exporter import EXPORT_FORMATS, export_history
+from repositories.search_repository import SearchRepository
+from repositories.sqlite_search_repository import SqliteSearchRepository
+
+def _read_back(output, fmt: str) -> pd.DataFrame:
+    """내보낸 파일을 다시 읽어 비교하기 쉬운 형태(빈 값은 None)로 반환"""
+    data = output.read()
+    if fmt == "parquet":
+        df = pq.read_table(io.BytesIO(data)).to_pandas()
+    elif fmt == "jsonl":
+        df = pd.read_json(io.BytesIO(data), lines=True, dtype=False) if data else pd.DataFrame(columns=HISTORY_COLUMNS)
+    else:
+        if fmt == "csv.gz":
+            data = gzip.decompress(data)
+        df = pd.read_csv(io.BytesIO(data), encoding="utf-8-sig", dtype=str, keep_default_na=False)
+        df["article_index"] = df["article_index"].astype(int)
+    assert list(df.columns) == HISTORY_COLUMNS
+    return df.astype(object).where(df.notna() & (df != ""), None)
+
+def _rows(df: pd.DataFrame):
+    return [(row.search_key, int(row.article_index), row.url, row.pub_date, row.ai_keywords)
+            for row in df.itertuples()]
+
+@pytest.fixture(params=["csv", "sqlite"])
+def repository(request, tmp_path, article_factory, monkeypatch):
+    if request.param == "csv":
+        repository = SearchRepository(str(tmp_path / "search_history.csv"))
+    else:
+        repository = SqliteSearchRepository(str(tmp_path / "history.db"))
+    repository.save(make_result("반도체-202609200900", [
+        article_factory(1, pub_date="2026-09-19T22:00:00+00:00"),
+        article_factory(2, pub_date=None),
+    ], search_time=datetime(2026, 9, 20, 9, 0)))
+    repository.save(make_result("환율-202609250900", [article_factory(3, pub_date="2026-09-25T08:00:00+09:00")],
+                                search_time=datetime(2026, 9, 25, 9, 0)))
+    repository.save(make_result("반도체 수출-202610010900", [
+        article_factory(4, pub_date="Thu, 01 Oct 2026 08:00:00 +0900"),
+        article_factory(5),
+    ], search_time=datetime(2026, 10, 1, 9, 0)))
+    # 조각이 여러 개여도 헤더/스키마가 한 번만 기록되는지 확인하도록 작은 조각으로 읽음
+    monkeypatch.setattr(repository, "iter_history", functools.partial(repository.iter_history, chunk_size=2))
+    return repository
+
+ALL_ROWS = [
+    ("반도체-202609200900", 1, "https://news.example.com/articles/1", "2026-09-19T22:00:00+00:00", "키워드"),
+    ("반도체-202609200900", 2, "https://news.example.com/articles/2", None, "키워드"),
+    ("환율-202609250900", 1, "https://news.example.com/articles/3", "2026-09-25T08:00:00+09:00", "키워드"),
+    ("반도체 수출-202610010900", 1, "https://news.example.com/articles/4", "Thu, 01 Oct 2026 08:00:00 +0900", "키워드"),
+    ("반도체 수출-202610010900", 2, "https://news.example.com/articles/5", "2026-10-01T09:00:00+00:00", "키워드"),
+]
+
+@pytest.mark.parametrize("fmt", list(EXPORT_FORMATS))
+def test_export_round_trips_every_row(repository, fmt):
+    df = _read_back(export_history(repository, fmt), fmt)
+
+    assert sorted(_rows(df)) == sorted(ALL_ROWS)
+    assert set(df["title"]) == {f"기사 제목 {i}" for i in range(1, 6)}
+    assert set(df["ai_summary"]) == {"요약"}
+
+@pytest.mark.parametrize("fmt", list(EXPORT_FORMATS))
+def test_export_applies_keyword_and_search_time_filters(repository, fmt):
+    df = _read_back(export_history(repository, fmt, keyword="반도체", since=datetime(2026, 9, 21)), fmt)
+    assert sorted(_rows(df)) == sorted(ALL_ROWS[3:])
+
+    df = _read_back(export_history(repository, fmt, until=datetime(2026, 9, 25, 9, 0)), fmt)
+    assert sorted(_rows(df)) == sorted(ALL_ROWS[:2])
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+def test_export_filters_by_publish_time_across_date_formats(repository, fmt):
+    # 발행 시각은 UTC로 비교: 9/24 23:00Z(환율), 9/30 23:00Z(RFC 822), 10/1 09:00Z / 발행일 없는 기사는 제외
+    df = _read_back(export_history(repository, fmt, published_since=datetime(2026, 9, 24, tzinfo=timezone.utc),
+                                   published_until=datetime(2026, 10, 1, tzinfo=timezone.utc)), fmt)
+    assert sorted(_rows(df)) == sorted([ALL_ROWS[2], ALL_ROWS[3]])
+
+@pytest.mark.parametrize("fmt", list(EXPORT_FORMATS))
+def test_export_without_matches_keeps_schema(repository, fmt):
+    df = _read_back(export_history(repository, fmt, keyword="존재하지 않는 키워드"), fmt)
+    assert df.empty
+
+def test_export_rejects_unknown_format(repository):
+    with pytest.raises(ValueError):
+        export_history(repository, "xlsx")
@@ -0,0 +1,79 @@
+import os
+from datetime import datetime
+import pandas as pd
+from conftest import make_result
+from repositories.search_repository import SearchRepository
+
+# 따옴표, 쉼표, 줄바꿈이 섞인 본문 (CSV에서 여러 줄에 걸친 레코드가 됨)
+TRICKY_SNIPPET = '첫 줄, "인용"\n둘째 줄\r\n"""셋째" 줄'
+
+def _saved_repository(tmp_path, article_factory) -> SearchRepository:
+    repository = SearchRepository(str(tmp_path / "search_history.csv"))
+    repository.save(make_result("반도체-202610010900", [article_factory(1, snippet=TRICKY_SNIPPET), article_factory(2)],
+                                search_time=datetime(2026, 10, 1, 9, 0)))
+    repository.save(make_result("환율-202610011000", [article_factory(3, snippet=TRICKY_SNIPPET)],
+                                search_time=datetime(2026, 10, 1, 10, 0)))
+    repository.save(make_result("반도체 수출-202610011100", [article_factory(4)], search_time=datetime(2026, 10, 1, 11, 0)))
+    return repository
+
+def _listing(repository: SearchRepository, **kwargs):
+    return [(entry.search_key, entry.article_count) for entry in repository.list_searches(**kwargs)]
+
+def test_listing_comes_from_manifest_without_parsing_csv(tmp_path, monkeypatch, article_factory):
+    repository = _saved_repository(tmp_path, article_factory)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("목록 조회가 CSV를 파싱함")
+    monkeypatch.setattr(pd, "read_csv", fail)
+    fresh = SearchRepository(repository.csv_path)
+
+    assert _listing(fresh) == [("반도체 수출-202610011100", 1), ("환율-202610011000", 1), ("반도체-202610010900", 2)]
+    assert _listing(fresh, offset=1, limit=1) == [("환율-202610011000", 1)]
+    assert _listing(fresh, keyword_prefix="반도") == [("반도체 수출-202610011100", 1), ("반도체-202610010900", 2)]
+
+def test_manifest_is_rebuilt_by_quote_aware_scan(tmp_path, article_factory):
+    repository = _saved_repository(tmp_path, article_factory)
+    expected = _listing(repository)
+    os.remove(repository.manifest.manifest_path)
+
+    assert _listing(SearchRepository(repository.csv_path)) == expected
+
+def test_manifest_follows_csv_changed_outside_the_app(tmp_path, article_factory):
+    repository = _saved_repository(tmp_path, article_factory)
+    # 다른 도구가 헤더 없이 행을 덧붙인 경우
+    extra = make_result("금리-202610011200", [article_factory(5, snippet=TRICKY_SNIPPET)], search_time=datetime(2026, 10, 1, 12, 0))
+    extra.to_dataframe().reindex(columns=repository._read_header()).to_csv(repository.csv_path, mode="a", header=False, index=False)
+
+    assert _listing(SearchRepository(repository.csv_path))[0] == ("금리-202610011200", 1)
+
+def test_find_by_key_reads_only_its_byte_ranges(tmp_path, article_factory):
+    repository = _saved_repository(tmp_path, article_factory)
+    # 같은 키를 나중에 다시 저장하면 떨어진 두 구간을 함께 읽음
+    repository.save(make_result("반도체-202610010900", [article_factory(6, snippet=TRICKY_SNIPPET)],
+                                search_time=datetime(2026, 10, 1, 9, 0)))
+    ranges = repository.manifest.get_ranges("반도체-202610010900")
+    assert len(ranges) == 2
+
+    with open(repository.csv_path, "rb") as f:
+        data = f.read()
+    for start, length in ranges:
+        record = data[start:start + length]
+        assert record.startswith("반도체-202610010900,".encode("utf-8")) and record.endswith(b"\n")
+
+    result = repository.find_by_key("반도체-202610010900")
+    assert {(a.url, a.snippet) for a in result.articles} == {
+        ("https://news.example.com/articles/1", TRICKY_SNIPPET),
+        ("https://news.example.com/articles/2", "기사 2의 본문 스니펫"),
+        ("https://news.example.com/articles/6", TRICKY_SNIPPET),
+    }
+    assert repository.find_by_key("없는 키-202610010000") is None
+
+def test_find_by_key_after_rebuild_matches_full_parse(tmp_path, article_factory):
+    repository = _saved_repository(tmp_path, article_factory)
+    os.remove(repository.manifest.manifest_path)
+    fresh = SearchRepository(repository.csv_path)
+
+    full = pd.read_csv(repository.csv_path)
+    for search_key in full["search_key"].unique():
+        expected = full[full["search_key"] == search_key]
+        assert [a.url for a in fresh.find_by_key(search_key).articles] == expected["url"].tolist()
@@ -0,0 +1,46 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import requests
+from utils.http_client import configure_session_pool, create_httpx_client
+from utils.stub_server import create_stub_server, StubConfig
+
+POOL_SIZE = 4
+REQUESTS = 40
+
+@pytest.fixture
+def stub_server():
+    # 지연을 넣어 동시 요청이 실제로 겹치게 함
+    server, stats = create_stub_server(config=StubConfig(latency=0.01))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", stats
+    server.shutdown()
+    server.server_close()
+
+def _fan_out(post, base_url: str):
+    with ThreadPoolExecutor(max_workers=POOL_SIZE) as executor:
+        responses = list(executor.map(
+            lambda i: post(f"{base_url}/search", json={"query": f"검색어 {i}", "max_results": 3}), range(REQUESTS)
+        ))
+    assert all(response.status_code == 200 for response in responses)
+
+def test_pooled_session_reuses_connections(stub_server):
+    base_url, stats = stub_server
+    session = configure_session_pool(requests.Session(), POOL_SIZE)
+    _fan_out(session.post, base_url)
+    assert stats.tavily == REQUESTS
+    assert stats.connections <= POOL_SIZE
+
+def test_unpooled_requests_open_a_connection_per_request(stub_server):
+    # 비교 기준: 세션 없이 호출하면 요청마다 새 연결
+    base_url, stats = stub_server
+    _fan_out(requests.post, base_url)
+    assert stats.connections == REQUESTS
+
+def test_httpx_client_reuses_connections(stub_server):
+    base_url, stats = stub_server
+    with create_httpx_client(POOL_SIZE, timeout=5, keepalive_seconds=30) as client:
+        _fan_out(client.post, base_url)
+    assert stats.tavily == REQUESTS
+    assert stats.connections <= POOL_SIZE
@@ -0,0 +1,42 @@
+import numpy as np
+from domain.news_article import NewsArticle
+from services.near_duplicate import collapse_near_duplicates, hamming_matrix, simhash, DEFAULT_MAX_DISTANCE
+
+BODY = "삼성전자가 3분기 반도체 부문에서 시장 예상을 웃도는 영업이익을 기록했다고 31일 밝혔다. 메모리 가격 회복과 고대역폭메모리 판매 증가가 실적을 이끌었다."
+
+def _article(i: int, title: str, snippet: str, source: str = "") -> NewsArticle:
+    return NewsArticle(title=title, url=f"https://news{i}.example.com/{i}", snippet=snippet, source=source or f"news{i}")
+
+def test_simhash_is_stable_and_ignores_spacing_and_punctuation():
+    fingerprints = simhash([BODY, BODY.replace(" ", "  ").replace(".", "!"), BODY.upper(), ""])
+    assert fingerprints.dtype == np.uint64
+    assert fingerprints[0] == fingerprints[1] == simhash([BODY])[0]
+    assert fingerprints[3] == 0
+
+def test_small_edit_stays_close_and_different_stories_stay_far():
+    # 매체마다 날짜 표기만 다른 같은 통신사 기사 (collapse_near_duplicates처럼 제목+스니펫으로 계산)
+    title = "삼성전자 3분기 반도체 호실적 "
+    edited = title + BODY.replace("31일", "1일")
+    other = "환율 하락 마감 원·달러 환율이 미국 고용 지표 발표 이후 하락 마감했다. 외국인 투자자의 순매수가 이어지며 코스피도 상승했다."
+    distances = hamming_matrix(simhash([title + BODY, edited, other]))
+    assert distances[0, 0] == 0 and (distances == distances.T).all()
+    assert distances[0, 1] <= DEFAULT_MAX_DISTANCE
+    assert distances[0, 2] > DEFAULT_MAX_DISTANCE
+
+def test_collapse_keeps_first_article_and_records_other_sources():
+    articles = [
+        _article(1, "삼성전자 3분기 반도체 호실적", BODY, "연합뉴스"),
+        _article(2, "환율 하락 마감", "원·달러 환율이 미국 고용 지표 발표 이후 하락 마감했다."),
+        _article(3, "삼성전자 3분기 반도체 호실적", BODY.replace("31일", "1일"), "한국경제"),
+        _article(4, "삼성전자, 3분기 반도체 호실적", BODY, "매일경제"),
+    ]
+    collapsed = collapse_near_duplicates(articles)
+
+    assert [article.url for article in collapsed] == [articles[0].url, articles[1].url]
+    assert collapsed[0].alternative_sources == [("한국경제", articles[2].url), ("매일경제", articles[3].url)]
+    # 원본 기사 객체는 바꾸지 않음
+    assert articles[0].alternative_sources == []
+
+def test_collapse_can_be_disabled_by_negative_distance():
+    articles = [_article(1, "같은 제목", BODY), _article(2, "같은 제목", BODY)]
+    assert collapse_near_duplicates(articles, max_distance=-1) == articles
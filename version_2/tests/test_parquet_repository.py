@@ -0,0 +1,105 @@
+from datetime import datetime
+import pandas as pd
+from conftest import make_result
+from domain.retention_policy import RetentionPolicy
+from repositories.base_repository import HISTORY_COLUMNS
+from repositories.parquet_search_repository import ParquetSearchRepository
+from repositories.search_index import SearchIndex
+
+def _legacy_row(search_key, search_time, article_index, i):
+    return {
+        "search_key": search_key, "search_time": search_time, "keyword": search_key.rsplit("-", 1)[0],
+        "article_index": article_index, "title": f"기사 제목 {i}", "url": f"https://news.example.com/articles/{i}",
+        "snippet": f"기사 {i}의 본문", "pub_date": "", "ai_summary": "요약", "ai_keywords": "키워드"
+    }
+
+def test_migrate_from_csv_repairs_malformed_legacy_rows(tmp_path):
+    csv_path = tmp_path / "search_history.csv"
+    pd.DataFrame([
+        _legacy_row("반도체-202609010900", "2026-09-01 09:00:00", 1, 1),
+        _legacy_row("반도체-202609010900", "2026-09-01 09:00:00", "", 2),
+        _legacy_row("환율-202608151200", "not-a-time", 1, 3),
+        _legacy_row("환율-202608151200", "not-a-time", 2, 4),
+        {**_legacy_row("x", "2026-09-01 09:00:00", 1, 5), "search_key": None},
+    ], columns=HISTORY_COLUMNS).to_csv(csv_path, index=False)
+
+    repository = ParquetSearchRepository(str(tmp_path / "parquet"), legacy_csv_path=str(csv_path))
+
+    assert sorted(repository.get_all_keys()) == ["반도체-202609010900", "환율-202608151200"]
+    semiconductor = repository.find_by_key("반도체-202609010900")
+    assert [a.url for a in semiconductor.articles] == [
+        "https://news.example.com/articles/1", "https://news.example.com/articles/2"
+    ]
+    # 해석할 수 없는 검색 시간은 search_key의 시각으로 대체
+    assert repository.find_by_key("환율-202608151200").search_time == datetime(2026, 8, 15, 12, 0)
+    assert (tmp_path / "parquet" / "month=2026-08").is_dir()
+    # 이관 표시 파일이 남아 다시 이관하지 않음
+    assert repository.migrate_from_csv(str(csv_path)) == 0
+
+def test_drop_partitions_before_removes_dropped_searches_from_index(tmp_path, article_factory):
+    repository = ParquetSearchRepository(str(tmp_path / "parquet"))
+    repository.attach_index(SearchIndex(str(tmp_path / "index.db")))
+    repository.save(make_result("반도체-202608010900", [article_factory(1, title="반도체 수출 증가")],
+                                search_time=datetime(2026, 8, 1, 9, 0)))
+    repository.save(make_result("반도체-202610010900", [article_factory(2, title="반도체 가격 상승")],
+                                search_time=datetime(2026, 10, 1, 9, 0)))
+    assert repository.search_index.indexed_keys() == {"반도체-202608010900", "반도체-202610010900"}
+
+    assert repository.drop_partitions_before(datetime(2026, 9, 1)) == 1
+
+    assert repository.get_all_keys() == ["반도체-202610010900"]
+    assert repository.search_index.indexed_keys() == {"반도체-202610010900"}
+    assert [entry.search_key for entry, _ in repository.search_index.search("반도체")] == ["반도체-202610010900"]
+
+def test_save_and_find_round_trip_across_partitions(tmp_path, article_factory):
+    repository = ParquetSearchRepository(str(tmp_path / "parquet"), partition="day")
+    saved = [
+        make_result("반도체-202609300900", [article_factory(1), article_factory(2, snippet="", pub_date=None)],
+                    search_time=datetime(2026, 9, 30, 9, 0)),
+        make_result("환율-202610010900", [article_factory(3)], search_time=datetime(2026, 10, 1, 9, 0)),
+    ]
+    for result in saved:
+        assert repository.save(result)
+
+    assert sorted(path.name for path in (tmp_path / "parquet").iterdir()) == ["day=2026-09-30", "day=2026-10-01"]
+    assert [(e.search_key, e.article_count) for e in repository.list_searches()] == [
+        ("환율-202610010900", 1), ("반도체-202609300900", 2)
+    ]
+    for result in saved:
+        restored = repository.find_by_key(result.search_key)
+        assert (restored.keyword, restored.search_time, restored.ai_summary) == (result.keyword, result.search_time, result.ai_summary)
+        assert [(a.title, a.url, a.snippet or "", a.pub_date) for a in restored.articles] == [
+            (a.title, a.url, a.snippet or "", a.pub_date) for a in result.articles
+        ]
+    assert repository.find_by_key("없는 키-202610010000") is None
+
+def test_article_urls_read_only_files_added_since_last_call(tmp_path, article_factory, monkeypatch):
+    repository = ParquetSearchRepository(str(tmp_path / "parquet"))
+    repository.save(make_result("반도체-202609010900", [article_factory(1)], search_time=datetime(2026, 9, 1, 9, 0)))
+    repository.save(make_result("반도체-202610010900", [article_factory(2)]))
+    repository.save(make_result("환율-202610011000", [article_factory(3)], search_time=datetime(2026, 10, 1, 10, 0)))
+    read_files = []
+    read = ParquetSearchRepository._read
+
+    def counting_read(self, files, columns=None, filter_expr=None):
+        read_files.extend(files)
+        return read(self, files, columns, filter_expr)
+
+    monkeypatch.setattr(ParquetSearchRepository, "_read", counting_read)
+    urls = {f"https://news.example.com/articles/{i}" for i in (1, 2)}
+
+    assert repository.get_article_urls("반도체") == urls
+    assert len(read_files) == 3
+    read_files.clear()
+    assert repository.get_article_urls("반도체") == urls
+    assert read_files == []
+
+    repository.save(make_result("반도체-202610011100", [article_factory(4)], search_time=datetime(2026, 10, 1, 11, 0)))
+    read_files.clear()
+    urls.add("https://news.example.com/articles/4")
+    assert repository.get_article_urls("반도체") == urls
+    assert len(read_files) == 1
+
+    # 정리로 파일이 합쳐지거나 검색이 삭제되어도 현재 파일 기준으로 계산
+    repository.compact(RetentionPolicy(max_searches=2))
+    assert repository.get_article_urls("반도체") == {"https://news.example.com/articles/4"}
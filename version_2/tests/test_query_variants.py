@@ -0,0 +1,24 @@
+from services import search_service
+from services.quota_limiter import QuotaStatus
+from services.search_service import QueryVariant, build_query_variants, build_query_text
+
+def test_build_query_variants_adds_hint_and_prefix_variants_in_priority_order():
+    variants = build_query_variants("NVIDIA", "경제/금융", "English (US)", expanded="NVIDIA earnings")
+    assert [build_query_text(v.keyword, v.category, v.language) for v in variants] == [
+        "경제/금융 NVIDIA earnings news", "경제/금융 NVIDIA news", "NVIDIA news", "NVIDIA"
+    ]
+
+def test_build_query_variants_drops_variants_with_the_same_query():
+    # 한국어는 언어 힌트가 없고 '전체'는 접두어가 없으므로 변형이 1개로 합쳐짐
+    assert build_query_variants("반도체") == [QueryVariant("반도체")]
+    assert len(build_query_variants("반도체", expanded="반도체")) == 1
+
+def test_build_query_variants_is_bounded_by_pool_and_remaining_quota(monkeypatch):
+    assert len(build_query_variants("NVIDIA", "경제/금융", "English", expanded="GPU", max_variants=2)) == 2
+
+    monkeypatch.setattr(search_service.quota_limiter, "status", lambda: [
+        QuotaStatus("gemini", 10, None, 0, None),
+        QuotaStatus("tavily", 10, 100, 3, 0),
+    ])
+    # 한도를 다 써도 가장 우선인 변형 1개는 남겨 두고, 초과 여부는 호출 시점의 quota_limiter가 판단
+    assert build_query_variants("NVIDIA", "경제/금융", "English", expanded="GPU") == [QueryVariant("GPU", "경제/금융", "English")]
@@ -0,0 +1,83 @@
+import sqlite3
+import threading
+from datetime import date
+from types import SimpleNamespace
+import pytest
+from services import quota_limiter as quota_module
+from services.quota_limiter import ProviderQuota, QuotaLimiter
+from utils.exceptions import AppError
+
+@pytest.fixture
+def clock(monkeypatch):
+    """토큰 버킷이 보는 시각을 테스트에서 직접 움직입니다."""
+    now = [1000.0]
+    monkeypatch.setattr(quota_module, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+@pytest.fixture
+def today(monkeypatch):
+    current = [date(2026, 10, 1)]
+    monkeypatch.setattr(quota_module, "date", SimpleNamespace(today=lambda: current[0]))
+    return current
+
+def _remaining(limiter: QuotaLimiter, provider: str):
+    status = next(status for status in limiter.status() if status.provider == provider)
+    return status.minute_remaining, status.day_remaining
+
+def test_token_bucket_limits_calls_per_minute_and_refills(tmp_path, clock, today):
+    limiter = QuotaLimiter(str(tmp_path / "quota.db"), {"tavily": ProviderQuota(per_minute=2)})
+    assert limiter.try_acquire("tavily") and limiter.try_acquire("tavily")
+    assert not limiter.try_acquire("tavily")
+    # 다음 토큰까지 30초가 필요하므로 1초 안에는 얻지 못함
+    with pytest.raises(AppError) as exc_info:
+        limiter.acquire("tavily", timeout=1)
+    assert exc_info.value.error_type == "rate_limit_exceeded"
+
+    clock[0] += 30
+    assert _remaining(limiter, "tavily") == (1, None)
+    limiter.acquire("tavily", timeout=1)
+    # 오래 쉬어도 버킷 크기(per_minute) 이상 쌓이지 않음
+    clock[0] += 3600
+    assert _remaining(limiter, "tavily") == (2, None)
+
+def test_providers_without_limits_are_never_blocked(tmp_path, clock, today):
+    limiter = QuotaLimiter(str(tmp_path / "quota.db"), {"tavily": ProviderQuota(per_minute=0), "gemini": ProviderQuota()})
+    assert not limiter.try_acquire("tavily")
+    assert all(limiter.try_acquire("gemini") for _ in range(100))
+    assert [status.provider for status in limiter.status()] == ["tavily"]
+
+def test_daily_counter_persists_across_restarts_and_resets_next_day(tmp_path, clock, today):
+    db_path = str(tmp_path / "quota.db")
+    quotas = {"tavily": ProviderQuota(per_day=3), "gemini": ProviderQuota(per_day=3)}
+    limiter = QuotaLimiter(db_path, quotas)
+    for _ in range(3):
+        limiter.acquire("tavily")
+    with pytest.raises(AppError) as exc_info:
+        limiter.acquire("tavily")
+    assert exc_info.value.error_type == "daily_limit_exceeded"
+    assert limiter.try_acquire("gemini")
+
+    # 앱을 다시 시작해도 오늘 사용량이 이어짐
+    restarted = QuotaLimiter(db_path, quotas)
+    assert not restarted.try_acquire("tavily")
+    assert _remaining(restarted, "tavily") == (None, 0)
+    assert _remaining(restarted, "gemini") == (None, 2)
+
+    today[0] = date(2026, 10, 2)
+    assert restarted.try_acquire("tavily")
+    assert _remaining(restarted, "tavily") == (None, 2)
+
+def test_concurrent_sessions_share_the_daily_limit(tmp_path, today):
+    limiter = QuotaLimiter(str(tmp_path / "quota.db"), {"tavily": ProviderQuota(per_day=25)})
+    granted = []
+    def session():
+        granted.extend(limiter.try_acquire("tavily") for _ in range(10))
+    threads = [threading.Thread(target=session) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert granted.count(True) == 25
+    with sqlite3.connect(str(tmp_path / "quota.db")) as conn:
+        assert conn.execute("SELECT day, used FROM quota_usage WHERE provider = 'tavily'").fetchall() == [("2026-10-01", 25)]
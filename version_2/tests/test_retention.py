@@ -0,0 +1,156 @@
+import os
+from datetime import datetime, timedelta
+import pytest
+from conftest import make_result
+from domain.retention_policy import RetentionPolicy
+from domain.search_entry import SearchEntry
+from repositories import search_repository, parquet_search_repository, sqlite_search_repository
+from repositories.base_repository import BaseSearchRepository
+from repositories.search_repository import SearchRepository
+from repositories.sqlite_search_repository import SqliteSearchRepository
+from repositories.parquet_search_repository import ParquetSearchRepository
+
+NOW = datetime(2026, 10, 18, 12, 0)
+
+def _entries():
+    return [
+        SearchEntry("AI-202610181100", "AI", datetime(2026, 10, 18, 11, 0), 2),
+        SearchEntry("반도체-202610100900", "반도체", datetime(2026, 10, 10, 9, 0), 4),
+        SearchEntry("환율-202609010900", "환율", datetime(2026, 9, 1, 9, 0), 2),
+    ]
+
+def test_expired_keys_by_age():
+    expired = BaseSearchRepository._expired_keys(_entries(), RetentionPolicy(max_age_days=30), 0, now=NOW)
+    assert expired == {"환율-202609010900"}
+
+def test_expired_keys_by_count_keeps_latest():
+    expired = BaseSearchRepository._expired_keys(_entries(), RetentionPolicy(max_searches=1), 0, now=NOW)
+    assert expired == {"반도체-202610100900", "환율-202609010900"}
+
+def test_expired_keys_by_bytes_drops_oldest_until_under_limit():
+    # 기사 8건에 800B -> 기사당 100B. 최신 두 검색(600B)까지 보존
+    expired = BaseSearchRepository._expired_keys(_entries(), RetentionPolicy(max_bytes=600), 800, now=NOW)
+    assert expired == {"환율-202609010900"}
+    expired = BaseSearchRepository._expired_keys(_entries(), RetentionPolicy(max_bytes=599), 800, now=NOW)
+    assert expired == {"반도체-202610100900", "환율-202609010900"}
+    # 한도 안이면 삭제하지 않음
+    assert BaseSearchRepository._expired_keys(_entries(), RetentionPolicy(max_bytes=800), 800, now=NOW) == set()
+
+def _csv(tmp_path):
+    return SearchRepository(str(tmp_path / "search_history.csv"))
+
+def _sqlite(tmp_path):
+    return SqliteSearchRepository(str(tmp_path / "history.db"))
+
+def _parquet(tmp_path):
+    return ParquetSearchRepository(str(tmp_path / "parquet"))
+
+BACKENDS = [pytest.param(_csv, id="csv"), pytest.param(_sqlite, id="sqlite"), pytest.param(_parquet, id="parquet")]
+
+def _store_bytes(repository) -> int:
+    """저장소가 compact()에서 측정하는 것과 같은 기준의 크기"""
+    if isinstance(repository, SqliteSearchRepository):
+        return repository._file_bytes()
+    if isinstance(repository, ParquetSearchRepository):
+        return sum(os.path.getsize(path) for path in repository._all_files())
+    return os.path.getsize(repository.csv_path)
+
+def _seed(repository, article_factory):
+    """
+    현재 시각 기준 1일/10일/40일 전 검색을 기사 2건씩 저장 (마지막 검색은 중복 저장)
+    가장 오래된 검색은 본문을 크게 만들어 삭제 후 회수되는 크기가 드러나게 함
+    """
+    now = datetime.now().replace(microsecond=0)
+    results = []
+    for i, (keyword, days) in enumerate([("AI", 1), ("반도체", 10), ("환율", 40)]):
+        fields = {"snippet": os.urandom(8192).hex()} if days == 40 else {}
+        results.append(make_result(f"{keyword}-{(now - timedelta(days=days)):%Y%m%d%H%M}",
+                                   [article_factory(i * 2 + 1, **fields), article_factory(i * 2 + 2, **fields)],
+                                   search_time=now - timedelta(days=days)))
+    for result in results:
+        assert repository.save(result)
+    assert repository.save(results[-1])
+    return [result.search_key for result in results]
+
+@pytest.mark.parametrize("make_repository", BACKENDS)
+def test_compact_by_age_removes_old_searches_and_duplicates(tmp_path, article_factory, make_repository):
+    repository = make_repository(tmp_path)
+    latest, middle, oldest = _seed(repository, article_factory)
+    bytes_before = _store_bytes(repository)
+
+    report = repository.compact(RetentionPolicy(max_age_days=30))
+
+    assert sorted(repository.get_all_keys()) == sorted([latest, middle])
+    assert repository.find_by_key(oldest) is None
+    assert (report.searches_removed, report.rows_after) == (1, 4)
+    assert report.bytes_before == bytes_before
+    assert report.bytes_after == _store_bytes(repository)
+    assert report.bytes_reclaimed > 0
+
+@pytest.mark.parametrize("make_repository", BACKENDS)
+def test_compact_by_count_keeps_latest_searches(tmp_path, article_factory, make_repository):
+    repository = make_repository(tmp_path)
+    latest, middle, oldest = _seed(repository, article_factory)
+
+    report = repository.compact(RetentionPolicy(max_searches=1))
+
+    assert repository.get_all_keys() == [latest]
+    assert (report.searches_removed, report.rows_after) == (2, 2)
+    assert [a.url for a in repository.find_by_key(latest).articles] == [
+        "https://news.example.com/articles/1", "https://news.example.com/articles/2"
+    ]
+
+@pytest.mark.parametrize("make_repository", BACKENDS)
+def test_compact_by_bytes_drops_oldest_first(tmp_path, article_factory, make_repository):
+    repository = make_repository(tmp_path)
+    latest, middle, oldest = _seed(repository, article_factory)
+    # 중복 정리로 크기를 맞춘 뒤, 같은 기사 수의 검색 3건 중 최신 1건만 들어가는 한도 적용
+    repository.compact()
+    limit = _store_bytes(repository) // 2
+
+    report = repository.compact(RetentionPolicy(max_bytes=limit))
+
+    assert repository.get_all_keys() == [latest]
+    assert report.searches_removed == 2
+    assert report.bytes_after == _store_bytes(repository)
+
+def _fail(*args, **kwargs):
+    raise OSError("디스크 공간 부족")
+
+def test_failed_csv_rewrite_keeps_original_file(tmp_path, article_factory, monkeypatch):
+    repository = _csv(tmp_path)
+    keys = _seed(repository, article_factory)
+    with open(repository.csv_path, 'rb') as f:
+        original = f.read()
+    monkeypatch.setattr(search_repository.os, "replace", _fail)
+
+    assert repository.compact(RetentionPolicy(max_searches=1)) is None
+
+    with open(repository.csv_path, 'rb') as f:
+        assert f.read() == original
+    assert sorted(repository.get_all_keys()) == sorted(keys)
+
+def test_failed_parquet_rewrite_keeps_original_partitions(tmp_path, article_factory, monkeypatch):
+    repository = _parquet(tmp_path)
+    keys = _seed(repository, article_factory)
+    files = repository._all_files()
+    monkeypatch.setattr(parquet_search_repository.os, "replace", _fail)
+
+    assert repository.compact(RetentionPolicy(max_searches=1)) is None
+
+    # 만료된 파티션도 삭제되지 않고 기존 파일이 그대로 남으며, 기록한 임시 파일은 정리됨
+    assert repository._all_files() == files
+    assert list(tmp_path.glob("parquet/*/_*.tmp")) == []
+    assert sorted(repository.get_all_keys()) == sorted(keys)
+    assert len(repository.load()) == 8
+
+def test_failed_sqlite_compaction_rolls_back(tmp_path, article_factory, monkeypatch):
+    repository = _sqlite(tmp_path)
+    keys = _seed(repository, article_factory)
+    # 만료 검색 삭제 후 같은 트랜잭션 안에서 실패
+    monkeypatch.setattr(sqlite_search_repository, "REFRESH_LATEST", "UPDATE no_such_table SET x = 1")
+
+    assert repository.compact(RetentionPolicy(max_searches=1)) is None
+
+    assert sorted(repository.get_all_keys()) == sorted(keys)
+    assert len(repository.load()) == 8
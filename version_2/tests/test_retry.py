@@ -0,0 +1,151 @@
+import time
+import threading
+from types import SimpleNamespace
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+import pytest
+import requests
+from utils import retry
+from utils.exceptions import AppError
+from utils.retry import CircuitBreaker, RetryPolicy, call_with_retry, classify_error, parse_retry_after
+from utils.stub_server import create_stub_server, StubConfig
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """utils.retry의 대기 시간을 실제로 기다리지 않고 기록합니다. (스텁 서버 등 다른 모듈의 time은 그대로)"""
+    recorded = []
+    monkeypatch.setattr(retry, "time", SimpleNamespace(sleep=recorded.append, monotonic=time.monotonic, time=time.time))
+    return recorded
+
+@pytest.fixture
+def stub_url():
+    servers = []
+    def start(config: StubConfig):
+        server, stats = create_stub_server(config=config)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_port}/search", stats
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+def _flaky(failures, result="ok"):
+    """앞의 예외들을 차례로 던진 뒤 result를 반환하는 함수"""
+    calls = []
+    def fn():
+        calls.append(1)
+        if len(calls) <= len(failures):
+            raise failures[len(calls) - 1]
+        return result
+    return fn, calls
+
+def test_parse_retry_after_accepts_seconds_and_http_dates():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("-1") == 0.0
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 <= parse_retry_after(later) <= 30
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+def test_backoff_uses_full_jitter_capped_by_max_delay():
+    policy = RetryPolicy(max_attempts=6, base_delay=0.5, max_delay=2.0)
+    for retry_number, cap in [(1, 0.5), (2, 1.0), (3, 2.0), (5, 2.0)]:
+        delays = [policy.delay_for(retry_number) for _ in range(200)]
+        assert all(0 <= delay <= cap for delay in delays)
+    assert policy.delay_for(6) is None
+    assert policy.delay_for(1, retry_after=1.5) == 1.5
+    # 서버가 max_delay보다 오래 기다리라고 하면 재시도하지 않음
+    assert policy.delay_for(1, retry_after=5) is None
+
+def test_transient_errors_are_retried_until_success(sleeps):
+    fn, calls = _flaky([requests.ConnectionError(), requests.Timeout()])
+    assert call_with_retry(fn, RetryPolicy(max_attempts=3)) == "ok"
+    assert len(calls) == 3 and len(sleeps) == 2
+
+def test_non_retryable_errors_fail_immediately(sleeps):
+    response = requests.Response()
+    response.status_code = 400
+    fn, calls = _flaky([requests.HTTPError(response=response)])
+    with pytest.raises(AppError) as exc_info:
+        call_with_retry(fn, RetryPolicy(max_attempts=3))
+    assert exc_info.value.error_type == "bad_request"
+    assert len(calls) == 1 and sleeps == []
+
+def test_retry_after_from_stub_429_is_honored(sleeps, stub_url):
+    url, stats = stub_url(StubConfig(rate_limit_rate=1.0, retry_after=2))
+    def search():
+        response = requests.post(url, json={"query": "반도체"})
+        response.raise_for_status()
+        return response.json()
+
+    with pytest.raises(AppError) as exc_info:
+        call_with_retry(search, RetryPolicy(max_attempts=3, max_delay=8.0))
+    assert exc_info.value.error_type == "rate_limit_exceeded"
+    assert stats.tavily == 3 and sleeps == [2.0, 2.0]
+
+class UsageLimitExceededError(Exception):
+    """응답 객체 없이 던져지는 Tavily 클라이언트의 429 예외와 같은 이름"""
+
+def test_retry_after_recorded_by_session_hook(sleeps, stub_url):
+    # Tavily 클라이언트처럼 응답 없이 예외만 남는 경우에도 응답 훅이 기록한 Retry-After를 사용
+    url, stats = stub_url(StubConfig(rate_limit_rate=1.0, retry_after=1))
+    session = requests.Session()
+    session.hooks["response"].append(retry.retry_after_hook)
+    def search():
+        if session.post(url, json={"query": "반도체"}).status_code == 429:
+            raise UsageLimitExceededError("rate limited")
+    with pytest.raises(AppError) as exc_info:
+        call_with_retry(search, RetryPolicy(max_attempts=2))
+    assert exc_info.value.error_type == "rate_limit_exceeded"
+    assert stats.rate_limited == 2 and sleeps == [1.0]
+    # 다른 스레드에서 기록한 값은 보이지 않음
+    seen = []
+    worker = threading.Thread(target=lambda: seen.append(classify_error(UsageLimitExceededError()).retry_after))
+    worker.start()
+    worker.join()
+    assert seen == [None]
+
+def test_breaker_opens_after_threshold_and_recovers_through_half_open(sleeps):
+    clock = [1000.0]
+    retry.time.monotonic = lambda: clock[0]
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=30)
+    failing, calls = _flaky([requests.ConnectionError()] * 10)
+
+    for _ in range(2):
+        with pytest.raises(AppError):
+            call_with_retry(failing, retry.NO_RETRY, breaker)
+    assert breaker.state == "open"
+
+    # 열려 있는 동안은 호출하지 않고 즉시 실패
+    with pytest.raises(AppError) as exc_info:
+        call_with_retry(failing, retry.NO_RETRY, breaker)
+    assert exc_info.value.error_type == "service_unavailable" and len(calls) == 2
+
+    # reset_timeout 후 시험 호출 1건: 실패하면 다시 open
+    clock[0] += 31
+    assert breaker.state == "half-open"
+    with pytest.raises(AppError):
+        call_with_retry(failing, retry.NO_RETRY, breaker)
+    assert breaker.state == "open" and len(calls) == 3
+
+    # 다시 기다린 뒤 시험 호출이 성공하면 closed
+    clock[0] += 31
+    assert breaker.allow() and not breaker.allow()  # half-open은 한 번에 1건만 허용
+    breaker.release()
+    assert call_with_retry(lambda: "ok", retry.NO_RETRY, breaker) == "ok"
+    assert breaker.state == "closed"
+
+def test_request_errors_and_local_failures_do_not_trip_the_breaker(sleeps):
+    breaker = CircuitBreaker("test", failure_threshold=1)
+    response = requests.Response()
+    response.status_code = 400
+    bad_request, _ = _flaky([requests.HTTPError(response=response)])
+    with pytest.raises(AppError):
+        call_with_retry(bad_request, retry.NO_RETRY, breaker)
+
+    def quota_exceeded():
+        raise AppError("rate_limit_exceeded")
+    with pytest.raises(AppError):
+        call_with_retry(quota_exceeded, RetryPolicy(max_attempts=3), breaker)
+    assert breaker.state == "closed" and sleeps == []
@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+import pytest
+from services import search_cache as cache_module
+from services.search_cache import SearchCache
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_800_000_000.0]
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(time=lambda: now[0]))
+    return now
+
+def test_make_key_ignores_parameter_order():
+    assert SearchCache.make_key({"query": "반도체", "days": 7}) == SearchCache.make_key({"days": 7, "query": "반도체"})
+    assert SearchCache.make_key({"query": "반도체", "days": 7}) != SearchCache.make_key({"query": "반도체", "days": 1})
+
+def test_entries_expire_after_their_time_range_ttl(tmp_path, clock):
+    cache = SearchCache(str(tmp_path / "cache.db"))
+    cache.put("day", {"results": [1]}, SearchCache.ttl_for("day"), fetch_seconds=0.8)
+    cache.put("all", {"results": [2]}, SearchCache.ttl_for(None))
+
+    clock[0] += SearchCache.ttl_for("day") + 1
+    assert cache.get("day") is None
+    assert cache.get("all") == {"results": [2]}
+    stats = cache.stats()
+    assert (stats.memory_hits, stats.misses) == (1, 1)
+
+def test_memory_lru_evicts_to_disk_which_survives_restart(tmp_path, clock):
+    db_path = str(tmp_path / "cache.db")
+    cache = SearchCache(db_path, max_memory_entries=2)
+    for i in range(3):
+        cache.put(f"q{i}", {"results": [i]}, ttl=600, fetch_seconds=1.5)
+    assert list(cache._memory) == ["q1", "q2"]
+
+    # 메모리에서 밀려난 항목은 디스크에서 찾아 다시 메모리로 올림
+    assert cache.get("q0") == {"results": [0]}
+    assert list(cache._memory) == ["q2", "q0"]
+    assert cache.stats().disk_hits == 1 and cache.stats().saved_seconds == 1.5
+
+    restarted = SearchCache(db_path, max_memory_entries=2)
+    assert restarted.get("q1") == {"results": [1]}
+    restarted.clear()
+    assert restarted.get("q1") is None
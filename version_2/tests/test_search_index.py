@@ -0,0 +1,100 @@
+from datetime import datetime
+import pytest
+from conftest import make_result
+from domain.retention_policy import RetentionPolicy
+from repositories.search_index import SearchIndex, tokenize
+from repositories.search_repository import SearchRepository
+
+@pytest.mark.parametrize("text, tokens", [
+    ("엔비디아의 HBM 출하", ["엔비", "비디", "디아", "아의", "hbm", "출하"]),
+    # 한글과 영문/숫자가 붙어 있으면 구간별로 나눔
+    ("AI반도체 3나노", ["ai", "반도", "도체", "3", "나노"]),
+    # 한 글자 구간은 그대로, 구두점/밑줄은 구분자
+    ("칩, 美_中 Trade-War", ["칩", "美", "中", "trade", "war"]),
+    ("", []),
+    (None, []),
+])
+def test_tokenize_splits_korean_into_bigrams(text, tokens):
+    assert tokenize(text) == tokens
+
+def _keys(results):
+    return [entry.search_key for entry, _ in results]
+
+def test_search_matches_inflected_korean_words(tmp_path, article_factory):
+    index = SearchIndex(str(tmp_path / "index.db"))
+    index.add(make_result("AI-202610010900", [article_factory(1, title="엔비디아가 신형 칩 공개", snippet="")],
+                          ai_summary=""))
+    index.add(make_result("환율-202610011000", [article_factory(2, title="원달러 환율 급등", snippet="")],
+                          ai_summary=""))
+
+    assert _keys(index.search("엔비디아")) == ["AI-202610010900"]
+    # 조사가 붙은 질의도 '환율' 2-gram으로 일치
+    assert _keys(index.search("환율이")) == ["환율-202610011000"]
+    assert index.search("!!!") == []
+
+def test_bm25_ranks_title_matches_and_rare_terms_higher(tmp_path, article_factory):
+    index = SearchIndex(str(tmp_path / "index.db"))
+    index.add(make_result("제목-202610010900", [article_factory(1, title="반도체 수출 증가", snippet="시장 동향")],
+                          ai_summary=""))
+    index.add(make_result("본문-202610011000", [article_factory(2, title="시장 동향", snippet="반도체 수출 증가")],
+                          ai_summary=""))
+    index.add(make_result("기타-202610011100", [article_factory(3, title="시장 동향", snippet="환율 하락")],
+                          ai_summary=""))
+
+    # 같은 단어라도 제목(가중치 2)에 나온 검색이 먼저
+    results = index.search("반도체 수출")
+    assert _keys(results) == ["제목-202610010900", "본문-202610011000"]
+    assert results[0][1] > results[1][1] > 0
+    # 모든 문서에 있는 '시장'보다 드문 '환율'이 점수를 좌우함
+    assert _keys(index.search("시장 환율"))[0] == "기타-202610011100"
+    assert _keys(index.search("반도체", limit=1)) == ["제목-202610010900"]
+    entry = index.search("반도체")[0][0]
+    assert (entry.keyword, entry.search_time) == ("제목", datetime(2026, 10, 1, 9, 0))
+
+def test_sync_adds_only_missing_searches(tmp_path, article_factory):
+    repository = SearchRepository(str(tmp_path / "search_history.csv"))
+    repository.save(make_result("반도체-202610010900", [article_factory(1, title="반도체 수출"), article_factory(2)]))
+    repository.save(make_result("환율-202610011000", [article_factory(3, title="환율 급등")],
+                                search_time=datetime(2026, 10, 1, 10, 0)))
+    index = SearchIndex(str(tmp_path / "index.db"))
+
+    assert index.sync(repository) == (2, 0)
+    assert index.sync(repository) == (0, 0)
+    repository.save(make_result("금리-202610011100", [article_factory(4, title="금리 동결")],
+                                search_time=datetime(2026, 10, 1, 11, 0)))
+    assert index.sync(repository) == (1, 0)
+    assert index.indexed_keys() == {"반도체-202610010900", "환율-202610011000", "금리-202610011100"}
+
+    # 동기화로 만든 색인은 저장할 때마다 추가한 색인과 점수가 같음 (요약은 검색당 한 번만 셈)
+    incremental = SearchIndex(str(tmp_path / "incremental.db"))
+    for search_key in repository.get_all_keys():
+        incremental.add(repository.find_by_key(search_key))
+    for query in ("반도체 수출", "요약", "기사 본문"):
+        assert index.search(query) == incremental.search(query)
+
+def test_sync_after_compaction_drops_removed_searches(tmp_path, article_factory):
+    repository = SearchRepository(str(tmp_path / "search_history.csv"))
+    for hour, keyword in [(9, "반도체"), (10, "환율"), (11, "금리")]:
+        repository.save(make_result(f"{keyword}-20261001{hour:02d}00", [article_factory(hour, title=f"{keyword} 뉴스")],
+                                    search_time=datetime(2026, 10, 1, hour, 0)))
+    index = SearchIndex(str(tmp_path / "index.db"))
+    index.sync(repository)
+
+    # 색인이 연결되지 않은 상태(다른 프로세스 등)에서 정리된 경우 다음 sync()에서 제거
+    repository.compact(RetentionPolicy(max_searches=1))
+
+    assert index.sync(repository) == (0, 2)
+    assert index.indexed_keys() == {"금리-202610011100"}
+    assert index.search("반도체 환율") == []
+    assert _keys(index.search("뉴스")) == ["금리-202610011100"]
+
+def test_attached_index_follows_saves_and_compaction(tmp_path, article_factory):
+    repository = SearchRepository(str(tmp_path / "search_history.csv"))
+    repository.save(make_result("반도체-202610010900", [article_factory(1, title="반도체 뉴스")]))
+    repository.attach_index(SearchIndex(str(tmp_path / "index.db")))
+    repository.save(make_result("환율-202610011000", [article_factory(2, title="환율 뉴스")],
+                                search_time=datetime(2026, 10, 1, 10, 0)))
+
+    assert set(_keys(repository.search_archive("뉴스"))) == {"반도체-202610010900", "환율-202610011000"}
+    repository.compact(RetentionPolicy(max_searches=1))
+    assert _keys(repository.search_archive("뉴스")) == ["환율-202610011000"]
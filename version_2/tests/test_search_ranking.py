@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta, timezone
+from domain.news_article import NewsArticle
+from services import search_service
+from services.reranker import rerank
+from services.search_service import QueryVariant
+
+NOW = datetime(2026, 10, 1, 9, 0, tzinfo=timezone.utc)
+
+def _article(title: str, published_at=None) -> NewsArticle:
+    return NewsArticle(title=title, url=f"https://news.example.com/{title}", snippet="", published_at=published_at)
+
+def test_rerank_orders_by_relevance_then_recency():
+    old_match = _article("엔비디아 실적 발표", NOW - timedelta(days=10))
+    fresh_match = _article("엔비디아 주가 상승", NOW - timedelta(hours=1))
+    unrelated = _article("환율 하락 전망", NOW)
+    ranked = rerank([unrelated, old_match, fresh_match], "엔비디아", now=NOW)
+    assert ranked == [fresh_match, old_match, unrelated]
+
+def test_rerank_keeps_order_for_ties_and_undated_articles():
+    articles = [_article("반도체 소식 1"), _article("반도체 소식 2"), _article("반도체 소식 3")]
+    assert rerank(articles, "반도체", now=NOW) == articles
+
+def test_search_news_ranked_reranks_against_user_query(monkeypatch):
+    published = "2026-10-01T08:00:00+00:00"
+    merged = [
+        ({"url": "https://a.example.com/1", "title": "수출 전망 분석 보고서", "content": "", "published_date": published}, None, "전체"),
+        ({"url": "https://b.example.com/2", "title": "반도체 업황 점검", "content": "", "published_date": published}, None, "전체"),
+    ]
+    monkeypatch.setattr(search_service._search_service, "_gather", lambda *args: list(merged))
+    variants = [QueryVariant("반도체 수출 전망 분석"), QueryVariant("반도체")]
+
+    articles, _ = search_service.search_news_ranked(variants, num_results=2, query="반도체")
+
+    # 확장 검색어에만 있는 단어(수출/전망/분석)가 아니라 사용자 검색어로 순위를 매김
+    assert [article.title for article in articles] == ["반도체 업황 점검", "수출 전망 분석 보고서"]
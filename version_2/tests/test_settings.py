@@ -0,0 +1,50 @@
+import pytest
+from config.settings import Settings
+from repositories.parquet_search_repository import PARTITION_FORMATS
+
+def test_parquet_partitions_match_repository_formats():
+    assert set(Settings.PARQUET_PARTITIONS) == set(PARTITION_FORMATS)
+
+@pytest.mark.parametrize("value, expected", [("month", "month"), (" Day ", "day")])
+def test_parquet_partition_is_normalized(monkeypatch, value, expected):
+    monkeypatch.setenv("PARQUET_PARTITION", value)
+    assert Settings().parquet_partition == expected
+
+@pytest.mark.parametrize("name, value", [("PARQUET_PARTITION", "week"), ("STORAGE_BACKEND", "mysql")])
+def test_unsupported_choice_fails_at_startup(monkeypatch, name, value):
+    monkeypatch.setenv(name, value)
+    with pytest.raises(EnvironmentError, match=name):
+        Settings()
+
+@pytest.mark.parametrize("name, attribute", [
+    ("SEARCH_CACHE_MAX_ENTRIES", "search_cache_max_entries"),
+    ("SEARCH_OVERFETCH_FACTOR", "search_overfetch_factor"),
+    ("HTTP_KEEPALIVE_SECONDS", "http_keepalive_seconds"),
+    ("QUOTA_MAX_WAIT", "quota_max_wait"),
+])
+def test_explicit_zero_is_kept(monkeypatch, name, attribute):
+    monkeypatch.setenv(name, "0")
+    assert getattr(Settings(), attribute) == 0
+
+@pytest.mark.parametrize("name, attribute, default", [
+    ("SEARCH_CACHE_MAX_ENTRIES", "search_cache_max_entries", 256),
+    ("HTTP_POOL_SIZE", "http_pool_size", 10),
+    ("WATCHLIST_INTERVAL_MINUTES", "watchlist_interval_minutes", 60),
+])
+def test_blank_value_uses_default(monkeypatch, name, attribute, default):
+    monkeypatch.setenv(name, " ")
+    assert getattr(Settings(), attribute) == default
+
+@pytest.mark.parametrize("name, value", [
+    ("SEARCH_CACHE_MAX_ENTRIES", "-1"),
+    ("HISTORY_MAX_SEARCHES", "-5"),
+    ("HTTP_TIMEOUT", "abc"),
+    # 0이면 동작하지 않는 설정
+    ("HTTP_POOL_SIZE", "0"),
+    ("HTTP_TIMEOUT", "0"),
+    ("WATCHLIST_INTERVAL_MINUTES", "0"),
+])
+def test_invalid_integer_fails_at_startup(monkeypatch, name, value):
+    monkeypatch.setenv(name, value)
+    with pytest.raises(EnvironmentError, match=name):
+        Settings()
@@ -0,0 +1,64 @@
+import time
+import threading
+from utils.single_flight import SingleFlight
+
+def _run_concurrently(count: int, target):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+def test_concurrent_identical_calls_share_one_execution():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls, results = [], []
+
+    def slow_search():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return ["기사"]
+
+    leader = _run_concurrently(1, lambda: results.append(flight.do("반도체", slow_search)))
+    started.wait(5)
+    followers = _run_concurrently(4, lambda: results.append(flight.do("반도체", slow_search)))
+    while flight.coalesced < 4:
+        time.sleep(0.01)
+    release.set()
+    for thread in leader + followers:
+        thread.join()
+
+    assert len(calls) == 1 and flight.coalesced == 4
+    assert results == [["기사"]] * 5
+    # 끝난 호출의 결과는 보관하지 않으므로 다음 호출은 다시 실행
+    assert flight.do("반도체", lambda: ["새 기사"]) == ["새 기사"]
+
+def test_errors_reach_every_waiting_caller_and_keys_do_not_mix():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    errors = []
+
+    def failing():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("API 오류")
+
+    def call():
+        try:
+            flight.do("환율", failing)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    threads = _run_concurrently(1, call)
+    started.wait(5)
+    threads += _run_concurrently(2, call)
+    while flight.coalesced < 2:
+        time.sleep(0.01)
+    # 다른 키는 진행 중인 호출과 묶이지 않음
+    assert flight.do("반도체", lambda: "ok") == "ok"
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert errors == ["API 오류"] * 3
+    assert "환율" not in flight._calls
@@ -0,0 +1,147 @@
+import sqlite3
+from conftest import make_result
+from repositories.sqlite_search_repository import SqliteSearchRepository, SCHEMA_VERSION
+
+# 이전 버전 스키마 (v1: 기사 1건=1행, v2: searches + 검색마다 기사 사본을 두는 articles)
+V1_SCHEMA = """
+CREATE TABLE search_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, search_key TEXT NOT NULL, search_time TEXT NOT NULL, keyword TEXT,
+    article_index INTEGER, title TEXT, url TEXT, snippet TEXT, pub_date TEXT, ai_summary TEXT, ai_keywords TEXT
+);
+"""
+V2_SCHEMA = """
+CREATE TABLE searches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, search_key TEXT NOT NULL, search_time TEXT NOT NULL, keyword TEXT,
+    ai_summary TEXT, ai_keywords TEXT
+);
+CREATE TABLE articles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, search_id INTEGER NOT NULL REFERENCES searches(id) ON DELETE CASCADE,
+    article_index INTEGER, title TEXT, url TEXT, snippet TEXT, pub_date TEXT
+);
+PRAGMA user_version = 2;
+"""
+
+URL = "https://news.example.com/articles/1"
+# 압축 대상이 될 만큼 긴 본문/요약 (text_codec.MIN_COMPRESS_BYTES 이상)
+LONG_SNIPPET = "반도체 수출이 석 달 연속 늘었습니다. " * 20
+# (search_key, search_time, 기사 목록[(index, title, url, snippet, pub_date)])
+HISTORY = [
+    ("반도체-202610010900", "2026-10-01 09:00:00", [(1, "반도체 수출 증가", URL, LONG_SNIPPET, "2026-10-01"),
+                                                    (2, "메모리 가격", "https://news.example.com/articles/2", "본문 2", None)]),
+    # 같은 기사를 다른 검색에서 스니펫 없이 다시 수집
+    ("반도체 수출-202610011000", "2026-10-01 10:00:00", [(1, "반도체 수출 증가", URL, None, "2026-10-01")]),
+    # 같은 분에 다시 검색해 같은 search_key가 두 번 저장됨
+    ("반도체-202610010900", "2026-10-01 09:00:30", [(1, "추가 기사", "https://news.example.com/articles/3", "본문 3", None)]),
+]
+
+def _create_v1(path: str):
+    conn = sqlite3.connect(path)
+    conn.executescript(V1_SCHEMA)
+    for search_key, search_time, articles in HISTORY:
+        conn.executemany(
+            "INSERT INTO search_history (search_key, search_time, keyword, article_index, title, url, snippet, pub_date, ai_summary, ai_keywords) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(search_key, search_time, search_key.rsplit("-", 1)[0], *article, f"{search_key} 요약 " + LONG_SNIPPET, "키워드") for article in articles]
+        )
+    conn.commit()
+    conn.close()
+
+def _create_v2(path: str):
+    conn = sqlite3.connect(path)
+    conn.executescript(V2_SCHEMA)
+    for search_key, search_time, articles in HISTORY:
+        search_id = conn.execute(
+            "INSERT INTO searches (search_key, search_time, keyword, ai_summary, ai_keywords) VALUES (?, ?, ?, ?, ?)",
+            (search_key, search_time, search_key.rsplit("-", 1)[0], f"{search_key} 요약 " + LONG_SNIPPET, "키워드")
+        ).lastrowid
+        conn.executemany(
+            "INSERT INTO articles (search_id, article_index, title, url, snippet, pub_date) VALUES (?, ?, ?, ?, ?, ?)",
+            [(search_id, *article) for article in articles]
+        )
+    conn.commit()
+    conn.close()
+
+def _assert_upgraded(path: str):
+    repository = SqliteSearchRepository(path)
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        assert {"searches", "articles", "search_articles"} <= tables
+        assert not {"search_history", "articles_v2"} & tables
+        # 같은 URL의 기사는 한 번만 저장되고, 긴 스니펫/요약은 압축되어 있음
+        assert conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0] == 3
+        assert conn.execute("SELECT typeof(snippet) FROM articles WHERE url = ?", (URL,)).fetchone()[0] == "blob"
+        assert conn.execute("SELECT COUNT(*) FROM searches WHERE typeof(ai_summary) = 'text'").fetchone()[0] == 0
+
+    assert [(e.search_key, e.article_count) for e in repository.list_searches()] == [
+        ("반도체 수출-202610011000", 1), ("반도체-202610010900", 3)
+    ]
+    # 다른 검색에서 비어 있던 스니펫은 기사 저장소의 값으로 채워지지 않음
+    article = repository.find_by_key("반도체 수출-202610011000").articles[0]
+    assert (article.title, article.url, article.snippet, article.pub_date) == ("반도체 수출 증가", URL, "", "2026-10-01")
+    first = repository.find_by_key("반도체-202610010900")
+    assert {a.url for a in first.articles} == {URL, "https://news.example.com/articles/2", "https://news.example.com/articles/3"}
+    assert next(a for a in first.articles if a.url == URL).snippet == LONG_SNIPPET
+    assert first.ai_summary.endswith(LONG_SNIPPET)
+
+    # 업그레이드한 DB를 다시 열어도 아무것도 바뀌지 않음
+    assert [e.search_key for e in SqliteSearchRepository(path).list_searches()] == [e.search_key for e in repository.list_searches()]
+
+def test_upgrade_from_v1_single_table(tmp_path):
+    path = str(tmp_path / "v1.db")
+    _create_v1(path)
+    _assert_upgraded(path)
+
+def test_upgrade_from_v2_per_search_article_copies(tmp_path):
+    path = str(tmp_path / "v2.db")
+    _create_v2(path)
+    _assert_upgraded(path)
+
+def _downgrade_to_v4(path: str):
+    """현재 스키마 DB에서 v5 이후에 추가된 컬럼과 인덱스를 지워 v4 DB를 만듭니다."""
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        DROP INDEX idx_searches_latest;
+        ALTER TABLE search_articles DROP COLUMN cleared;
+        ALTER TABLE search_articles DROP COLUMN alternative_sources;
+        ALTER TABLE searches DROP COLUMN superseded;
+        ALTER TABLE searches DROP COLUMN article_count;
+        PRAGMA user_version = 4;
+    """)
+    conn.close()
+
+def test_upgrade_from_v4_adds_columns_and_computes_latest_flags(tmp_path):
+    path = str(tmp_path / "v4.db")
+    _create_v2(path)
+    SqliteSearchRepository(path)
+    _downgrade_to_v4(path)
+
+    repository = SqliteSearchRepository(path)
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        assert {"cleared"} <= {row[1] for row in conn.execute("PRAGMA table_info(search_articles)")}
+        assert conn.execute("SELECT search_time, superseded, article_count FROM searches ORDER BY id").fetchall() == [
+            ("2026-10-01 09:00:00", 1, 3), ("2026-10-01 10:00:00", 0, 1), ("2026-10-01 09:00:30", 0, 3)
+        ]
+    assert [(e.search_key, e.article_count) for e in repository.list_searches()] == [
+        ("반도체 수출-202610011000", 1), ("반도체-202610010900", 3)
+    ]
+
+def test_upgrade_from_v6_adds_alternative_sources(tmp_path, article_factory):
+    path = str(tmp_path / "v6.db")
+    _create_v2(path)
+    SqliteSearchRepository(path)
+    conn = sqlite3.connect(path)
+    conn.executescript("ALTER TABLE search_articles DROP COLUMN alternative_sources; PRAGMA user_version = 6;")
+    conn.close()
+
+    repository = SqliteSearchRepository(path)
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    # 이전 기록은 다른 매체 기사 없이 복원되고, 새 기록은 함께 저장됨
+    assert all(a.alternative_sources == [] for a in repository.find_by_key("반도체-202610010900").articles)
+    article = article_factory(9, alternative_sources=[("한국경제", "https://hankyung.example.com/9")])
+    repository.save(make_result("환율-202610020900", [article]))
+    assert repository.find_by_key("환율-202610020900").articles[0].alternative_sources == [
+        ("한국경제", "https://hankyung.example.com/9")
+    ]
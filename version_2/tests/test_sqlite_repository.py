@@ -0,0 +1,90 @@
+from datetime import datetime, timezone
+import pandas as pd
+from conftest import make_result
+from domain.search_result import SearchResult
+from repositories.sqlite_search_repository import SqliteSearchRepository
+
+def test_same_url_saved_with_and_without_fields_round_trips(tmp_path, article_factory):
+    repository = SqliteSearchRepository(str(tmp_path / "history.db"))
+    full = make_result("반도체-202610010900", [article_factory(1)])
+    empty = make_result("반도체-202610011000", [article_factory(1, snippet="", title="", pub_date=None)])
+    none = make_result("반도체-202610011100", [article_factory(1, snippet=None, pub_date=None)])
+    for result in (full, empty, none):
+        assert repository.save(result)
+
+    for result in (full, empty, none):
+        restored = repository.find_by_key(result.search_key)
+        for restored_article, saved_article in zip(restored.articles, result.articles):
+            assert restored_article.title == (saved_article.title or "")
+            assert restored_article.url == saved_article.url
+            assert restored_article.snippet == (saved_article.snippet or "")
+            assert restored_article.pub_date == saved_article.pub_date
+
+def test_list_searches_returns_latest_row_per_key_with_total_article_count(tmp_path, article_factory):
+    repository = SqliteSearchRepository(str(tmp_path / "history.db"))
+    repository.save(make_result("AI-202610010900", [article_factory(1)], search_time=datetime(2026, 10, 1, 9, 0, 1)))
+    repository.save(make_result("AI-202610010900", [article_factory(2), article_factory(3)],
+                                search_time=datetime(2026, 10, 1, 9, 0, 30)))
+    repository.save(make_result("환율-202610011000", [article_factory(4)], search_time=datetime(2026, 10, 1, 10, 0)))
+
+    entries = repository.list_searches()
+    assert [(e.search_key, e.article_count) for e in entries] == [("환율-202610011000", 1), ("AI-202610010900", 3)]
+    assert entries[1].search_time == datetime(2026, 10, 1, 9, 0, 30)
+    assert [e.search_key for e in repository.list_searches(offset=1, limit=1)] == ["AI-202610010900"]
+    assert [e.search_key for e in repository.list_searches(keyword_prefix="환")] == ["환율-202610011000"]
+
+    # 중복 정리 후에도 목록과 기사 수가 유지됨
+    repository.compact()
+    assert [(e.search_key, e.article_count) for e in repository.list_searches()] == \
+        [("환율-202610011000", 1), ("AI-202610010900", 3)]
+
+def test_list_searches_skips_rows_with_unparseable_search_time(tmp_path):
+    csv_path = tmp_path / "legacy.csv"
+    pd.DataFrame([
+        {"search_key": "정상-202610010900", "search_time": "2026-10-01 09:00:00", "keyword": "정상",
+         "article_index": 1, "title": "t", "url": "https://a.example.com/1", "snippet": "s",
+         "pub_date": None, "ai_summary": "요약", "ai_keywords": ""},
+        {"search_key": "깨진-202610010900", "search_time": None, "keyword": "깨진",
+         "article_index": 1, "title": "t", "url": "https://a.example.com/2", "snippet": "s",
+         "pub_date": None, "ai_summary": "요약", "ai_keywords": ""},
+    ]).to_csv(csv_path, index=False)
+
+    repository = SqliteSearchRepository(str(tmp_path / "history.db"), legacy_csv_path=str(csv_path))
+    assert [e.search_key for e in repository.list_searches()] == ["정상-202610010900"]
+
+def _result_fields(result):
+    return (
+        result.search_key, result.search_time, result.keyword, result.ai_summary, result.ai_keywords,
+        [(a.title, a.url, a.snippet, a.pub_date) for a in result.articles]
+    )
+
+def test_every_search_result_field_round_trips(tmp_path, article_factory):
+    repository = SqliteSearchRepository(str(tmp_path / "history.db"))
+    saved = [
+        SearchResult(
+            search_key="반도체-202610010900", search_time=datetime(2026, 10, 1, 9, 0, 12), keyword="반도체",
+            articles=[
+                article_factory(1, pub_date="Thu, 01 Oct 2026 08:30:00 +0900"),
+                article_factory(2, pub_date=None),
+                article_factory(3, snippet="본문 " * 200),  # 압축 저장되는 긴 본문
+            ],
+            ai_summary="첫 줄\n둘째 줄", ai_keywords="반도체, HBM, 수출"
+        ),
+        # AI 결과가 비어 있는 검색
+        SearchResult(search_key="환율-202610011000", search_time=datetime(2026, 10, 1, 10, 0), keyword="환율",
+                     articles=[article_factory(4)], ai_summary="", ai_keywords=""),
+    ]
+    for result in saved:
+        assert repository.save(result)
+
+    for result in saved:
+        assert _result_fields(repository.find_by_key(result.search_key)) == _result_fields(result)
+    # 발행 시각은 pub_date를 해석해 UTC로 복원
+    semiconductor = repository.find_by_key("반도체-202610010900")
+    assert [a.published_at for a in semiconductor.articles] == [
+        datetime(2026, 9, 30, 23, 30, tzinfo=timezone.utc), None, datetime(2026, 10, 1, 9, 0, tzinfo=timezone.utc)
+    ]
+    assert [(e.search_key, e.keyword, e.search_time, e.article_count) for e in repository.list_searches()] == [
+        ("환율-202610011000", "환율", datetime(2026, 10, 1, 10, 0), 1),
+        ("반도체-202610010900", "반도체", datetime(2026, 10, 1, 9, 0, 12), 3),
+    ]
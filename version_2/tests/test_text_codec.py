@@ -0,0 +1,72 @@
+import sqlite3
+import zlib
+import pytest
+from conftest import make_result
+from repositories import text_codec
+from repositories.sqlite_search_repository import SqliteSearchRepository
+from repositories.text_codec import CODEC_ZLIB, MIN_COMPRESS_BYTES, compress_text, decompress_text
+
+LONG_TEXT = "반도체 수출이 3개월 연속 증가했습니다. Memory prices keep rising. " * 20
+
+@pytest.mark.parametrize("text", [LONG_TEXT, "a" * MIN_COMPRESS_BYTES, "줄바꿈\n과 탭\t포함 " * 50])
+def test_long_text_round_trips_through_zlib(text):
+    packed = compress_text(text)
+
+    assert isinstance(packed, bytes) and packed[:1] == CODEC_ZLIB
+    assert len(packed) < len(text.encode("utf-8"))
+    assert zlib.decompress(packed[1:]).decode("utf-8") == text
+    assert decompress_text(packed) == text
+
+@pytest.mark.parametrize("value", [
+    None,
+    "",
+    "짧은 요약",
+    "a" * (MIN_COMPRESS_BYTES - 1),
+    # 한글 85자 = UTF-8 255바이트: 글자 수가 아니라 바이트 수로 판단
+    "가" * 85,
+])
+def test_short_text_is_stored_as_is(value):
+    stored = compress_text(value)
+    assert stored is value
+    assert decompress_text(stored) is value
+
+def test_text_that_does_not_shrink_is_stored_as_is(monkeypatch):
+    # 형식 바이트까지 더하면 원문보다 커지는 경우
+    monkeypatch.setattr(text_codec.zlib, "compress", lambda raw, level: raw)
+    assert compress_text(LONG_TEXT) is LONG_TEXT
+
+def test_compress_leaves_already_compressed_value_unchanged():
+    packed = compress_text(LONG_TEXT)
+    assert compress_text(packed) is packed
+
+@pytest.mark.parametrize("legacy", ["압축 전에 저장된 원문", LONG_TEXT, "", None])
+def test_legacy_uncompressed_values_pass_through(legacy):
+    assert decompress_text(legacy) is legacy
+
+@pytest.mark.parametrize("wrap", [bytearray, memoryview])
+def test_decompress_accepts_other_bytes_types(wrap):
+    # sqlite3 등에서 BLOB을 bytes 이외의 형식으로 받아도 해석
+    assert decompress_text(wrap(compress_text(LONG_TEXT))) == LONG_TEXT
+
+@pytest.mark.parametrize("value", [b"\x00plain", b"\x02" + zlib.compress(b"x"), b""])
+def test_unknown_codec_raises(value):
+    with pytest.raises(ValueError):
+        decompress_text(value)
+
+def test_sqlite_reads_both_compressed_and_legacy_plain_rows(tmp_path, article_factory):
+    repository = SqliteSearchRepository(str(tmp_path / "history.db"))
+    repository.save(make_result("반도체-202610010900", [article_factory(1, snippet=LONG_TEXT), article_factory(2)],
+                                ai_summary=LONG_TEXT))
+
+    with sqlite3.connect(repository.db_path) as conn:
+        stored = dict(conn.execute("SELECT url, typeof(snippet) FROM articles").fetchall())
+        assert stored == {"https://news.example.com/articles/1": "blob", "https://news.example.com/articles/2": "text"}
+        assert conn.execute("SELECT typeof(ai_summary) FROM searches").fetchone() == ("blob",)
+        # 압축 도입 전 버전이 남긴 것처럼 원문 텍스트로 되돌림
+        conn.execute("UPDATE articles SET snippet = ? WHERE url = ?", ("예전 원문 " * 40,
+                                                                      "https://news.example.com/articles/1"))
+        conn.execute("UPDATE searches SET ai_summary = '예전 요약'")
+
+    restored = repository.find_by_key("반도체-202610010900")
+    assert [a.snippet for a in restored.articles] == ["예전 원문 " * 40, "기사 2의 본문 스니펫"]
+    assert restored.ai_summary == "예전 요약"
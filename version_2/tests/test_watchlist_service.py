@@ -0,0 +1,22 @@
+from conftest import make_result
+from repositories.sqlite_search_repository import SqliteSearchRepository
+from services import watchlist_service
+from services.watchlist_service import WatchListService
+
+def test_refresh_rereads_articles_saved_outside_the_watch_list(tmp_path, monkeypatch, article_factory):
+    found = [article_factory(1), article_factory(2)]
+    monkeypatch.setattr(watchlist_service, "search_news_ranked", lambda *args, **kwargs: (list(found), []))
+    monkeypatch.setattr(watchlist_service, "summarize_news", lambda articles: "요약")
+    monkeypatch.setattr(watchlist_service, "extract_keywords", lambda articles: "키워드")
+    db_path = str(tmp_path / "history.db")
+    service = WatchListService(SqliteSearchRepository(db_path), ["반도체"], interval_minutes=60)
+
+    assert service.refresh("반도체").new_articles == 2
+    assert service.refresh("반도체").new_articles == 0
+
+    # 사용자가 직접 검색해 저장한 기사(다른 리포지토리 인스턴스)는 다음 갱신에서 새 기사로 보지 않음
+    found.append(article_factory(3))
+    SqliteSearchRepository(db_path).save(make_result("반도체-202610011200", [article_factory(3)]))
+    status = service.refresh("반도체")
+    assert status.new_articles == 0
+    assert status.last_error is None
@@ -0,0 +1,164 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+from typing import Optional
+from urllib.parse import urlsplit
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+# 외부 API 호출 방식 (API_MODE)
+# live: 실제 API 호출, record: 실제 API를 호출하고 요청/응답 쌍을 저장, replay: 저장된 응답만 사용 (네트워크 없음)
+API_MODES = ["live", "record", "replay"]
+
+# 저장하는 응답 헤더 (인증/쿠키 등 나머지 헤더는 저장하지 않음)
+RECORDED_HEADERS = ["content-type", "retry-after"]
+
+class FixtureNotFoundError(LookupError):
+    """replay 모드에서 요청에 해당하는 저장된 응답이 없을 때 발생합니다."""
+
+def _request_text(body: Optional[bytes], sort_keys: bool) -> str:
+    """요청 본문을 문자열로 바꿉니다. JSON 본문이면 인증 정보(api_key)를 뺍니다."""
+    text = (body or b"").decode("utf-8", errors="replace")
+    try:
+        payload = json.loads(text) if text else None
+    except ValueError:
+        return text
+    if isinstance(payload, dict):
+        payload.pop("api_key", None)
+    return json.dumps(payload, sort_keys=sort_keys, ensure_ascii=False)
+
+def fixture_key(method: str, url: str, body: Optional[bytes]) -> str:
+    """
+    요청을 식별하는 키를 만듭니다. (메서드 + 경로 + 정렬한 JSON 본문의 SHA-256)
+    호스트와 인증 정보(헤더, 쿼리의 key)는 키에 넣지 않으므로 실제 API에서 녹화한 응답을
+    스텁 서버나 다른 API 키로도 그대로 재생할 수 있습니다.
+    """
+    path = urlsplit(url).path
+    text = _request_text(body, sort_keys=True)
+    return hashlib.sha256(f"{method.upper()} {path}\n{text}".encode("utf-8")).hexdigest()
+
+class FixtureStore:
+    """
+    요청/응답 쌍을 제공자별 디렉토리에 요청 키 이름의 JSON 파일로 저장하고 읽습니다.
+    (예: data/api_fixtures/tavily/<키>.json) 파일 하나가 응답 하나이므로 사람이 읽고 고치기 쉽습니다.
+    """
+    def __init__(self, directory: str, provider: str):
+        self.directory = os.path.join(directory, provider)
+        self.provider = provider
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def load(self, key: str) -> Optional[dict]:
+        """저장된 응답을 읽습니다. 없으면 None"""
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, key: str, method: str, url: str, body: Optional[bytes],
+             status: int, headers, content: bytes):
+        """
+        요청/응답 쌍을 저장합니다. 같은 키가 있으면 덮어씁니다. 저장 실패는 호출을 막지 않습니다.
+        요청 본문의 api_key와 RECORDED_HEADERS 외의 응답 헤더는 저장하지 않으므로 녹화 파일을 커밋해도 키가 남지 않습니다.
+        """
+        record = {
+            "request": {
+                "method": method.upper(),
+                "path": urlsplit(url).path,
+                "body": _request_text(body, sort_keys=False) if body else "",
+            },
+            "response": {
+                "status": status,
+                "headers": {name: headers[name] for name in RECORDED_HEADERS if name in headers},
+                "body": content.decode("utf-8", errors="replace"),
+            },
+        }
+        try:
+            with self._lock:
+                os.makedirs(self.directory, exist_ok=True)
+                tmp_path = f"{self._path(key)}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(record, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning(f"API 응답 녹화 실패 ({self.provider}): {e}")
+
+    def replay(self, key: str, method: str, url: str) -> dict:
+        """
+        저장된 응답을 반환합니다.
+        :raises FixtureNotFoundError: 저장된 응답이 없을 때
+        """
+        record = self.load(key)
+        if record is None:
+            raise FixtureNotFoundError(
+                f"저장된 {self.provider} 응답이 없습니다: {method.upper()} {urlsplit(url).path} "
+                f"({self._path(key)}) - API_MODE=record로 먼저 녹화하세요."
+            )
+        return record["response"]
+
+class RecordReplayAdapter(HTTPAdapter):
+    """
+    requests.Session용 녹화/재생 어댑터. (Tavily 클라이언트용)
+    record 모드는 실제로 요청한 뒤 응답을 저장하고, replay 모드는 네트워크 없이 저장된 응답을 돌려줍니다.
+    """
+    def __init__(self, store: FixtureStore, mode: str, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store
+        self.mode = mode
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        body = request.body.encode("utf-8") if isinstance(request.body, str) else request.body
+        key = fixture_key(request.method, request.url, body)
+        if self.mode == "replay":
+            recorded = self.store.replay(key, request.method, request.url)
+            response = requests.Response()
+            response.status_code = recorded["status"]
+            response.headers = CaseInsensitiveDict(recorded["headers"])
+            response._content = recorded["body"].encode("utf-8")
+            response.encoding = "utf-8"
+            response.url = request.url
+            response.request = request
+            return response
+
+        response = super().send(request, **kwargs)
+        self.store.save(key, request.method, request.url, body,
+                        response.status_code, response.headers, response.content)
+        return response
+
+class RecordReplayTransport(httpx.BaseTransport):
+    """
+    httpx.Client용 녹화/재생 트랜스포트. (Gemini 클라이언트용)
+    record 모드는 실제 트랜스포트로 요청한 뒤 응답을 저장하고, replay 모드는 저장된 응답을 돌려줍니다.
+    """
+    def __init__(self, store: FixtureStore, mode: str, transport: httpx.BaseTransport):
+        self.store = store
+        self.mode = mode
+        self.transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        body = request.read()
+        url = str(request.url)
+        key = fixture_key(request.method, url, body)
+        if self.mode == "replay":
+            recorded = self.store.replay(key, request.method, url)
+            return httpx.Response(
+                recorded["status"], headers=recorded["headers"],
+                content=recorded["body"].encode("utf-8"), request=request
+            )
+
+        response = self.transport.handle_request(request)
+        content = response.read()
+        self.store.save(key, request.method, url, body, response.status_code, response.headers, content)
+        return response
+
+    def close(self):
+        self.transport.close()
@@ -0,0 +1,63 @@
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+import pandas as pd
+
+# 뉴스 API가 주로 쓰는 RFC-822 형식 (예: "Mon, 13 Oct 2026 09:00:00 GMT", "... +0900")
+RFC822_FORMATS = ["%a, %d %b %Y %H:%M:%S %Z", "%a, %d %b %Y %H:%M:%S %z"]
+
+# 시간대 표기로 끝나는 값 (예: "...Z", "...+09:00", "... +0900", "... GMT")
+_TZ_SUFFIX = r"(?:[zZ]|[+-]\d{2}:?\d{2}|GMT|UTC)$"
+
+# 날짜가 없음을 뜻하는 문자열 (CSV에서 읽은 NaN이 문자열로 바뀐 경우 포함)
+_MISSING = ["", "nan", "none", "nat", "null"]
+
+def parse_datetimes(values: Iterable) -> pd.Series:
+    """
+    형식이 섞인 날짜 문자열(ISO-8601, RFC-822 등)을 UTC 시각 Series(datetime64[ns, UTC])로 한 번에 변환합니다.
+    빈 값/None/NaN/'nan'과 해석할 수 없는 값은 NaT가 되며, 시간대가 없는 값은 UTC로 간주합니다.
+    흔한 형식부터 고정 형식으로 일괄 변환하고(ISO-8601 -> RFC-822), 남은 값만 형식을 추론합니다.
+    """
+    text = pd.Series(list(values), dtype=object).astype("string").str.strip()
+    text = text.mask(text.str.lower().isin(_MISSING))
+
+    parsed = _to_datetimes(text, "ISO8601")
+    for fmt in RFC822_FORMATS + ["mixed"]:
+        remaining = parsed.isna() & text.notna()
+        if not remaining.any():
+            break
+        parsed[remaining] = _to_datetimes(text[remaining], fmt)
+    return parsed
+
+def _to_datetimes(text: pd.Series, fmt: str) -> pd.Series:
+    """
+    문자열 Series를 지정한 형식으로 UTC 시각 Series로 변환합니다.
+    pandas는 한 번에 변환할 때 앞선 값의 시간대를 시간대 없는 값에도 적용하므로(+09:00 뒤의 "09:00"이 00:00 UTC가 됨),
+    시간대가 있는 값과 없는 값을 나눠 변환합니다.
+    """
+    has_tz = text.str.contains(_TZ_SUFFIX, regex=True).fillna(False).astype(bool)
+    parsed = pd.Series(pd.NaT, index=text.index, dtype="datetime64[ns, UTC]")
+    for group in (has_tz, ~has_tz):
+        if group.any():
+            parsed[group] = pd.to_datetime(text[group], format=fmt, errors="coerce", utc=True)
+    return parsed
+
+def clean_date_text(value) -> Optional[str]:
+    """저장된 날짜 값을 문자열로 복원합니다. 빈 값/None/NaN/'nan'이면 None입니다."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    text = str(value).strip()
+    return None if text.lower() in _MISSING else text
+
+def to_utc(value: Optional[datetime]) -> Optional[pd.Timestamp]:
+    """datetime을 UTC Timestamp로 바꿉니다. 시간대가 없으면 로컬 시각으로 간주합니다. (사용자가 고른 기간 등)"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.astimezone()
+    return pd.Timestamp(value.astimezone(timezone.utc))
+
+def to_iso(value) -> Optional[str]:
+    """UTC 시각을 저장용 ISO-8601 문자열로 바꿉니다. NaT/None이면 None입니다."""
+    if value is None or pd.isna(value):
+        return None
+    return pd.Timestamp(value).isoformat()
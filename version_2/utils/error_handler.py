@@ -2,7 +2,7 @@ import streamlit as st
 
 ERROR_MESSAGES = {
     "api_key_invalid": "API 키를 확인해주세요 (401 Unauthorized)",
-    "daily_limit_exceeded": "일일 검색 한도(100건)를 초과했습니다",
+    "daily_limit_exceeded": "오늘의 API 호출 한도를 모두 사용했습니다 (TAVILY_DAILY_LIMIT / GEMINI_DAILY_LIMIT)",
     "rate_limit_exceeded": "월간/분당 검색 한도를 초과했습니다 (429 Too Many Requests)",
     "no_results": "검색 결과가 없습니다",
     "network_error": "네트워크 연결을 확인해주세요 (Timeout or Connection Error)",
@@ -11,6 +11,7 @@ ERROR_MESSAGES = {
     "bad_request": "잘못된 요청입니다 (API 파라미터 등을 확인하세요)",
     "server_error": "검색 서버 오류입니다. 잠시 후 다시 시도해주세요 (5xx Server Error)",
     "ai_error": "AI 요약 중 오류가 발생했습니다",
+    "service_unavailable": "외부 API 장애가 이어져 요청을 잠시 중단했습니다. 잠시 후 다시 시도해주세요",
 }
 
 def handle_error(error_type: str, level: str = "error"):
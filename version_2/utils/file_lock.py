@@ -0,0 +1,78 @@
+import os
+import time
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+class FileLock:
+    """
+    여러 프로세스가 같은 파일에 쓸 때 사용하는 배타적 파일 잠금.
+    잠금 전용 파일(예: search_history.csv.lock)에 POSIX에서는 flock, Windows에서는 msvcrt.locking을 겁니다.
+    잠금은 열린 파일 단위로 걸리므로 같은 프로세스의 다른 스레드가 따로 잠가도 서로 기다립니다.
+
+    사용 예:
+        with FileLock("data/search_history.csv.lock"):
+            ...  # 파일 쓰기
+    """
+    def __init__(self, lock_path: str, timeout: float = 30.0, poll_interval: float = 0.05):
+        """
+        :param lock_path: 잠금 전용 파일 경로 (없으면 생성)
+        :param timeout: 잠금을 기다리는 최대 시간(초). 넘으면 TimeoutError
+        :param poll_interval: 잠금 재시도 간격(초)
+        """
+        self.lock_path = lock_path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._file: Optional[object] = None
+
+    def acquire(self):
+        """잠금을 얻을 때까지 기다립니다."""
+        lock_file = open(self.lock_path, 'a+b')
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                self._lock(lock_file)
+                self._file = lock_file
+                return
+            except OSError:
+                if time.monotonic() >= deadline:
+                    lock_file.close()
+                    raise TimeoutError(f"파일 잠금 대기 시간 초과: {self.lock_path}")
+                time.sleep(self.poll_interval)
+
+    def release(self):
+        """잠금을 해제합니다."""
+        if self._file is None:
+            return
+        try:
+            self._unlock(self._file)
+        finally:
+            self._file.close()
+            self._file = None
+
+    @staticmethod
+    def _lock(lock_file):
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+
+    @staticmethod
+    def _unlock(lock_file):
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
@@ -0,0 +1,60 @@
+import time
+import logging
+from typing import Optional
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from utils.api_fixtures import FixtureStore, RecordReplayAdapter, RecordReplayTransport
+
+logger = logging.getLogger(__name__)
+
+def configure_session_pool(session: requests.Session, pool_size: int, api_mode: str = "live",
+                           fixture_store: Optional[FixtureStore] = None) -> requests.Session:
+    """
+    requests.Session의 연결 풀 크기를 설정합니다. (Tavily 클라이언트용)
+    세션은 호스트별 연결을 재사용(Keep-Alive)하므로, 동시 검색 수만큼 풀을 키워 두면
+    동시에 나가는 요청마다 TLS 핸드셰이크를 다시 하지 않습니다.
+    재시도는 서비스 계층에서 처리하므로 어댑터 재시도는 사용하지 않습니다.
+    :param api_mode: "record"/"replay"이면 fixture_store에 응답을 녹화하거나 저장된 응답을 재생 (utils/api_fixtures.py)
+    """
+    if api_mode in ("record", "replay") and fixture_store is not None:
+        adapter = RecordReplayAdapter(fixture_store, api_mode, pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+    else:
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def create_httpx_client(pool_size: int, timeout: float, keepalive_seconds: float, api_mode: str = "live",
+                        fixture_store: Optional[FixtureStore] = None) -> httpx.Client:
+    """
+    연결 풀과 Keep-Alive 유지 시간을 지정한 httpx.Client를 만듭니다. (Gemini 클라이언트용)
+    :param pool_size: 최대 동시 연결 수 (유휴 연결도 이 수만큼 보관)
+    :param timeout: 요청 타임아웃(초)
+    :param keepalive_seconds: 유휴 연결을 닫기 전까지 유지하는 시간(초)
+    :param api_mode: "record"/"replay"이면 fixture_store에 응답을 녹화하거나 저장된 응답을 재생 (utils/api_fixtures.py)
+    """
+    limits = httpx.Limits(
+        max_connections=pool_size,
+        max_keepalive_connections=pool_size,
+        keepalive_expiry=keepalive_seconds
+    )
+    if api_mode in ("record", "replay") and fixture_store is not None:
+        # transport를 직접 지정하면 Client의 limits가 적용되지 않으므로 안쪽 트랜스포트에 연결 풀을 설정
+        transport = RecordReplayTransport(fixture_store, api_mode, httpx.HTTPTransport(limits=limits))
+        return httpx.Client(transport=transport, timeout=timeout)
+    return httpx.Client(limits=limits, timeout=timeout)
+
+def warm_up(request_fn, url: str, timeout: float) -> Optional[float]:
+    """
+    url로 HEAD 요청을 보내 연결(TCP + TLS)을 미리 열어 둡니다. 응답 코드는 확인하지 않습니다.
+    :param request_fn: session.head 또는 httpx_client.head처럼 (url, timeout=...)을 받는 함수
+    :return: 걸린 시간(초). 실패하면 None
+    """
+    started = time.perf_counter()
+    try:
+        request_fn(url, timeout=timeout)
+    except Exception as e:
+        logger.warning(f"연결 예열 실패 ({url}): {e}")
+        return None
+    return time.perf_counter() - started
@@ -1,4 +1,6 @@
+import hashlib
 from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 def generate_search_key(keyword: str) -> str:
     """
@@ -7,3 +9,35 @@ def generate_search_key(keyword: str) -> str:
     """
     timestamp = datetime.now().strftime("%Y%m%d%H%M")
     return f"{keyword}-{timestamp}"
+
+# URL 정규화 시 제거하는 추적용 쿼리 파라미터
+TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "igshid", "mc_cid", "mc_eid")
+
+def normalize_url(url: str) -> str:
+    """
+    같은 기사를 가리키는 URL이 같은 문자열이 되도록 정규화합니다.
+    스킴/호스트 소문자화, 기본 포트/프래그먼트/추적용 파라미터 제거, 쿼리 파라미터 정렬, 경로 끝 '/' 제거를 수행합니다.
+    (예: 'HTTPS://News.com/a/?utm_source=x#top' -> 'https://news.com/a')
+    """
+    if not url or not isinstance(url, str):
+        return ""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if (scheme, netloc.rsplit(":", 1)[-1]) in (("http", "80"), ("https", "443")):
+        netloc = netloc.rsplit(":", 1)[0]
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.lower().startswith(TRACKING_PARAMS)
+    )
+    path = parts.path.rstrip("/") if parts.path != "/" else ""
+    return urlunsplit((scheme, netloc, path, urlencode(query), ""))
+
+def generate_article_key(url: str, title: str = "") -> str:
+    """
+    기사 저장소의 PK로 사용할 정규화 URL 해시(SHA-1 hex)를 생성합니다.
+    URL이 없는 기사는 제목으로 대신 식별합니다.
+    """
+    normalized = normalize_url(url)
+    source = f"url:{normalized}" if normalized else f"title:{title or ''}"
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()
@@ -0,0 +1,240 @@
+import time
+import random
+import logging
+import threading
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, TypeVar
+import httpx
+import requests
+from utils.exceptions import AppError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 재시도하면 성공할 수 있는 오류 유형 (그 외 유형은 즉시 실패)
+RETRYABLE_ERRORS = {"network_error", "server_error", "rate_limit_exceeded"}
+
+# 서킷 브레이커의 실패로 집계하는 오류 유형 (요청 자체의 문제인 400/401은 제공자 장애로 보지 않음)
+BREAKER_ERRORS = RETRYABLE_ERRORS
+
+@dataclass(frozen=True)
+class ClassifiedError:
+    """외부 API 예외를 분류한 결과"""
+    error_type: str  # AppError 유형 (utils/error_handler.py의 ERROR_MESSAGES 키)
+    retry_after: Optional[float] = None  # 서버가 Retry-After로 알려 준 대기 시간(초)
+
+    @property
+    def retryable(self) -> bool:
+        return self.error_type in RETRYABLE_ERRORS
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    지수 백오프 재시도 정책.
+    n번째 재시도 전 대기 시간은 0 ~ min(max_delay, base_delay * 2^(n-1)) 사이의 무작위 값(full jitter)이며,
+    서버가 Retry-After를 주면 그 값을 따릅니다. Retry-After가 max_delay보다 길면 기다리지 않고 실패합니다.
+    """
+    max_attempts: int = 3  # 첫 호출을 포함한 최대 호출 횟수
+    base_delay: float = 0.5  # 초
+    max_delay: float = 8.0  # 초
+
+    def delay_for(self, retry_number: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        retry_number번째 재시도 전 대기 시간(초)을 반환합니다. 재시도하지 않아야 하면 None입니다.
+        :param retry_number: 1부터 시작하는 재시도 순번
+        """
+        if retry_number >= self.max_attempts:
+            return None
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_delay else None
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (retry_number - 1)))
+
+# 선택 단계(검색어 교정/확장, 키워드 추출)용 정책: 재시도 없이 한 번만 호출
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+class CircuitBreaker:
+    """
+    엔드포인트별 서킷 브레이커.
+    - closed: 정상 호출. 제공자 장애(BREAKER_ERRORS)가 failure_threshold번 연속되면 open으로 전환
+    - open: reset_timeout 동안 호출하지 않고 즉시 실패
+    - half-open: reset_timeout이 지나면 시험 호출 1건만 허용하고, 성공하면 closed, 실패하면 다시 open
+    """
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """현재 상태 ('closed', 'open', 'half-open')"""
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return "open"
+            return "half-open"
+
+    def allow(self) -> bool:
+        """지금 호출해도 되는지 반환합니다. half-open 상태에서는 한 번에 1건만 허용합니다."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def release(self):
+        """호출하지 않고 끝난 시도의 half-open 시험 호출 자리를 반납합니다."""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._probing:
+                    logger.warning(f"서킷 브레이커 열림: {self.name} ({self.reset_timeout:.0f}초 동안 호출 차단)")
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """엔드포인트 이름(예: 'tavily.search')별로 프로세스 전체에서 공유하는 서킷 브레이커를 반환합니다."""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name)
+        return breaker
+
+# requests 응답 훅이 기록한 마지막 Retry-After (스레드별)
+_last_retry_after = threading.local()
+
+def retry_after_hook(response: requests.Response, *args, **kwargs):
+    """
+    requests.Session 응답 훅. 429/503 응답의 Retry-After 헤더를 현재 스레드에 기록합니다.
+    응답 객체를 버리고 예외만 던지는 클라이언트(Tavily 등)에서도 classify_error가 대기 시간을 알 수 있게 합니다.
+    """
+    if response.status_code in (429, 503):
+        _last_retry_after.value = parse_retry_after(response.headers.get("Retry-After"))
+    return response
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더 값(초 또는 HTTP 날짜)을 대기 시간(초)으로 변환합니다. 해석할 수 없으면 None입니다."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+def _status_from_exception(exc: Exception) -> Optional[int]:
+    """예외에 담긴 HTTP 상태 코드를 찾습니다."""
+    code = getattr(exc, "code", None)  # google.genai.errors.APIError
+    if isinstance(code, int):
+        return code
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+def _retry_after_from_exception(exc: Exception) -> Optional[float]:
+    """예외에 응답 객체가 있으면 Retry-After 헤더를, 없으면 응답 훅이 기록한 값을 반환합니다."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if headers is not None:
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        if retry_after is not None:
+            return retry_after
+    return getattr(_last_retry_after, "value", None)
+
+def classify_error(exc: Exception, default: str = "network_error") -> ClassifiedError:
+    """
+    외부 API 호출 예외를 AppError 유형으로 분류합니다.
+    예외 메시지 문자열 대신 예외 타입과 HTTP 상태 코드로 판단합니다.
+    :param default: 분류할 수 없는 예외의 유형
+    """
+    if isinstance(exc, AppError):
+        return ClassifiedError(exc.error_type)
+
+    type_name = type(exc).__name__
+    # Tavily 클라이언트 예외 (상태 코드 대신 예외 타입으로 구분됨)
+    if type_name == "InvalidAPIKeyError" or type_name == "MissingAPIKeyError":
+        return ClassifiedError("api_key_invalid")
+    if type_name == "UsageLimitExceededError":
+        return ClassifiedError("rate_limit_exceeded", _retry_after_from_exception(exc))
+    if type_name in ("BadRequestError", "ForbiddenError"):
+        return ClassifiedError("bad_request")
+    if type_name == "TimeoutError" or isinstance(exc, (TimeoutError, ConnectionError)):
+        return ClassifiedError("network_error")
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout, httpx.TransportError)):
+        return ClassifiedError("network_error")
+
+    status = _status_from_exception(exc)
+    if status is not None:
+        if status in (401, 403):
+            return ClassifiedError("api_key_invalid")
+        if status == 429:
+            return ClassifiedError("rate_limit_exceeded", _retry_after_from_exception(exc))
+        if status >= 500:
+            return ClassifiedError("server_error", _retry_after_from_exception(exc))
+        if status == 400 and "API_KEY_INVALID" in str(getattr(exc, "details", "")):
+            return ClassifiedError("api_key_invalid")  # Gemini는 잘못된 키를 400으로 응답
+        if status >= 400:
+            return ClassifiedError("bad_request")
+    return ClassifiedError(default)
+
+def call_with_retry(fn: Callable[[], T], policy: RetryPolicy, breaker: Optional[CircuitBreaker] = None,
+                    default_error: str = "network_error") -> T:
+    """
+    fn()을 재시도 정책과 서킷 브레이커를 적용해 호출합니다.
+    - 브레이커가 열려 있으면 호출하지 않고 즉시 AppError("service_unavailable")를 발생시킵니다.
+    - 재시도할 수 없는 오류이거나 재시도 횟수를 다 쓰면 분류된 유형의 AppError를 발생시킵니다. (원래 예외는 __cause__)
+    - fn이 직접 발생시킨 AppError(호출 한도 초과 등 API를 호출하기 전의 실패)는 재시도하지 않고 그대로 전달하며
+      제공자 장애로 집계하지 않습니다.
+    :param default_error: 분류할 수 없는 예외에 사용할 AppError 유형
+    """
+    retry_number = 0
+    while True:
+        if breaker is not None and not breaker.allow():
+            raise AppError("service_unavailable")
+        _last_retry_after.value = None
+        try:
+            result = fn()
+        except AppError:
+            if breaker is not None:
+                breaker.release()
+            raise
+        except Exception as e:
+            classified = classify_error(e, default_error)
+            if breaker is not None:
+                if classified.error_type in BREAKER_ERRORS:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()  # 요청 자체의 오류는 제공자가 응답했다는 뜻
+            retry_number += 1
+            delay = policy.delay_for(retry_number, classified.retry_after) if classified.retryable else None
+            if delay is None:
+                raise AppError(classified.error_type) from e
+            logger.info(f"{classified.error_type} 후 {delay:.2f}초 뒤 재시도 ({retry_number}/{policy.max_attempts - 1})")
+            time.sleep(delay)
+        else:
+            if breaker is not None:
+                breaker.record_success()
+            return result
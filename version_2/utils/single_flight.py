@@ -0,0 +1,44 @@
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+class SingleFlight:
+    """
+    같은 키의 호출이 이미 진행 중이면 새로 호출하지 않고 그 결과를 함께 받도록 묶습니다. (request coalescing)
+    여러 세션이 같은 검색어로 거의 동시에 검색할 때 외부 API 요청을 한 번만 보내기 위해 사용합니다.
+    진행 중인 호출만 묶으며, 끝난 호출의 결과는 보관하지 않습니다. (결과 재사용은 캐시의 역할)
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self.coalesced = 0  # 다른 호출의 결과를 기다려 받은 횟수
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        key에 해당하는 호출이 진행 중이면 그 결과를 기다리고, 없으면 fn()을 직접 호출합니다.
+        fn()이 예외를 발생시키면 기다리던 호출자들에게도 같은 예외가 전달됩니다.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
@@ -0,0 +1,207 @@
+# Tavily/Gemini API를 흉내 내는 로컬 스텁 서버. 네트워크 없이 검색/요약 흐름을 실행하고 성능을 측정할 때 사용합니다.
+#
+#     uv run python -m utils.stub_server --port 8765 --latency 0.3 --error-rate 0.05 --rate-limit-rate 0.1
+#
+# 앱은 TAVILY_BASE_URL=http://127.0.0.1:8765, GEMINI_BASE_URL=http://127.0.0.1:8765/ 로 이 서버를 가리킵니다.
+# --fixtures를 지정하면 API_MODE=record로 녹화한 응답이 있는 요청은 그 응답을 돌려주고, 없으면 합성 응답을 만듭니다.
+import re
+import json
+import time
+import random
+import hashlib
+import logging
+import argparse
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Optional, Tuple
+from utils.api_fixtures import FixtureStore, fixture_key
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class StubConfig:
+    """스텁 서버의 응답 지연과 오류 주입 설정"""
+    latency: float = 0.0  # 응답마다 더하는 기본 지연(초)
+    jitter: float = 0.0  # 지연에 더하는 0~jitter초의 무작위 값
+    error_rate: float = 0.0  # 503 응답 비율 (0~1)
+    rate_limit_rate: float = 0.0  # 429 응답 비율 (0~1)
+    retry_after: Optional[int] = 1  # 429/503 응답의 Retry-After 헤더(초). None이면 보내지 않음
+    fixture_dir: Optional[str] = None  # 녹화한 응답 디렉토리 (API_FIXTURE_PATH)
+    seed: Optional[int] = None  # 오류/지연 주입용 난수 시드
+
+@dataclass
+class StubStats:
+    """스텁 서버가 받은 요청 수 (제공자별), 주입한 오류 수, 수락한 TCP 연결 수"""
+    tavily: int = 0
+    gemini: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+    replayed: int = 0
+    connections: int = 0  # 요청 수보다 작을수록 Keep-Alive 연결이 재사용된 것
+
+_GEMINI_PATH = re.compile(r"/v1[a-z0-9]*/models/[^/:]+:generateContent$")
+
+def _fake_search(payload: dict) -> dict:
+    """검색어로 결정되는 합성 Tavily 검색 응답을 만듭니다. (같은 검색어는 항상 같은 결과)"""
+    query = str(payload.get("query", ""))
+    count = int(payload.get("max_results", 5))
+    digest = hashlib.sha256(query.encode("utf-8")).hexdigest()[:8]
+    now = datetime.now(timezone.utc)
+    results = [
+        {
+            "url": f"https://news{i % 5}.example.com/{digest}/{i}",
+            "title": f"{query} 관련 소식 {i + 1}",
+            "content": f"{query}에 대한 합성 기사 {i + 1}번의 본문입니다. 고유 문구 {digest}-{i}.",
+            "published_date": (now - timedelta(hours=3 * i)).strftime("%a, %d %b %Y %H:%M:%S GMT"),
+            "score": round(1 - i / max(count, 1), 3),
+        }
+        for i in range(count)
+    ]
+    images = [f"https://images.example.com/{digest}/{i}.jpg" for i in range(count)] if payload.get("include_images") else []
+    return {"query": query, "results": results, "images": images, "response_time": 0.0}
+
+def _fake_generate(payload: dict) -> dict:
+    """프롬프트 형태(요약/검색어 확장/교정/키워드 추출)에 맞는 합성 Gemini 응답을 만듭니다."""
+    prompt = "".join(
+        part.get("text", "")
+        for content in payload.get("contents", []) for part in content.get("parts", [])
+    )
+    keyword = re.search(r"\[입력 키워드\]: (.+)", prompt) or re.search(r"입력: (.+)", prompt)
+    titles = re.findall(r"제목: (.+)", prompt)
+    if keyword:
+        text = keyword.group(1).strip()
+    elif "[뉴스 제목]" in prompt:
+        titles = re.findall(r"^- (.+)$", prompt.split("[뉴스 제목]", 1)[1], re.MULTILINE)
+        words = dict.fromkeys(word for title in titles for word in title.split())
+        text = ", ".join(list(words)[:5])
+    else:
+        text = "\n".join(f"- {title.strip()}의 핵심 내용입니다." for title in titles[:5]) or "- 요약할 내용이 없습니다."
+    return {
+        "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": "STOP"}],
+        "usageMetadata": {"promptTokenCount": len(prompt) // 4, "candidatesTokenCount": len(text) // 4},
+    }
+
+def create_stub_server(host: str = "127.0.0.1", port: int = 0,
+                       config: Optional[StubConfig] = None) -> Tuple[ThreadingHTTPServer, StubStats]:
+    """
+    스텁 서버를 만듭니다. (시작하지 않음, serve_forever()로 실행)
+    :param port: 0이면 빈 포트를 자동으로 선택 (server.server_port로 확인)
+    :return: (서버, 요청 통계)
+    """
+    config = config or StubConfig()
+    stats = StubStats()
+    rng = random.Random(config.seed)
+    rng_lock = threading.Lock()
+    stores = {
+        provider: FixtureStore(config.fixture_dir, provider)
+        for provider in ("tavily", "gemini")
+    } if config.fixture_dir else {}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-Alive 연결 재사용을 측정할 수 있도록 함
+
+        def setup(self):
+            # 핸들러는 수락한 연결마다 1개씩 만들어짐
+            super().setup()
+            with rng_lock:
+                stats.connections += 1
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+        def _send(self, status: int, body: bytes = b"", headers: Optional[dict] = None):
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(body)
+
+        def do_HEAD(self):
+            # 연결 예열(HTTP_WARMUP)용
+            self._send(200)
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            path = self.path.split("?")[0]
+            if path == "/search":
+                provider = "tavily"
+            elif _GEMINI_PATH.search(path):
+                provider = "gemini"
+            else:
+                self._send(404, json.dumps({"error": f"unknown path: {path}"}).encode("utf-8"))
+                return
+
+            with rng_lock:
+                setattr(stats, provider, getattr(stats, provider) + 1)
+                delay = config.latency + rng.uniform(0, config.jitter)
+                roll = rng.random()
+            time.sleep(delay)
+
+            retry_headers = {} if config.retry_after is None else {"Retry-After": str(config.retry_after)}
+            if roll < config.rate_limit_rate:
+                with rng_lock:
+                    stats.rate_limited += 1
+                self._send(429, json.dumps({"error": "stub rate limit"}).encode("utf-8"), retry_headers)
+                return
+            if roll < config.rate_limit_rate + config.error_rate:
+                with rng_lock:
+                    stats.errors += 1
+                self._send(503, json.dumps({"error": "stub server error"}).encode("utf-8"), retry_headers)
+                return
+
+            recorded = None
+            if provider in stores:
+                recorded = stores[provider].load(fixture_key("POST", path, body))
+            if recorded is not None:
+                with rng_lock:
+                    stats.replayed += 1
+                response = recorded["response"]
+                self._send(response["status"], response["body"].encode("utf-8"))
+                return
+
+            try:
+                payload = json.loads(body or b"{}")
+            except ValueError:
+                self._send(400, json.dumps({"error": "invalid json"}).encode("utf-8"))
+                return
+            result = _fake_search(payload) if provider == "tavily" else _fake_generate(payload)
+            self._send(200, json.dumps(result, ensure_ascii=False).encode("utf-8"))
+
+    return ThreadingHTTPServer((host, port), Handler), stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Tavily/Gemini 로컬 스텁 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="응답마다 더하는 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="지연에 더하는 최대 무작위 시간(초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 응답 비율 (0~1)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="429 응답 비율 (0~1)")
+    parser.add_argument("--retry-after", type=int, default=1, help="429/503 응답의 Retry-After(초), 음수면 보내지 않음")
+    parser.add_argument("--fixtures", default=None, help="녹화한 응답 디렉토리 (API_FIXTURE_PATH)")
+    parser.add_argument("--seed", type=int, default=None, help="오류/지연 주입용 난수 시드")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    config = StubConfig(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate, retry_after=None if args.retry_after < 0 else args.retry_after,
+        fixture_dir=args.fixtures, seed=args.seed
+    )
+    server, stats = create_stub_server(args.host, args.port, config)
+    logger.info(f"스텁 서버 시작: http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        logger.info(f"스텁 서버 종료: {stats}")
+
+if __name__ == "__main__":
+    main()